@@ -18,16 +18,23 @@ from cpg_methylation_mvp.context import (
 )
 from cpg_methylation_mvp.core import (
     DEFAULT_DUPLICATE_POLICY,
+    DEFAULT_MAX_DECOMPRESSED_BYTES,
     DEFAULT_MAX_UPLOAD_BYTES,
     DuplicatePolicy,
+    DuplicateReview,
     IngestError,
+    PreparedUpload,
     ProcessedUpload,
     ProcessingReport,
+    ValidationViolations,
     analyze_methylation,
-    duplicate_review_table,
+    apply_duplicate_policy,
+    default_ingest_cache,
+    duplicate_review,
     explain_qc_summary,
     load_panel,
-    process_methylation_upload,
+    prepare_methylation_upload,
+    strip_compression_suffix,
     structured_interpretation,
 )
 
@@ -35,6 +42,10 @@ _DUPLICATE_POLICY_LABELS: dict[str, DuplicatePolicy] = {
     "Preserve rows and warn": "preserve_rows_and_warn",
     "Reject duplicates": "reject_duplicates",
     "Aggregate duplicates (mean beta, matching metadata only)": "aggregate_mean_when_metadata_match",
+    "Aggregate duplicates (median beta, matching metadata only)": "aggregate_median_when_metadata_match",
+    "Aggregate duplicates (pval-weighted mean beta, matching metadata only)": (
+        "aggregate_pval_weighted_mean_when_metadata_match"
+    ),
 }
 _DUPLICATE_POLICY_HELP = {
     "preserve_rows_and_warn": "Keeps all rows for QC review and flags duplicates explicitly.",
@@ -42,25 +53,44 @@ _DUPLICATE_POLICY_HELP = {
     "aggregate_mean_when_metadata_match": (
         "Collapses duplicate cpg_id rows by mean beta only when optional metadata values do not conflict."
     ),
+    "aggregate_median_when_metadata_match": (
+        "Collapses duplicate cpg_id rows by median beta only when optional metadata values do not conflict."
+    ),
+    "aggregate_pval_weighted_mean_when_metadata_match": (
+        "Collapses duplicate cpg_id rows by a mean beta weighted by 1 - pval only when optional metadata "
+        "values do not conflict."
+    ),
 }
 _WORKFLOW_PANEL_PATH = Path("data/panels/core_demo_panel.csv")
 _WORKFLOW_EVIDENCE_PATH = Path("data/evidence/workflow_01_context_chunks.json")
 _LOGGER = logging.getLogger(__name__)
 
 
-def process_methylation_upload_cached(
-    raw_bytes: bytes,
-    filename: str,
-    duplicate_policy: DuplicatePolicy,
-) -> ProcessedUpload:
-    """Cache ingestion by upload bytes + filename to avoid rerun work."""
-    return process_methylation_upload(
+def prepare_methylation_upload_cached(raw_bytes: bytes, filename: str) -> PreparedUpload:
+    """Cache the policy-independent ingest stage by upload bytes + filename.
+
+    It is held as a shared resource rather than copied per rerun, so switching the duplicate policy
+    only re-applies the policy stage. When ``CPG_MVP_CACHE_DIR`` is set, the prepared stage is also
+    kept in an on-disk cache shared across sessions, worker processes, and redeploys.
+    """
+    return prepare_methylation_upload(
         uploaded_file=BytesIO(raw_bytes),
         source_name=filename,
-        duplicate_policy=duplicate_policy,
+        collect_violations=True,
+        cache=default_ingest_cache(),
     )
 
 
+def process_methylation_upload_cached(
+    _prepared: PreparedUpload,
+    prepared_key: str,
+    duplicate_policy: DuplicatePolicy,
+) -> ProcessedUpload:
+    """Cache duplicate-policy application by prepared upload key + policy."""
+    _ = prepared_key
+    return apply_duplicate_policy(_prepared, duplicate_policy)
+
+
 def _dataframe_signature(df: pd.DataFrame) -> str:
     """Create a stable lightweight signature for cached dataframe-level QC."""
     row_count = len(df)
@@ -82,6 +112,7 @@ def analyze_methylation_cached(_normalized_df: pd.DataFrame, signature: str) ->
 def _streamlit_cached_functions():
     """Bind Streamlit cache decorators only while the app is running."""
     return (
+        st.cache_resource(show_spinner=False)(prepare_methylation_upload_cached),
         st.cache_data(show_spinner=False)(process_methylation_upload_cached),
         st.cache_data(show_spinner=False)(analyze_methylation_cached),
     )
@@ -134,9 +165,12 @@ def _structured_interpretation_json_bytes(interpretation: dict[str, object]) ->
     return json.dumps(interpretation, indent=2).encode("utf-8")
 
 
-def _duplicate_review_csv_bytes(df: pd.DataFrame) -> bytes:
-    """Serialize duplicate-row review details for download."""
-    return df.to_csv(index=False).encode("utf-8")
+def _duplicate_review_chunked_csv_bytes(review: DuplicateReview) -> bytes:
+    """Serialize a lazy duplicate review chunk by chunk so the full table is never materialized."""
+    buffer = BytesIO()
+    for chunk_index, chunk in enumerate(review.iter_chunks()):
+        buffer.write(chunk.to_csv(index=False, header=chunk_index == 0).encode("utf-8"))
+    return buffer.getvalue()
 
 
 def _aggregation_audit_csv_bytes(df: pd.DataFrame) -> bytes:
@@ -144,6 +178,31 @@ def _aggregation_audit_csv_bytes(df: pd.DataFrame) -> bytes:
     return df.to_csv(index=False).encode("utf-8")
 
 
+def _validation_violations_csv_bytes(violations: ValidationViolations) -> bytes:
+    """Serialize row-level validation violations for download."""
+    return violations.to_frame().to_csv(index=False).encode("utf-8")
+
+
+def _validation_violations_message(violations: ValidationViolations) -> str:
+    """Summarize rule-violation counts for the upload error banner."""
+    counts = ", ".join(f"{rule_id}: {count:,}" for rule_id, count in violations.counts_by_rule.items() if count)
+    message = f"Upload has {violations.total_count:,} row-level validation violation(s) ({counts})."
+    if violations.truncated:
+        message += f" The downloadable listing is capped at the first {violations.max_violations:,} rows."
+    return message
+
+
+def _render_validation_violations(violations: ValidationViolations, filename: str) -> None:
+    """Show the violation summary and offer the full row-level table for download."""
+    st.error(_validation_violations_message(violations))
+    st.download_button(
+        "Download validation violations (CSV)",
+        data=_validation_violations_csv_bytes(violations),
+        file_name=f"{_artifact_basename(filename)}_validation_violations.csv",
+        mime="text/csv",
+    )
+
+
 def _duplicate_policy_label(policy: DuplicatePolicy) -> str:
     """Return the human-readable label for a duplicate policy value."""
     for label, value in _DUPLICATE_POLICY_LABELS.items():
@@ -154,7 +213,7 @@ def _duplicate_policy_label(policy: DuplicatePolicy) -> str:
 
 def _artifact_basename(source_file: str) -> str:
     """Return a safe artifact basename derived from the upload filename."""
-    return source_file.rsplit(".", 1)[0]
+    return strip_compression_suffix(source_file).rsplit(".", 1)[0]
 
 
 def _parse_warning_messages(report: ProcessingReport) -> list[str]:
@@ -164,6 +223,7 @@ def _parse_warning_messages(report: ProcessingReport) -> list[str]:
         "mixed_delimiters_detected": "The upload appears to contain mixed delimiters; inspect dropped rows carefully.",
         "sniffed_delimiter_for_unknown_extension": "Delimiter was inferred from file content because the extension was not specific.",
         "recovered_from_mislabeled_extension": "The file extension did not match the detected delimiter; parsing recovered from content.",
+        "pyarrow_engine_unavailable_used_c_engine": "The Arrow CSV engine is not installed; the default parser was used.",
     }
     return [warning_messages.get(warning, warning) for warning in report.parse_warnings]
 
@@ -226,7 +286,11 @@ def _build_context_package(
 
 def main() -> None:
     """Render the Streamlit app."""
-    cached_process_methylation_upload, cached_analyze_methylation = _streamlit_cached_functions()
+    (
+        cached_prepare_methylation_upload,
+        cached_process_methylation_upload,
+        cached_analyze_methylation,
+    ) = _streamlit_cached_functions()
 
     st.set_page_config(page_title=PAGE_TITLE, layout=APP_LAYOUT)
     st.title(APP_TITLE)
@@ -242,31 +306,47 @@ def main() -> None:
     duplicate_policy = _DUPLICATE_POLICY_LABELS[selected_duplicate_label]
     st.caption(_DUPLICATE_POLICY_HELP[duplicate_policy])
     st.caption(
-        f"Upload limit: {DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024)} MB. "
+        f"Upload limit: {DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024)} MB "
+        f"({DEFAULT_MAX_DECOMPRESSED_BYTES // (1024 * 1024)} MB after decompressing .gz/.bz2/.xz/.zst uploads). "
         "Uploads and generated artifacts are session-scoped; no durable storage is configured."
     )
 
     uploaded_file = st.file_uploader(
         "Upload methylation results file",
-        type=["csv", "tsv", "txt"],
+        type=["csv", "tsv", "txt", "gz", "bz2", "xz", "zst"],
         accept_multiple_files=False,
     )
 
     if uploaded_file is not None:
         try:
-            raw_bytes = uploaded_file.getvalue()
-            processed_upload = cached_process_methylation_upload(
-                raw_bytes=raw_bytes,
+            prepared_upload = cached_prepare_methylation_upload(
+                raw_bytes=uploaded_file.getvalue(),
                 filename=uploaded_file.name,
+            )
+            processed_upload = cached_process_methylation_upload(
+                prepared_upload,
+                prepared_key=f"{prepared_upload.provenance.input_sha256}|{uploaded_file.name}",
                 duplicate_policy=duplicate_policy,
             )
-            st.session_state["processed_upload"] = processed_upload
-            _LOGGER.info("workflow_step=ingest_parse_normalize status=success source_file=%s", uploaded_file.name)
-            st.success("Upload parsed and normalized successfully.")
+            violations = processed_upload.violations
+            if violations is not None and violations.total_count:
+                st.session_state.pop("processed_upload", None)
+                _LOGGER.warning(
+                    "workflow_step=ingest_validate status=error violations=%d source_file=%s",
+                    violations.total_count,
+                    uploaded_file.name,
+                )
+                _render_validation_violations(violations, uploaded_file.name)
+            else:
+                st.session_state["processed_upload"] = processed_upload
+                _LOGGER.info("workflow_step=ingest_parse_normalize status=success source_file=%s", uploaded_file.name)
+                st.success("Upload parsed and normalized successfully.")
         except IngestError as error:
             st.session_state.pop("processed_upload", None)
             _LOGGER.warning("workflow_step=ingest_parse_normalize status=error detail=%s", str(error))
             st.error(str(error))
+            if error.violations is not None and error.violations.total_count:
+                _render_validation_violations(error.violations, uploaded_file.name)
 
     processed_upload = st.session_state.get("processed_upload")
     if processed_upload is None:
@@ -304,7 +384,7 @@ def main() -> None:
             f"Found {report.duplicate_cpg_id_groups} duplicated cpg_id value(s). "
             "Rows were preserved to avoid silent aggregation."
         )
-    if report.duplicate_policy == "aggregate_mean_when_metadata_match":
+    if report.duplicate_policy.startswith("aggregate_"):
         if report.aggregation_applied:
             st.info(
                 f"Aggregated {report.aggregated_duplicate_cpg_id_groups} duplicated cpg_id group(s) from "
@@ -332,19 +412,31 @@ def main() -> None:
         )
         st.dataframe(aggregation_audit_df.head(100), width="stretch")
 
-    duplicate_review_df = duplicate_review_table(normalized_df)
-    if not duplicate_review_df.empty:
+    review = duplicate_review(normalized_df)
+    if review.row_count:
         st.subheader("Duplicate Review")
         st.caption(
             "Inspect repeated retained rows here before any manual deduplication or future aggregation decision."
         )
         st.download_button(
             "Download duplicate review CSV",
-            data=_duplicate_review_csv_bytes(duplicate_review_df),
+            data=lambda: _duplicate_review_chunked_csv_bytes(review),
             file_name=f"{_artifact_basename(report.source_file)}_duplicate_review.csv",
             mime="text/csv",
         )
-        st.dataframe(duplicate_review_df.head(100), width="stretch")
+        page_count = review.page_count()
+        page_number = 1
+        if page_count > 1:
+            page_number = int(
+                st.number_input(
+                    f"Duplicate review page (of {page_count})",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    step=1,
+                )
+            )
+        st.dataframe(review.page(page_number - 1), width="stretch")
 
     download_col1, download_col2, download_col3, download_col4 = st.columns(4)
     download_col1.download_button(
@@ -1,45 +1,116 @@
 """Public core API for app orchestration."""
 
 from .analyze import analyze_methylation, qc_summary
+from .async_ingest import DEFAULT_MAX_CONCURRENT_INGESTS, AsyncIngestor, AsyncReader, ExecutorKind
+from .batch import BatchFileResult, BatchIngestResult, BatchSummary, process_methylation_uploads
+from .cache import CACHE_DIR_ENV_VAR, DEFAULT_CACHE_MAX_BYTES, IngestCache, default_ingest_cache
 from .ingest import (
+    DEFAULT_CHUNK_ROWS,
     DEFAULT_DUPLICATE_POLICY,
+    DEFAULT_MAX_DECOMPRESSED_BYTES,
     DEFAULT_MAX_UPLOAD_BYTES,
+    DEFAULT_REVIEW_PAGE_ROWS,
     PROCESSING_REPORT_VERSION,
     DuplicatePolicy,
+    DuplicateReview,
     IngestError,
+    PreparedUpload,
     ProcessedUpload,
     ProcessingReport,
+    apply_duplicate_policy,
+    duplicate_review,
     duplicate_review_table,
     load_methylation_file,
+    prepare_methylation_upload,
+    process_methylation_file,
     process_methylation_upload,
 )
+from .io import CSV_ENGINE_ENV_VAR, CompressionCodec, CsvEngine, strip_compression_suffix
+from .keys import CPG_KEY_COLUMN, CpgKeyCodec, encode_cpg_ids
+from .matrix import ProcessedMatrixUpload, process_methylation_matrix_upload
 from .panels import evaluate_panel, load_panel, panel_report_table, structured_interpretation
 from .qc_explain import explain_qc_summary
-from .transform import canonicalize_columns, normalize_upload, select_canonical_columns
-from .validate import ValidationConfig, ValidationError, validate_upload
+from .transform import (
+    COMPACT_DTYPE_POLICY,
+    DEFAULT_DTYPE_POLICY,
+    DtypePolicy,
+    apply_dtype_policy,
+    canonicalize_columns,
+    normalize_upload,
+    select_canonical_columns,
+)
+from .validate import (
+    DEFAULT_MAX_VIOLATIONS,
+    RECOMMENDED_COLUMN_RULES,
+    ColumnRule,
+    RuleSeverity,
+    ValidationConfig,
+    ValidationError,
+    ValidationViolations,
+    validate_upload,
+)
 
 __all__ = [
+    "AsyncIngestor",
+    "AsyncReader",
+    "BatchFileResult",
+    "BatchIngestResult",
+    "BatchSummary",
+    "CACHE_DIR_ENV_VAR",
+    "CPG_KEY_COLUMN",
+    "COMPACT_DTYPE_POLICY",
+    "CSV_ENGINE_ENV_VAR",
+    "ColumnRule",
+    "CompressionCodec",
+    "CpgKeyCodec",
+    "CsvEngine",
+    "DEFAULT_CACHE_MAX_BYTES",
+    "DEFAULT_CHUNK_ROWS",
+    "DEFAULT_DTYPE_POLICY",
     "DEFAULT_DUPLICATE_POLICY",
+    "DEFAULT_MAX_CONCURRENT_INGESTS",
+    "DEFAULT_MAX_DECOMPRESSED_BYTES",
     "DEFAULT_MAX_UPLOAD_BYTES",
+    "DEFAULT_MAX_VIOLATIONS",
+    "DEFAULT_REVIEW_PAGE_ROWS",
+    "DtypePolicy",
     "DuplicatePolicy",
+    "DuplicateReview",
+    "ExecutorKind",
+    "IngestCache",
     "IngestError",
     "PROCESSING_REPORT_VERSION",
+    "PreparedUpload",
+    "ProcessedMatrixUpload",
     "ProcessedUpload",
     "ProcessingReport",
+    "RECOMMENDED_COLUMN_RULES",
+    "RuleSeverity",
     "ValidationConfig",
     "ValidationError",
+    "ValidationViolations",
     "analyze_methylation",
+    "apply_dtype_policy",
+    "apply_duplicate_policy",
     "evaluate_panel",
     "explain_qc_summary",
     "canonicalize_columns",
+    "default_ingest_cache",
+    "duplicate_review",
     "duplicate_review_table",
+    "encode_cpg_ids",
     "load_methylation_file",
     "load_panel",
     "normalize_upload",
     "panel_report_table",
+    "prepare_methylation_upload",
     "structured_interpretation",
+    "process_methylation_file",
+    "process_methylation_matrix_upload",
     "process_methylation_upload",
+    "process_methylation_uploads",
     "qc_summary",
     "select_canonical_columns",
+    "strip_compression_suffix",
     "validate_upload",
 ]
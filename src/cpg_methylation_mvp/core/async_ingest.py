@@ -0,0 +1,245 @@
+"""Asyncio facade that runs ingest in a managed executor with bounded concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+import threading
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from io import BufferedReader, RawIOBase
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Literal, Protocol, runtime_checkable
+
+from .ingest import (
+    DEFAULT_CHUNK_ROWS,
+    DEFAULT_DUPLICATE_POLICY,
+    DEFAULT_MAX_UPLOAD_BYTES,
+    DuplicatePolicy,
+    ProcessedUpload,
+    process_methylation_upload,
+)
+from .uploads import READ_BLOCK_BYTES, IngestError, upload_limit_error, upload_name
+
+ExecutorKind = Literal["thread", "process"]
+DEFAULT_MAX_CONCURRENT_INGESTS = 2
+
+
+@runtime_checkable
+class AsyncReader(Protocol):
+    """An upload body with an ``async read(size)`` method, such as an aiohttp or Starlette stream."""
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+async def _read_blocks(reader: AsyncReader | AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Yield the non-empty byte blocks of an async reader or an async iterable of byte chunks."""
+    if isinstance(reader, AsyncReader):
+        while block := await reader.read(READ_BLOCK_BYTES):
+            yield bytes(block)
+        return
+    async for block in reader:
+        if block:
+            yield bytes(block)
+
+
+async def _next_block(blocks: AsyncIterator[bytes]) -> bytes:
+    """Return the next block of ``blocks``, or empty bytes once it is exhausted."""
+    return await anext(blocks, b"")
+
+
+class _AsyncReaderBridge(RawIOBase):
+    """Blocking file object that pulls an async byte stream block by block through the event loop.
+
+    It is read from a worker thread, behind a ``BufferedReader`` so sized reads are filled across
+    blocks: each raw read schedules the stream's next block on ``loop`` and waits for it, so only a
+    block or two is held at a time and a slow client just pauses ingest. After ``cancel``, waiting
+    and later reads raise ``asyncio.CancelledError``, which the ingest error boundary does not
+    translate. An exception raised by the stream itself is kept in ``error``.
+    """
+
+    def __init__(self, blocks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__()
+        self._blocks = blocks
+        self._loop = loop
+        self._pending = memoryview(b"")
+        self._exhausted = False
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._next_block: concurrent.futures.Future[bytes] | None = None
+        self.error: Exception | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._pending and not self._exhausted:
+            block = self._fetch_next_block()
+            self._pending = memoryview(block)
+            self._exhausted = not block
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self._pending))
+        target[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def cancel(self) -> None:
+        """Stop the stream: abandon the block being awaited and fail every later read."""
+        with self._lock:
+            self._cancelled = True
+            if self._next_block is not None:
+                self._next_block.cancel()
+
+    def _fetch_next_block(self) -> bytes:
+        with self._lock:
+            if self._cancelled:
+                raise asyncio.CancelledError
+            self._next_block = asyncio.run_coroutine_threadsafe(_next_block(self._blocks), self._loop)
+        try:
+            return self._next_block.result()
+        except concurrent.futures.CancelledError:
+            raise asyncio.CancelledError from None
+        except Exception as exc:
+            self.error = exc
+            raise
+
+
+async def _spool_upload(
+    reader: AsyncReader | AsyncIterable[bytes],
+    path: Path,
+    max_upload_bytes: int,
+) -> None:
+    """Write an async upload body to ``path`` block by block, enforcing ``max_upload_bytes``."""
+    spooled_bytes = 0
+    with path.open("wb") as handle:
+        async for block in _read_blocks(reader):
+            spooled_bytes += len(block)
+            if spooled_bytes > max_upload_bytes:
+                raise upload_limit_error(max_upload_bytes)
+            await asyncio.to_thread(handle.write, block)
+
+
+def _process_spooled_upload(path: Path, ingest: Callable[[Any], ProcessedUpload]) -> ProcessedUpload:
+    """Run ``ingest`` on a spooled upload file; executed in a worker process."""
+    with path.open("rb") as handle:
+        return ingest(handle)
+
+
+async def _await_worker(work: concurrent.futures.Future[ProcessedUpload], stop: Callable[[], None]) -> ProcessedUpload:
+    """Await executor work; when the awaiting task is cancelled, drop or ``stop`` the work and re-raise."""
+    try:
+        return await asyncio.wrap_future(work)
+    except asyncio.CancelledError:
+        work.cancel()
+        stop()
+        raise
+
+
+class AsyncIngestor:
+    """Run methylation ingests from async code without blocking the event loop.
+
+    Ingests run in a managed thread or process pool with one worker per allowed concurrent ingest,
+    and a semaphore admits at most ``max_concurrent`` ingests at a time; later callers wait in
+    arrival order. With ``executor="thread"`` the upload body is parsed as it arrives, one block at a
+    time. With ``executor="process"`` the body is first spooled to a temporary file in
+    ``spool_directory`` (never held in memory) and parsed by a worker process, which keeps CPU-bound
+    parsing off the calling process's GIL.
+
+    Cancelling an awaiting task abandons its ingest: work not yet started is dropped, a thread-mode
+    ingest stops at its next read of the body, and spooling stops at once. A process-mode ingest
+    that is already parsing runs to completion in its worker and its result is discarded.
+    """
+
+    def __init__(
+        self,
+        executor: ExecutorKind = "thread",
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_INGESTS,
+        spool_directory: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be a positive integer.")
+        if executor == "thread":
+            self._executor: Executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="cpg_ingest")
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_concurrent)
+        else:
+            raise ValueError('executor must be "thread" or "process".')
+        self.executor_kind: ExecutorKind = executor
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._spool_directory = spool_directory
+
+    async def process_upload(
+        self,
+        reader: AsyncReader | AsyncIterable[bytes],
+        source_name: str | None = None,
+        duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
+        chunk_rows: int | None = DEFAULT_CHUNK_ROWS,
+        **ingest_options: Any,
+    ) -> ProcessedUpload:
+        """Ingest an upload body read from ``reader`` and return the processed upload.
+
+        ``reader`` is either an object with ``async read(size)`` or an async iterable of byte chunks.
+        The result matches ``process_methylation_upload`` on the same bytes; ``ingest_options`` are
+        its remaining keyword arguments. ``chunk_rows`` defaults to ``DEFAULT_CHUNK_ROWS`` so rows are
+        parsed as blocks arrive; pass ``None`` to collect the body first and parse it in one pass.
+        Errors raised by ``reader`` itself propagate unchanged rather than as an ``IngestError``.
+        """
+        name = upload_name(reader, source_name)
+        ingest = partial(
+            process_methylation_upload,
+            source_name=name,
+            duplicate_policy=duplicate_policy,
+            chunk_rows=chunk_rows,
+            **ingest_options,
+        )
+        async with self._semaphore:
+            if self.executor_kind == "thread":
+                return await self._process_in_thread(reader, ingest)
+            max_upload_bytes = ingest_options.get("max_upload_bytes", DEFAULT_MAX_UPLOAD_BYTES)
+            return await self._process_in_worker_process(reader, ingest, max_upload_bytes)
+
+    async def _process_in_thread(
+        self,
+        reader: AsyncReader | AsyncIterable[bytes],
+        ingest: Callable[[Any], ProcessedUpload],
+    ) -> ProcessedUpload:
+        bridge = _AsyncReaderBridge(_read_blocks(reader), asyncio.get_running_loop())
+        try:
+            body = BufferedReader(bridge, buffer_size=READ_BLOCK_BYTES)
+            return await _await_worker(self._executor.submit(ingest, body), bridge.cancel)
+        except IngestError:
+            if bridge.error is not None:
+                raise bridge.error from None
+            raise
+
+    async def _process_in_worker_process(
+        self,
+        reader: AsyncReader | AsyncIterable[bytes],
+        ingest: Callable[[Any], ProcessedUpload],
+        max_upload_bytes: int,
+    ) -> ProcessedUpload:
+        with tempfile.TemporaryDirectory(prefix="cpg_upload_", dir=self._spool_directory) as spool_directory:
+            spool_path = Path(spool_directory) / "upload"
+            await _spool_upload(reader, spool_path, max_upload_bytes)
+            work = self._executor.submit(_process_spooled_upload, spool_path, ingest)
+            return await _await_worker(work, lambda: None)
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the executor, dropping queued work; ``wait`` blocks until running ingests end."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncIngestor:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await asyncio.to_thread(self.close)
@@ -0,0 +1,179 @@
+"""Batch ingestion of many local methylation files across worker processes."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .ingest import (
+    DEFAULT_DUPLICATE_POLICY,
+    DEFAULT_MAX_UPLOAD_BYTES,
+    DuplicatePolicy,
+    IngestError,
+    ProcessedUpload,
+    process_methylation_file,
+)
+from .io import CsvEngine, resolve_csv_engine
+
+
+@dataclass(frozen=True)
+class BatchFileResult:
+    """Outcome for one batch input: a processed upload or a structured failure message."""
+
+    path: str
+    source_file: str
+    processed: ProcessedUpload | None = None
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Return whether the file was ingested successfully."""
+        return self.processed is not None
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """Combined counts across the processing reports of a batch.
+
+    Row, duplicate, and aggregation counts sum the matching ``ProcessingReport`` fields of the
+    successful files.
+    """
+
+    file_count: int
+    succeeded_file_count: int
+    failed_file_count: int
+    input_row_count: int
+    retained_row_count: int
+    dropped_row_count: int
+    dropped_rows_by_reason: dict[str, int]
+    duplicate_cpg_id_groups: int
+    duplicate_cpg_id_extra_rows: int
+    duplicate_metadata_conflict_groups: int = 0
+    aggregated_duplicate_cpg_id_groups: int = 0
+    aggregated_duplicate_input_rows: int = 0
+    aggregation_output_row_count: int = 0
+    warned_rows_by_rule: dict[str, int] = field(default_factory=dict)
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY
+
+    def to_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the summary."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BatchIngestResult:
+    """Per-file results in input order plus the combined batch summary."""
+
+    results: tuple[BatchFileResult, ...]
+    summary: BatchSummary
+
+    @property
+    def failures(self) -> tuple[BatchFileResult, ...]:
+        """Return the failed file results in input order."""
+        return tuple(result for result in self.results if not result.succeeded)
+
+    def report_table(self) -> pd.DataFrame:
+        """Return one row per input file with its flattened report or failure message."""
+        rows: list[dict[str, object]] = []
+        for result in self.results:
+            row: dict[str, object] = {"path": result.path, "status": "ok" if result.succeeded else "failed"}
+            if result.processed is not None:
+                row.update(result.processed.report.to_flat_dict())
+            else:
+                row.update({"source_file": result.source_file, "error": result.error})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def _ingest_batch_file(path: str, ingest_options: dict[str, Any]) -> BatchFileResult:
+    """Ingest one batch input and capture expected per-file failures instead of raising."""
+    source_file = Path(path).name
+    try:
+        processed = process_methylation_file(path, **ingest_options)
+    except IngestError as exc:
+        return BatchFileResult(path=path, source_file=source_file, error=str(exc))
+    except OSError as exc:
+        return BatchFileResult(
+            path=path,
+            source_file=source_file,
+            error=f"Could not read {source_file}: {exc.strerror or exc}.",
+        )
+    return BatchFileResult(path=path, source_file=source_file, processed=processed)
+
+
+def _summed_counts(counts: Iterable[dict[str, int]]) -> dict[str, int]:
+    """Sum per-file count dictionaries key by key, keeping first-seen key order."""
+    totals: dict[str, int] = {}
+    for file_counts in counts:
+        for key, count in file_counts.items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+
+def _summarize_batch(results: tuple[BatchFileResult, ...], duplicate_policy: DuplicatePolicy) -> BatchSummary:
+    """Sum per-file report counts into one batch summary."""
+    reports = [result.processed.report for result in results if result.processed is not None]
+
+    return BatchSummary(
+        file_count=len(results),
+        succeeded_file_count=len(reports),
+        failed_file_count=len(results) - len(reports),
+        input_row_count=sum(report.input_row_count for report in reports),
+        retained_row_count=sum(report.retained_row_count for report in reports),
+        dropped_row_count=sum(report.dropped_row_count for report in reports),
+        dropped_rows_by_reason=_summed_counts(report.dropped_rows_by_reason for report in reports),
+        duplicate_cpg_id_groups=sum(report.duplicate_cpg_id_groups for report in reports),
+        duplicate_cpg_id_extra_rows=sum(report.duplicate_cpg_id_extra_rows for report in reports),
+        duplicate_metadata_conflict_groups=sum(report.duplicate_metadata_conflict_groups for report in reports),
+        aggregated_duplicate_cpg_id_groups=sum(report.aggregated_duplicate_cpg_id_groups for report in reports),
+        aggregated_duplicate_input_rows=sum(report.aggregated_duplicate_input_rows for report in reports),
+        aggregation_output_row_count=sum(report.aggregation_output_row_count for report in reports),
+        warned_rows_by_rule=_summed_counts(report.warned_rows_by_rule for report in reports),
+        duplicate_policy=duplicate_policy,
+    )
+
+
+def process_methylation_uploads(
+    paths: Iterable[str | os.PathLike[str]],
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
+    max_workers: int | None = None,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    csv_engine: CsvEngine | None = None,
+    **ingest_options: Any,
+) -> BatchIngestResult:
+    """Ingest many local methylation files in parallel worker processes.
+
+    Results keep the input order regardless of completion order. An ``IngestError`` (or unreadable
+    path) for one file is recorded as a failed ``BatchFileResult`` and does not stop the batch.
+    ``max_workers=1`` processes files in the calling process; ``None`` uses one worker per CPU.
+    ``ingest_options`` are the remaining keyword arguments of ``process_methylation_file`` (for
+    example ``validation_config``, ``collect_violations``, ``chunk_rows``, or ``dtype_policy``) and
+    apply to every file; they must be picklable when files run in worker processes.
+    """
+    if max_workers is not None and max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+    batch_paths = [os.fspath(path) for path in paths]
+    ingest_file = partial(
+        _ingest_batch_file,
+        ingest_options={
+            **ingest_options,
+            "duplicate_policy": duplicate_policy,
+            "max_upload_bytes": max_upload_bytes,
+            "csv_engine": resolve_csv_engine(csv_engine),
+        },
+    )
+
+    if max_workers == 1 or len(batch_paths) <= 1:
+        results = tuple(ingest_file(path) for path in batch_paths)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = tuple(executor.map(ingest_file, batch_paths))
+
+    return BatchIngestResult(results=results, summary=_summarize_batch(results, duplicate_policy))
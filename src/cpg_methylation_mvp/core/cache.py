@@ -0,0 +1,129 @@
+"""Content-addressed on-disk cache for ingest results shared across sessions and processes."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+CACHE_DIR_ENV_VAR = "CPG_MVP_CACHE_DIR"
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+_METADATA_FILE = "metadata.json"
+_PARQUET_SUFFIX = ".parquet"
+_PICKLE_SUFFIX = ".pkl"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Frames and JSON metadata stored under one cache key."""
+
+    frames: dict[str, pd.DataFrame]
+    metadata: dict[str, Any]
+
+
+def _directory_bytes(path: Path) -> int:
+    """Return the total size of the files directly inside ``path``."""
+    return sum(child.stat().st_size for child in path.iterdir() if child.is_file())
+
+
+class IngestCache:
+    """Persist ingest results on local disk under content-derived keys.
+
+    Each entry is a directory named after its key holding one columnar file per frame (Parquet when
+    pyarrow is installed, pickle otherwise) and a ``metadata.json``. Entries are written to a
+    temporary directory and renamed into place, so concurrent writers never expose a partial entry.
+    Reads refresh an entry's modification time; after each write the least recently used entries
+    are evicted until the cache fits in ``max_bytes``. Unreadable entries count as misses and frames
+    that cannot be serialized are simply not cached.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._frame_suffix = _PARQUET_SUFFIX if importlib.util.find_spec("pyarrow") is not None else _PICKLE_SUFFIX
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the size of all cache entries on disk."""
+        return sum(size for _, size in self._entries())
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry stored under ``key``, or ``None`` when it is missing or unreadable."""
+        entry_dir = self.directory / key
+        try:
+            metadata = json.loads((entry_dir / _METADATA_FILE).read_text(encoding="utf-8"))
+            frames = {
+                path.stem: pd.read_parquet(path) if path.suffix == _PARQUET_SUFFIX else pd.read_pickle(path)
+                for path in entry_dir.iterdir()
+                if path.suffix in (_PARQUET_SUFFIX, _PICKLE_SUFFIX)
+            }
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, NotImplementedError):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        return CacheEntry(frames=frames, metadata=metadata)
+
+    def put(self, key: str, frames: dict[str, pd.DataFrame], metadata: dict[str, Any]) -> None:
+        """Store ``frames`` and ``metadata`` under ``key``, then evict down to ``max_bytes``."""
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.directory))
+        try:
+            for name, frame in frames.items():
+                path = staging_dir / f"{name}{self._frame_suffix}"
+                if self._frame_suffix == _PARQUET_SUFFIX:
+                    frame.to_parquet(path)
+                else:
+                    frame.to_pickle(path)
+            (staging_dir / _METADATA_FILE).write_text(json.dumps(metadata), encoding="utf-8")
+            entry_dir = self.directory / key
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            staging_dir.rename(entry_dir)
+        except (OSError, ValueError, TypeError, NotImplementedError):
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for entry_dir, _ in self._entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def _entries(self) -> list[tuple[Path, int]]:
+        """Return complete entries with their sizes, least recently used first."""
+        entries: list[tuple[float, Path, int]] = []
+        for entry_dir in self.directory.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            try:
+                entries.append((entry_dir.stat().st_mtime, entry_dir, _directory_bytes(entry_dir)))
+            except FileNotFoundError:
+                continue
+        return [(entry_dir, size) for _, entry_dir, size in sorted(entries, key=lambda entry: entry[0])]
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = self._entries()
+        total_bytes = sum(size for _, size in entries)
+        for entry_dir, size in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+
+
+def default_ingest_cache(max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> IngestCache | None:
+    """Return a cache in the ``CPG_MVP_CACHE_DIR`` directory, or ``None`` when it is not set."""
+    directory = os.getenv(CACHE_DIR_ENV_VAR)
+    return IngestCache(directory, max_bytes=max_bytes) if directory else None
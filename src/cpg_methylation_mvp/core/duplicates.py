@@ -0,0 +1,212 @@
+"""Duplicate-probe policies shared by the long-format and matrix ingest paths: conflicts and reducers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+from .keys import CPG_KEY_COLUMN
+
+DuplicatePolicy = Literal[
+    "preserve_rows_and_warn",
+    "reject_duplicates",
+    "aggregate_mean_when_metadata_match",
+    "aggregate_median_when_metadata_match",
+    "aggregate_pval_weighted_mean_when_metadata_match",
+]
+AGGREGATION_METADATA_COLUMNS = ("chrom", "pos", "gene", "pval")
+
+
+@dataclass(frozen=True)
+class DuplicateMetadataConflicts:
+    """Per-group metadata conflicts for the duplicate rows of a frame.
+
+    ``group_codes`` numbers each duplicate row's group in first-appearance order, and
+    ``conflict_columns`` holds one ``"chrom|gene"``-style label per group (empty when consistent).
+    """
+
+    duplicate_mask: pd.Series
+    group_codes: np.ndarray
+    conflict_columns: np.ndarray
+
+    @property
+    def conflict_group_count(self) -> int:
+        """Return the number of duplicate groups with at least one conflicting column."""
+        return int((self.conflict_columns != "").sum())
+
+
+def cpg_group_column(df: pd.DataFrame) -> str:
+    """Return the column that identifies duplicate groups: the integer key when present, else cpg_id."""
+    return CPG_KEY_COLUMN if CPG_KEY_COLUMN in df.columns else "cpg_id"
+
+
+def column_conflicts(values: pd.Series, group_codes: np.ndarray, group_count: int) -> np.ndarray:
+    """Return which groups hold more than one distinct non-empty trimmed value of ``values``."""
+    trimmed = values.astype(str).str.strip()
+    non_empty = (values.notna() & trimmed.ne("")).to_numpy(dtype=bool)
+    distinct_values = trimmed[non_empty].groupby(group_codes[non_empty]).nunique()
+    conflicts = np.zeros(group_count, dtype=bool)
+    conflicts[distinct_values.index[distinct_values.gt(1)]] = True
+    return conflicts
+
+
+def duplicate_metadata_columns(df: pd.DataFrame, excluded_columns: Sequence[str] = ()) -> list[str]:
+    """Return metadata columns relevant for duplicate-group conflict review."""
+    return [
+        column for column in AGGREGATION_METADATA_COLUMNS if column in df.columns and column not in excluded_columns
+    ]
+
+
+def duplicate_metadata_conflicts(
+    df: pd.DataFrame,
+    excluded_columns: Sequence[str] = (),
+) -> DuplicateMetadataConflicts:
+    """Find duplicate groups whose non-empty metadata values disagree, in one vectorized pass.
+
+    Each metadata column is trimmed once over the duplicate rows; a grouped distinct count of the
+    non-empty values marks the conflicting columns of every group at the same time.
+    ``excluded_columns`` are not checked.
+    """
+    group_column = cpg_group_column(df)
+    duplicate_mask = df[group_column].duplicated(keep=False)
+    if not bool(duplicate_mask.any()):
+        return DuplicateMetadataConflicts(
+            duplicate_mask=duplicate_mask,
+            group_codes=np.empty(0, dtype=np.intp),
+            conflict_columns=np.empty(0, dtype=object),
+        )
+
+    duplicate_rows = df.loc[duplicate_mask]
+    group_codes, group_keys = pd.factorize(duplicate_rows[group_column], use_na_sentinel=False)
+    metadata_columns = duplicate_metadata_columns(duplicate_rows, excluded_columns)
+    conflict_bits = np.zeros(len(group_keys), dtype=np.intp)
+    for bit, column in enumerate(metadata_columns):
+        conflict_bits[column_conflicts(duplicate_rows[column], group_codes, len(group_keys))] |= 1 << bit
+    conflict_labels = np.array(
+        [
+            "|".join(column for bit, column in enumerate(metadata_columns) if combination >> bit & 1)
+            for combination in range(1 << len(metadata_columns))
+        ],
+        dtype=object,
+    )
+    return DuplicateMetadataConflicts(
+        duplicate_mask=duplicate_mask,
+        group_codes=group_codes,
+        conflict_columns=conflict_labels[conflict_bits],
+    )
+
+
+def duplicate_metadata_conflict_groups(df: pd.DataFrame, excluded_columns: Sequence[str] = ()) -> int:
+    """Return the number of duplicate cpg_id groups with conflicting metadata."""
+    return duplicate_metadata_conflicts(df, excluded_columns).conflict_group_count
+
+
+def _non_empty_value_mask(series: pd.Series) -> pd.Series:
+    """Return a mask for values that are not null/blank after string trim."""
+    return series.notna() & series.astype(str).str.strip().ne("")
+
+
+def _mean_reducer(beta: pd.DataFrame, group_codes: np.ndarray, duplicate_rows: pd.DataFrame) -> pd.DataFrame:
+    """Return the mean of each beta column per duplicate group."""
+    return beta.groupby(group_codes, sort=True).mean()
+
+
+def _median_reducer(beta: pd.DataFrame, group_codes: np.ndarray, duplicate_rows: pd.DataFrame) -> pd.DataFrame:
+    """Return the median of each beta column per duplicate group."""
+    return beta.groupby(group_codes, sort=True).median()
+
+
+def _pval_weighted_mean_reducer(
+    beta: pd.DataFrame,
+    group_codes: np.ndarray,
+    duplicate_rows: pd.DataFrame,
+) -> pd.DataFrame:
+    """Return per-group beta means weighted by ``1 - pval``.
+
+    Rows without a numeric ``pval`` get weight 1; groups whose present values all have zero weight
+    fall back to the unweighted mean.
+    """
+    if "pval" in duplicate_rows.columns:
+        pval = pd.to_numeric(duplicate_rows["pval"], errors="coerce").to_numpy(dtype=float)
+        weights = np.where(np.isnan(pval), 1.0, 1.0 - np.clip(pval, 0.0, 1.0))
+    else:
+        weights = np.ones(len(duplicate_rows))
+    weighted_sums = beta.mul(weights, axis=0).groupby(group_codes, sort=True).sum()
+    weight_sums = beta.notna().mul(weights, axis=0).groupby(group_codes, sort=True).sum()
+    weighted_means = weighted_sums / weight_sums.where(weight_sums > 0)
+    return weighted_means.fillna(_mean_reducer(beta, group_codes, duplicate_rows))
+
+
+@dataclass(frozen=True)
+class DuplicateReducer:
+    """Grouped beta reduction behind one aggregation duplicate policy.
+
+    ``reduce`` maps one or more beta columns, the duplicate rows' group codes, and the duplicate rows
+    themselves to one reduced row per group. ``weight_columns`` are per-measurement columns the
+    reducer reads: they are not checked for metadata conflicts, and the aggregated row carries
+    the stored value of the row holding their numeric group minimum.
+    """
+
+    reduce: Callable[[pd.DataFrame, np.ndarray, pd.DataFrame], pd.DataFrame]
+    weight_columns: tuple[str, ...] = ()
+
+
+AGGREGATION_REDUCERS: dict[DuplicatePolicy, DuplicateReducer] = {
+    "aggregate_mean_when_metadata_match": DuplicateReducer(_mean_reducer),
+    "aggregate_median_when_metadata_match": DuplicateReducer(_median_reducer),
+    "aggregate_pval_weighted_mean_when_metadata_match": DuplicateReducer(
+        _pval_weighted_mean_reducer,
+        weight_columns=("pval",),
+    ),
+}
+
+
+def conflict_excluded_columns(duplicate_policy: DuplicatePolicy) -> tuple[str, ...]:
+    """Return the columns a policy's reducer consumes and therefore leaves out of conflict checks."""
+    reducer = AGGREGATION_REDUCERS.get(duplicate_policy)
+    return reducer.weight_columns if reducer is not None else ()
+
+
+def _first_non_empty(values: pd.Series, group_codes: np.ndarray) -> pd.Series:
+    """Return the first non-empty value of ``values`` per duplicate group."""
+    return values.where(_non_empty_value_mask(values)).groupby(group_codes, sort=True).first()
+
+
+def _carried_weight(values: pd.Series, group_codes: np.ndarray) -> np.ndarray:
+    """Return per group the value of the row with the smallest numeric weight.
+
+    The value is taken as stored, so the column keeps its dtype when text weights such as ``<0.01``
+    are present; groups without a numeric weight carry their first non-empty value.
+    """
+    carried = _first_non_empty(values, group_codes)
+    numeric = pd.Series(pd.to_numeric(values, errors="coerce").to_numpy(dtype=float), copy=False)
+    has_numeric = numeric.notna().to_numpy()
+    if has_numeric.any():
+        minimum_positions = numeric[has_numeric].groupby(group_codes[has_numeric], sort=True).idxmin()
+        carried.loc[minimum_positions.index] = values.iloc[minimum_positions.to_numpy()].to_numpy()
+    return carried.to_numpy()
+
+
+def carried_metadata(
+    duplicate_rows: pd.DataFrame,
+    group_codes: np.ndarray,
+    weight_columns: Sequence[str] = (),
+) -> dict[str, Any]:
+    """Return each aggregation metadata column's value per duplicate group.
+
+    Metadata carries the first non-empty value; ``weight_columns`` carry the value of the row with
+    the numeric group minimum.
+    """
+    carried: dict[str, Any] = {}
+    for column in AGGREGATION_METADATA_COLUMNS:
+        if column not in duplicate_rows.columns:
+            carried[column] = pd.NA
+        elif column in weight_columns:
+            carried[column] = _carried_weight(duplicate_rows[column], group_codes)
+        else:
+            carried[column] = _first_non_empty(duplicate_rows[column], group_codes).to_numpy()
+    return carried
@@ -3,37 +3,91 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import asdict, dataclass
+import json
+import mmap
+import os
+from collections.abc import Iterator, Sequence
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
-from typing import BinaryIO, Literal
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO
 from uuid import uuid4
 
+import numpy as np
 import pandas as pd
 
-from .io import read_table_bytes
-from .transform import normalize_upload
+from .cache import CacheEntry, IngestCache
+from .duplicates import (
+    AGGREGATION_METADATA_COLUMNS,
+    AGGREGATION_REDUCERS,
+    DuplicatePolicy,
+    carried_metadata,
+    column_conflicts,
+    conflict_excluded_columns,
+    cpg_group_column,
+    duplicate_metadata_columns,
+    duplicate_metadata_conflicts,
+)
+from .io import (
+    CompressionCodec,
+    CsvEngine,
+    StreamedColumnTypes,
+    TableReadResult,
+    detect_compression,
+    read_table_bytes,
+    read_table_chunks,
+    resolve_csv_engine,
+    strip_compression_suffix,
+)
+from .keys import CpgKeyCodec, categorize_metadata_columns, with_cpg_key_column
+from .spill import HashPartitionSpill
+from .timing import StageTimings, stage_timings, timed_stage
+from .transform import (
+    DEFAULT_DTYPE_POLICY,
+    DtypePolicy,
+    apply_dtype_policy,
+    frame_memory_bytes,
+    normalize_upload,
+)
+from .uploads import (
+    READ_BLOCK_BYTES,
+    HashingReader,
+    IngestError,
+    UploadProvenance,
+    empty_upload_error,
+    ingest_error_boundary,
+    open_parse_stream,
+    read_upload_bytes,
+    upload_limit_error,
+    upload_name,
+    upload_provenance,
+)
 from .validate import (
+    DEFAULT_MAX_VIOLATIONS,
+    VIOLATION_RULE_IDS,
+    ValidatedUpload,
+    ValidationConfig,
     ValidationError,
+    ValidationKernelResult,
+    ValidationViolations,
+    detection_pval_mask,
+    ensure_at_least_one_valid_required_row,
     ensure_non_empty_dataframe,
-    required_value_masks,
     validate_upload,
+    validate_upload_with_kernel,
 )
 
-DuplicatePolicy = Literal[
-    "preserve_rows_and_warn",
-    "reject_duplicates",
-    "aggregate_mean_when_metadata_match",
-]
 DEFAULT_DUPLICATE_POLICY: DuplicatePolicy = "preserve_rows_and_warn"
 DEFAULT_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+DEFAULT_MAX_DECOMPRESSED_BYTES = 250 * 1024 * 1024
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_REVIEW_PAGE_ROWS = 100
 PROCESSING_REPORT_VERSION = "2.0"
 _DUPLICATE_REVIEW_EXCLUDED_COLUMNS = {"cpg_id", "beta", "source_file", "uploaded_at"}
 _AGGREGATION_DUPLICATE_POLICY: DuplicatePolicy = "aggregate_mean_when_metadata_match"
-_AGGREGATION_METADATA_COLUMNS = ("chrom", "pos", "gene", "pval")
-
-
-class IngestError(ValidationError):
-    """Raised for parsing and ingestion errors."""
+DETECTION_PVAL_DROP_REASON = "detection_pval_above_threshold"
 
 
 @dataclass(frozen=True)
@@ -63,10 +117,18 @@ class ProcessingReport:
     aggregated_duplicate_input_rows: int = 0
     aggregation_output_row_count: int = 0
     aggregation_blocked_conflict_groups: int = 0
+    compression: str | None = None
+    memory_bytes_before_compaction: int | None = None
+    memory_bytes_after_compaction: int | None = None
+    warned_rows_by_rule: dict[str, int] = field(default_factory=dict)
+    timings: dict[str, dict[str, float]] | None = None
 
     def to_dict(self) -> dict[str, object]:
-        """Return a JSON-friendly representation of the report."""
-        return asdict(self)
+        """Return a JSON-friendly representation of the report; ``timings`` only when collected."""
+        report = asdict(self)
+        if self.timings is None:
+            report.pop("timings")
+        return report
 
     def to_flat_dict(self) -> dict[str, object]:
         """Return a flat dictionary that is easy to write as one CSV row."""
@@ -74,6 +136,13 @@ class ProcessingReport:
         flattened.pop("dropped_rows_by_reason")
         for reason, count in self.dropped_rows_by_reason.items():
             flattened[f"dropped_rows_{reason}"] = count
+        flattened.pop("warned_rows_by_rule")
+        for rule_id, count in self.warned_rows_by_rule.items():
+            flattened[f"warned_rows_{rule_id}"] = count
+        flattened.pop("timings", None)
+        for stage, metrics in (self.timings or {}).items():
+            for metric, value in metrics.items():
+                flattened[f"timing_{stage}_{metric}"] = value
         flattened["parse_warnings"] = " | ".join(self.parse_warnings)
         return flattened
 
@@ -85,6 +154,46 @@ class ProcessedUpload:
     normalized_df: pd.DataFrame
     report: ProcessingReport
     aggregation_audit_df: pd.DataFrame | None = None
+    violations: ValidationViolations | None = None
+
+
+@dataclass(frozen=True)
+class PreparedUpload:
+    """Policy-independent ingest state that any duplicate policy can be applied to.
+
+    ``retained_df`` holds the parsed, canonicalized, and validated rows that survive the missing-value,
+    column-rule, and detection filters, keyed with ``cpg_key`` under ``compact_keys``. Its duplicate
+    groups and per-column metadata conflicts are computed once here. Row counts, violations, and
+    upload provenance are carried through to every report built from it.
+    """
+
+    retained_df: pd.DataFrame
+    input_row_count: int
+    dropped_rows_by_reason: dict[str, int]
+    warned_rows_by_rule: dict[str, int]
+    provenance: UploadProvenance
+    compact_keys: bool = False
+    dtype_policy: DtypePolicy = DEFAULT_DTYPE_POLICY
+    violations: ValidationViolations | None = None
+    timings: dict[str, dict[str, float]] | None = None
+    duplicate_groups: _DuplicateGroups | None = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class _IngestOptions:
+    """Private bundle of ingest settings threaded from the public entry points to the pipeline."""
+
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY
+    csv_engine: CsvEngine = "c"
+    parse_workers: int = 1
+    collect_violations: bool = False
+    max_violations: int = DEFAULT_MAX_VIOLATIONS
+    compact_keys: bool = False
+    dtype_policy: DtypePolicy = DEFAULT_DTYPE_POLICY
+    validation_config: ValidationConfig = field(default_factory=ValidationConfig)
+    detection_pval_threshold: float | None = None
+    spill_partitions: int | None = None
+    collect_timings: bool = False
 
 
 @dataclass(frozen=True)
@@ -103,75 +212,151 @@ class _DuplicatePolicyResult:
     aggregation_audit_df: pd.DataFrame | None = None
 
 
-def _input_sha256(raw_bytes: bytes) -> str:
-    """Return a stable checksum of the uploaded file bytes."""
-    return hashlib.sha256(raw_bytes).hexdigest()
-
-
-def _missing_row_counts(validated_df: pd.DataFrame) -> tuple[dict[str, int], pd.Series]:
-    """Return exclusive dropped-row counts and the retained-row mask."""
-    missing_cpg_id, missing_beta, valid_rows = required_value_masks(validated_df)
+@dataclass(frozen=True)
+class _DuplicateGroups:
+    """Private policy-independent duplicate structure of retained rows, computed once per upload.
+
+    ``duplicate_mask`` and ``first_rows`` flag rows whose key repeats and each key's first row;
+    ``group_codes`` numbers each duplicate row's group in first-appearance order. Per-column metadata
+    conflicts of the groups are computed on first use and kept in ``column_conflicts``, so every
+    policy applied afterwards reuses them.
+    """
+
+    duplicate_mask: np.ndarray
+    first_rows: np.ndarray
+    group_codes: np.ndarray
+    group_count: int
+    extra_row_count: int
+    duplicate_rows: pd.DataFrame
+    column_conflicts: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def conflict_group_count(self, excluded_columns: Sequence[str] = ()) -> int:
+        """Return the number of duplicate groups conflicting in any column outside ``excluded_columns``."""
+        conflicting = np.zeros(self.group_count, dtype=bool)
+        for column in duplicate_metadata_columns(self.duplicate_rows, excluded_columns):
+            if column not in self.column_conflicts:
+                self.column_conflicts[column] = column_conflicts(
+                    self.duplicate_rows[column], self.group_codes, self.group_count
+                )
+            conflicting |= self.column_conflicts[column]
+        return int(conflicting.sum())
+
+
+@dataclass
+class _ChunkedIngestState:
+    """Mutable row-accounting counters updated while validated chunks stream through ingest.
+
+    Retained rows are kept in memory, or, when ``spill`` is set, appended to its partition files
+    indexed by their position among all retained rows (keyed with ``key_codec`` when it is set).
+    Optional columns keep each chunk's parsed dtypes until ``column_types`` has seen every chunk.
+    """
+
+    input_row_count: int = 0
+    retained_row_count: int = 0
+    dropped_rows_by_reason: dict[str, int] = field(default_factory=dict)
+    warned_rows_by_rule: dict[str, int] = field(default_factory=dict)
+    retained_chunks: list[pd.DataFrame] = field(default_factory=list)
+    violation_parts: list[ValidationViolations] = field(default_factory=list)
+    detection_pval_threshold: float | None = None
+    spill: HashPartitionSpill | None = None
+    key_codec: CpgKeyCodec | None = None
+    column_types: StreamedColumnTypes = field(default_factory=StreamedColumnTypes)
+
+    def add_validated_chunk(self, validated_chunk: ValidatedUpload) -> None:
+        """Count dropped rows for one validated chunk and keep only its retained rows."""
+        chunk_dropped_rows_by_reason, chunk_warned_rows_by_rule, valid_rows = _missing_row_counts(
+            validated_chunk, self.detection_pval_threshold
+        )
+        self.input_row_count += int(len(validated_chunk.dataframe))
+        self.column_types.observe(validated_chunk.dataframe)
+        for reason, count in chunk_dropped_rows_by_reason.items():
+            self.dropped_rows_by_reason[reason] = self.dropped_rows_by_reason.get(reason, 0) + count
+        for rule_id, count in chunk_warned_rows_by_rule.items():
+            self.warned_rows_by_rule[rule_id] = self.warned_rows_by_rule.get(rule_id, 0) + count
+        retained_chunk = _retained_rows(validated_chunk.dataframe, valid_rows)
+        if self.spill is None:
+            self.retained_chunks.append(retained_chunk)
+        else:
+            if self.key_codec is not None:
+                retained_chunk = with_cpg_key_column(retained_chunk, self.key_codec)
+            self.spill.append(
+                retained_chunk.set_axis(
+                    pd.RangeIndex(self.retained_row_count, self.retained_row_count + len(retained_chunk))
+                )
+            )
+        self.retained_row_count += int(len(retained_chunk))
+        if validated_chunk.violations is not None:
+            self.violation_parts.append(validated_chunk.violations)
+
+
+def _missing_row_counts(
+    validated: ValidatedUpload,
+    detection_pval_threshold: float | None = None,
+) -> tuple[dict[str, int], dict[str, int], pd.Series]:
+    """Return exclusive dropped-row counts, warned-row counts, and the retained-row mask.
+
+    Under collect-all validation, rows that break a beta rule are counted under that rule id first
+    and excluded from the missing-value reasons. Configured drop rules then claim remaining rows in
+    declaration order, and the detection p-value filter claims what is left, so every dropped row
+    has exactly one reason.
+    """
+    kernel = validated.kernel
+    missing_cpg_id, missing_beta = kernel.missing_cpg_id, kernel.missing_beta
+    if validated.violations is not None:
+        rule_violation_rows = kernel.rule_violation_rows
+        missing_cpg_id = missing_cpg_id & ~rule_violation_rows
+        missing_beta = missing_beta & ~rule_violation_rows
     dropped_rows_by_reason = {
         "missing_cpg_id": int((missing_cpg_id & ~missing_beta).sum()),
         "missing_beta": int((missing_beta & ~missing_cpg_id).sum()),
         "missing_cpg_id_and_beta": int((missing_cpg_id & missing_beta).sum()),
     }
-    return dropped_rows_by_reason, valid_rows
-
-
-def _duplicate_counts(df: pd.DataFrame) -> tuple[int, int]:
-    """Return duplicate cpg_id group count and extra duplicate row count."""
-    duplicate_mask = df["cpg_id"].duplicated(keep=False)
-    duplicate_groups = int(df.loc[duplicate_mask, "cpg_id"].nunique())
-    duplicate_extra_rows = int(df["cpg_id"].duplicated(keep="first").sum())
-    return duplicate_groups, duplicate_extra_rows
-
-
-def _duplicate_metadata_conflict_groups(df: pd.DataFrame) -> int:
-    """Return the number of duplicate cpg_id groups with conflicting metadata."""
-    duplicate_mask = df["cpg_id"].duplicated(keep=False)
-    if not bool(duplicate_mask.any()):
-        return 0
-
-    conflict_groups = 0
-    duplicate_groups = df.loc[duplicate_mask].groupby("cpg_id", dropna=False)
-    for _, group in duplicate_groups:
-        if _duplicate_metadata_conflict_columns(group):
-            conflict_groups += 1
-
-    return conflict_groups
-
-
-def _duplicate_metadata_columns(df: pd.DataFrame) -> list[str]:
-    """Return metadata columns relevant for duplicate-group conflict review."""
-    return [column for column in _AGGREGATION_METADATA_COLUMNS if column in df.columns]
-
-
-def _duplicate_metadata_conflict_columns(group: pd.DataFrame) -> list[str]:
-    """Return metadata columns whose non-empty values disagree within a duplicate group."""
-    conflict_columns: list[str] = []
-    for column in _duplicate_metadata_columns(group):
-        non_null_values = group.loc[_non_empty_value_mask(group[column]), column].astype(str).str.strip()
-        distinct_values = {value for value in non_null_values if value != ""}
-        if len(distinct_values) > 1:
-            conflict_columns.append(column)
-    return conflict_columns
-
-
-def _non_empty_value_mask(series: pd.Series) -> pd.Series:
-    """Return a mask for values that are not null/blank after string trim."""
-    return series.notna() & series.astype(str).str.strip().ne("")
-
+    valid_rows = kernel.valid_rows
+    if validated.violations is not None:
+        dropped_rows_by_reason.update(validated.violations.counts_by_rule)
+        valid_rows = valid_rows & ~kernel.rule_violation_rows
+    dropped_rows_by_rule, warned_rows_by_rule, valid_rows = validated.rules.row_counts(valid_rows)
+    dropped_rows_by_reason.update(dropped_rows_by_rule)
+    if detection_pval_threshold is not None:
+        failed_detection = valid_rows & detection_pval_mask(validated.dataframe, detection_pval_threshold)
+        dropped_rows_by_reason[DETECTION_PVAL_DROP_REASON] = int(failed_detection.sum())
+        valid_rows = valid_rows & ~failed_detection
+    return dropped_rows_by_reason, warned_rows_by_rule, valid_rows
+
+
+def _ensure_detection_filter_kept_rows(retained_row_count: int, dropped_rows_by_reason: dict[str, int]) -> None:
+    """Raise a specific error when the detection p-value filter removed every remaining row."""
+    failed_detection_rows = dropped_rows_by_reason.get(DETECTION_PVAL_DROP_REASON, 0)
+    if failed_detection_rows and not retained_row_count:
+        raise ValidationError(
+            f"No valid rows remain after dropping {failed_detection_rows} row(s) with a detection p-value "
+            "above the threshold. Raise the threshold or review the upload."
+        )
 
-def _carried_metadata_value(group: pd.DataFrame, column: str) -> object:
-    """Return the single carried metadata value for a duplicate group, if any."""
-    if column not in group.columns:
-        return pd.NA
 
-    mask = _non_empty_value_mask(group[column])
-    if not bool(mask.any()):
-        return pd.NA
-    return group.loc[mask, column].iloc[0]
+def _retained_rows(df: pd.DataFrame, valid_rows: pd.Series) -> pd.DataFrame:
+    """Return the rows selected by ``valid_rows``, sharing ``df``'s data when every row is kept."""
+    return df if bool(valid_rows.all()) else df.loc[valid_rows]
+
+
+def _duplicate_groups(df: pd.DataFrame) -> _DuplicateGroups:
+    """Factorize the group column once and derive every policy-independent duplicate mask from it."""
+    codes, uniques = pd.factorize(df[cpg_group_column(df)], use_na_sentinel=False)
+    key_row_counts = np.bincount(codes, minlength=len(uniques))
+    duplicate_mask = key_row_counts[codes] > 1
+    first_rows = np.ones(len(codes), dtype=bool)
+    first_rows[1:] = codes[1:] > np.maximum.accumulate(codes)[:-1]
+    duplicate_keys = key_row_counts > 1
+    group_count = int(duplicate_keys.sum())
+    group_codes = (np.cumsum(duplicate_keys) - 1)[codes[duplicate_mask]]
+    return _DuplicateGroups(
+        duplicate_mask=duplicate_mask,
+        first_rows=first_rows,
+        group_codes=group_codes,
+        group_count=group_count,
+        extra_row_count=int(len(codes) - len(uniques)),
+        duplicate_rows=df.loc[duplicate_mask] if group_count else df.iloc[:0],
+    )
 
 
 def _empty_aggregation_audit_df() -> pd.DataFrame:
@@ -183,7 +368,8 @@ def _empty_aggregation_audit_df() -> pd.DataFrame:
             "beta_min",
             "beta_max",
             "beta_mean",
-            *_AGGREGATION_METADATA_COLUMNS,
+            "beta_aggregated",
+            *AGGREGATION_METADATA_COLUMNS,
             "source_file",
             "uploaded_at",
             "aggregation_rule",
@@ -191,96 +377,157 @@ def _empty_aggregation_audit_df() -> pd.DataFrame:
     )
 
 
+_DUPLICATE_REVIEW_COLUMNS: tuple[str, ...] = (
+    "duplicate_group_row_count",
+    "duplicate_group_extra_rows",
+    "duplicate_group_beta_min",
+    "duplicate_group_beta_max",
+    "duplicate_group_conflict_columns",
+    "duplicate_group_has_metadata_conflict",
+)
+
+
+@dataclass(frozen=True)
+class DuplicateReview:
+    """Duplicate-row review details that materialize only the rows requested.
+
+    Group-level statistics are computed once for every duplicate group; ``rows``, ``page``, and
+    ``iter_chunks`` copy just the requested slice of duplicate rows and broadcast their group's
+    statistics onto it. ``to_frame`` returns the full review table.
+    """
+
+    source_df: pd.DataFrame
+    row_positions: np.ndarray
+    group_codes: np.ndarray
+    group_stats: pd.DataFrame
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the review table columns: the source columns followed by the group statistics."""
+        return [*self.source_df.columns, *_DUPLICATE_REVIEW_COLUMNS]
+
+    @property
+    def row_count(self) -> int:
+        """Return the number of duplicate rows under review."""
+        return int(len(self.row_positions))
+
+    def page_count(self, page_rows: int = DEFAULT_REVIEW_PAGE_ROWS) -> int:
+        """Return how many pages of ``page_rows`` rows the review spans."""
+        return -(-self.row_count // page_rows)
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        """Return review rows ``start`` to ``stop`` (positions among the duplicate rows)."""
+        positions = self.row_positions[start:stop]
+        if not len(positions):
+            return pd.DataFrame(columns=self.columns)
+        group_stats = self.group_stats.take(self.group_codes[start:stop])
+        return pd.concat(
+            [self.source_df.take(positions).reset_index(drop=True), group_stats.reset_index(drop=True)],
+            axis=1,
+        )
+
+    def page(self, page_index: int, page_rows: int = DEFAULT_REVIEW_PAGE_ROWS) -> pd.DataFrame:
+        """Return one zero-based page of review rows."""
+        return self.rows(page_index * page_rows, (page_index + 1) * page_rows)
+
+    def iter_chunks(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Yield the review rows in order, ``chunk_rows`` at a time."""
+        for start in range(0, self.row_count, chunk_rows):
+            yield self.rows(start, start + chunk_rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return every review row."""
+        return self.rows(0, self.row_count)
+
+
+def duplicate_review(df: pd.DataFrame) -> DuplicateReview:
+    """Return lazily materialized duplicate-row review details for ``df``.
+
+    One grouped pass over the duplicate rows yields each group's size and beta range, and the
+    vectorized conflict detector supplies the conflict columns.
+    """
+    conflicts = duplicate_metadata_conflicts(df)
+    beta_summary = (
+        df["beta"].loc[conflicts.duplicate_mask].groupby(conflicts.group_codes, sort=True).agg(["size", "min", "max"])
+    )
+    group_sizes = beta_summary["size"].to_numpy(dtype=int)
+    group_stats = pd.DataFrame(
+        {
+            "duplicate_group_row_count": group_sizes,
+            "duplicate_group_extra_rows": group_sizes - 1,
+            "duplicate_group_beta_min": beta_summary["min"].to_numpy(),
+            "duplicate_group_beta_max": beta_summary["max"].to_numpy(),
+            "duplicate_group_conflict_columns": conflicts.conflict_columns,
+            "duplicate_group_has_metadata_conflict": conflicts.conflict_columns != "",
+        },
+        columns=list(_DUPLICATE_REVIEW_COLUMNS),
+    )
+    return DuplicateReview(
+        source_df=df,
+        row_positions=np.flatnonzero(conflicts.duplicate_mask.to_numpy(dtype=bool)),
+        group_codes=conflicts.group_codes,
+        group_stats=group_stats,
+    )
+
+
 def duplicate_review_table(df: pd.DataFrame) -> pd.DataFrame:
     """Return duplicate-row details for manual review without aggregating values."""
-    duplicate_mask = df["cpg_id"].duplicated(keep=False)
-    review_columns = list(df.columns) + [
-        "duplicate_group_row_count",
-        "duplicate_group_extra_rows",
-        "duplicate_group_has_metadata_conflict",
-        "duplicate_group_conflict_columns",
-        "duplicate_group_beta_min",
-        "duplicate_group_beta_max",
-    ]
-    if not bool(duplicate_mask.any()):
-        return pd.DataFrame(columns=review_columns)
-
-    review_df = df.loc[duplicate_mask].copy()
-    group_sizes = review_df.groupby("cpg_id", dropna=False)["cpg_id"].transform("size").astype(int)
-    review_df["duplicate_group_row_count"] = group_sizes
-    review_df["duplicate_group_extra_rows"] = group_sizes - 1
-    review_df["duplicate_group_beta_min"] = review_df.groupby("cpg_id", dropna=False)["beta"].transform("min")
-    review_df["duplicate_group_beta_max"] = review_df.groupby("cpg_id", dropna=False)["beta"].transform("max")
-
-    conflict_columns_by_cpg = {
-        cpg_id: "|".join(_duplicate_metadata_conflict_columns(group))
-        for cpg_id, group in review_df.groupby("cpg_id", dropna=False)
-    }
-    review_df["duplicate_group_conflict_columns"] = review_df["cpg_id"].map(conflict_columns_by_cpg).fillna("")
-    review_df["duplicate_group_has_metadata_conflict"] = review_df["duplicate_group_conflict_columns"] != ""
-
-    return review_df.reset_index(drop=True)
+    return duplicate_review(df).to_frame()
 
 
 def _aggregate_duplicate_groups(
     retained_df: pd.DataFrame,
     source_file: str,
     uploaded_at: str,
+    duplicate_policy: DuplicatePolicy = _AGGREGATION_DUPLICATE_POLICY,
+    groups: _DuplicateGroups | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame, int, int]:
-    """Aggregate duplicate groups by mean beta when metadata values do not conflict."""
-    working_df = retained_df.copy().reset_index(drop=True)
-    duplicate_mask = working_df["cpg_id"].duplicated(keep=False)
-    if not bool(duplicate_mask.any()):
-        return retained_df.reset_index(drop=True), _empty_aggregation_audit_df(), 0, 0
-
-    working_df["_aggregation_input_order"] = range(len(working_df))
-    duplicate_groups = working_df.loc[duplicate_mask].groupby("cpg_id", dropna=False, sort=False)
-
-    aggregated_rows: list[dict[str, object]] = []
-    audit_rows: list[dict[str, object]] = []
-    for _, group in duplicate_groups:
-        carried_metadata = {
-            column: _carried_metadata_value(group, column)
-            for column in _AGGREGATION_METADATA_COLUMNS
-        }
-        aggregated_rows.append(
-            {
-                "cpg_id": group["cpg_id"].iloc[0],
-                "beta": float(group["beta"].mean()),
-                "_aggregation_input_order": int(group["_aggregation_input_order"].min()),
-                **carried_metadata,
-            }
-        )
-        audit_rows.append(
-            {
-                "cpg_id": group["cpg_id"].iloc[0],
-                "source_row_count": int(len(group)),
-                "beta_min": float(group["beta"].min()),
-                "beta_max": float(group["beta"].max()),
-                "beta_mean": float(group["beta"].mean()),
-                **carried_metadata,
-                "source_file": source_file,
-                "uploaded_at": uploaded_at,
-                "aggregation_rule": _AGGREGATION_DUPLICATE_POLICY,
-            }
-        )
-
-    non_duplicate_df = working_df.loc[~duplicate_mask].copy()
-    aggregated_df = pd.DataFrame(aggregated_rows)
-    output_df = (
-        pd.concat([non_duplicate_df, aggregated_df], ignore_index=True, sort=False)
-        .sort_values("_aggregation_input_order")
-        .drop(columns="_aggregation_input_order")
+    """Aggregate duplicate groups with the policy's reducer when metadata values do not conflict.
+
+    One grouped reduction over the duplicate rows yields the beta summary statistics, the reduced
+    beta, and the carried metadata for every group; both the output frame and the audit frame are
+    built from it. Each group collapses onto its first row, so the output is the single materialized
+    copy of the retained rows and keeps input order; aggregated values are written into it in place.
+    ``groups`` reuses a duplicate structure already computed for ``retained_df``.
+    """
+    working_df = retained_df.reset_index(drop=True)
+    groups = groups if groups is not None else _duplicate_groups(working_df)
+    if not groups.group_count:
+        return working_df, _empty_aggregation_audit_df(), 0, 0
+
+    duplicate_rows = working_df.loc[groups.duplicate_mask]
+    group_codes = groups.group_codes
+    group_first_rows = working_df.index[groups.first_rows & groups.duplicate_mask]
+    beta_summary = duplicate_rows["beta"].groupby(group_codes, sort=True).agg(["size", "min", "max", "mean"])
+    reducer = AGGREGATION_REDUCERS[duplicate_policy]
+    beta_aggregated = reducer.reduce(duplicate_rows.loc[:, ["beta"]], group_codes, duplicate_rows)["beta"].to_numpy()
+    carried_values = carried_metadata(duplicate_rows, group_codes, reducer.weight_columns)
+
+    output_df = working_df.loc[groups.first_rows]
+    output_df.loc[group_first_rows, "beta"] = beta_aggregated
+    for column in duplicate_metadata_columns(output_df):
+        output_df.loc[group_first_rows, column] = carried_values[column]
+
+    audit_df = pd.DataFrame(
+        {
+            "cpg_id": duplicate_rows.loc[group_first_rows, "cpg_id"].to_numpy(),
+            "source_row_count": beta_summary["size"].to_numpy(dtype=int),
+            "beta_min": beta_summary["min"].to_numpy(),
+            "beta_max": beta_summary["max"].to_numpy(),
+            "beta_mean": beta_summary["mean"].to_numpy(),
+            "beta_aggregated": beta_aggregated,
+            **carried_values,
+            "source_file": source_file,
+            "uploaded_at": uploaded_at,
+            "aggregation_rule": duplicate_policy,
+        },
+        columns=_empty_aggregation_audit_df().columns,
     )
-    output_columns = [column for column in retained_df.columns if column in output_df.columns]
-    audit_df = pd.DataFrame(audit_rows, columns=_empty_aggregation_audit_df().columns)
-    aggregated_duplicate_input_rows = int(duplicate_mask.sum())
-    aggregated_duplicate_cpg_id_groups = int(len(aggregated_rows))
     return (
-        output_df.loc[:, output_columns].reset_index(drop=True),
-        audit_df.reset_index(drop=True),
-        aggregated_duplicate_cpg_id_groups,
-        aggregated_duplicate_input_rows,
+        output_df.reset_index(drop=True),
+        audit_df,
+        groups.group_count,
+        int(groups.duplicate_mask.sum()),
     )
 
 
@@ -289,27 +536,24 @@ def _apply_duplicate_policy_with_context(
     duplicate_policy: DuplicatePolicy,
     source_file: str,
     uploaded_at: str,
+    groups: _DuplicateGroups | None = None,
 ) -> _DuplicatePolicyResult:
-    """Apply duplicate policy with additional context needed for aggregation audits."""
-    duplicate_groups, duplicate_extra_rows = _duplicate_counts(retained_df)
-    duplicate_metadata_conflict_groups = _duplicate_metadata_conflict_groups(retained_df)
+    """Apply duplicate policy with additional context needed for aggregation audits.
 
-    if duplicate_policy == "reject_duplicates" and duplicate_groups > 0:
-        raise ValidationError(
-            f"Found {duplicate_groups} duplicated cpg_id value(s). "
-            "Selected duplicate policy requires unique cpg_id values."
-        )
+    ``groups`` reuses a duplicate structure already computed for ``retained_df``.
+    """
+    groups = groups if groups is not None else _duplicate_groups(retained_df)
+    duplicate_groups, duplicate_extra_rows = groups.group_count, groups.extra_row_count
+    duplicate_metadata_conflict_groups = groups.conflict_group_count(conflict_excluded_columns(duplicate_policy))
+    _ensure_duplicate_policy_applies(duplicate_policy, duplicate_groups, duplicate_metadata_conflict_groups)
 
-    if duplicate_policy == _AGGREGATION_DUPLICATE_POLICY:
-        if duplicate_metadata_conflict_groups > 0:
-            raise ValidationError(
-                f"Cannot aggregate {duplicate_metadata_conflict_groups} duplicated cpg_id group(s) because "
-                "optional metadata values conflict. Re-run with preserve_rows_and_warn to inspect them."
-            )
+    if duplicate_policy in AGGREGATION_REDUCERS:
         aggregated_df, audit_df, aggregated_groups, aggregated_input_rows = _aggregate_duplicate_groups(
             retained_df=retained_df,
             source_file=source_file,
             uploaded_at=uploaded_at,
+            duplicate_policy=duplicate_policy,
+            groups=groups,
         )
         return _DuplicatePolicyResult(
             output_df=aggregated_df,
@@ -333,127 +577,994 @@ def _apply_duplicate_policy_with_context(
     )
 
 
-def _build_processing_report(
-    validated_df: pd.DataFrame,
+def _ensure_duplicate_policy_applies(
+    duplicate_policy: DuplicatePolicy,
+    duplicate_groups: int,
+    duplicate_metadata_conflict_groups: int,
+) -> None:
+    """Raise when the policy rejects duplicates or cannot aggregate conflicting groups."""
+    if duplicate_policy == "reject_duplicates" and duplicate_groups > 0:
+        raise ValidationError(
+            f"Found {duplicate_groups} duplicated cpg_id value(s). "
+            "Selected duplicate policy requires unique cpg_id values."
+        )
+    if duplicate_policy in AGGREGATION_REDUCERS and duplicate_metadata_conflict_groups > 0:
+        raise ValidationError(
+            f"Cannot aggregate {duplicate_metadata_conflict_groups} duplicated cpg_id group(s) because "
+            "optional metadata values conflict. Re-run with preserve_rows_and_warn to inspect them."
+        )
+
+
+def _apply_duplicate_policy_out_of_core(
+    spill: HashPartitionSpill,
+    duplicate_policy: DuplicatePolicy,
     source_file: str,
     uploaded_at: str,
-    input_sha256: str,
-    parse_strategy: str,
-    delimiter_used: str | None,
-    recovered_from_extension_mismatch: bool,
-    parse_warnings: tuple[str, ...],
-    duplicate_policy: DuplicatePolicy,
-) -> tuple[pd.DataFrame, ProcessingReport, pd.DataFrame | None]:
-    """Drop incomplete analytical rows, apply duplicate policy, and build a report."""
-    dropped_rows_by_reason, valid_rows = _missing_row_counts(validated_df)
-    pre_policy_df = validated_df.loc[valid_rows].copy()
-    ensure_non_empty_dataframe(pre_policy_df)
+    column_types: StreamedColumnTypes,
+) -> _DuplicatePolicyResult:
+    """Apply duplicate policy one spill partition at a time.
+
+    Every duplicate group lives in a single hash partition, so per-partition counts add up to the
+    whole-upload totals and each partition is reduced on its own. Partition rows are indexed by their
+    retained-row position, which puts output and audit rows back in upload order; the result matches
+    ``_apply_duplicate_policy_with_context`` on the concatenated rows. Once the policy is bound to
+    fail, remaining partitions are only counted so the error reports whole-upload totals. Each
+    partition gets ``column_types`` before its duplicates are grouped.
+    """
+    excluded_columns = conflict_excluded_columns(duplicate_policy)
+    aggregate = duplicate_policy in AGGREGATION_REDUCERS
+    duplicate_groups = duplicate_extra_rows = duplicate_metadata_conflict_groups = 0
+    aggregated_groups = aggregated_input_rows = 0
+    output_parts: list[pd.DataFrame] = []
+    audit_parts: list[pd.DataFrame] = []
+    for spilled_df in spill.partitions():
+        partition_df = column_types.apply(spilled_df)
+        groups = _duplicate_groups(partition_df)
+        duplicate_groups += groups.group_count
+        duplicate_extra_rows += groups.extra_row_count
+        duplicate_metadata_conflict_groups += groups.conflict_group_count(excluded_columns)
+        if (duplicate_policy == "reject_duplicates" and duplicate_groups) or (
+            aggregate and duplicate_metadata_conflict_groups
+        ):
+            output_parts.clear()
+            audit_parts.clear()
+            continue
+        if not aggregate or not groups.group_count:
+            output_parts.append(partition_df)
+            continue
+
+        aggregated_df, audit_df, partition_aggregated_groups, partition_aggregated_rows = _aggregate_duplicate_groups(
+            retained_df=partition_df,
+            source_file=source_file,
+            uploaded_at=uploaded_at,
+            duplicate_policy=duplicate_policy,
+            groups=groups,
+        )
+        output_parts.append(aggregated_df.set_axis(partition_df.index[groups.first_rows]))
+        audit_parts.append(audit_df.set_axis(partition_df.index[groups.first_rows & groups.duplicate_mask]))
+        aggregated_groups += partition_aggregated_groups
+        aggregated_input_rows += partition_aggregated_rows
+    _ensure_duplicate_policy_applies(duplicate_policy, duplicate_groups, duplicate_metadata_conflict_groups)
+
+    output_df = pd.concat(output_parts).sort_index().reset_index(drop=True)
+    return _DuplicatePolicyResult(
+        output_df=output_df,
+        duplicate_groups=duplicate_groups,
+        duplicate_extra_rows=duplicate_extra_rows,
+        duplicate_metadata_conflict_groups=duplicate_metadata_conflict_groups,
+        aggregation_applied=aggregated_groups > 0,
+        aggregated_duplicate_cpg_id_groups=aggregated_groups,
+        aggregated_duplicate_input_rows=aggregated_input_rows,
+        aggregation_output_row_count=int(len(output_df)),
+        aggregation_audit_df=pd.concat(audit_parts).sort_index().reset_index(drop=True) if audit_parts else None,
+    )
+
 
-    duplicate_policy_result = _apply_duplicate_policy_with_context(
+def _prepared_upload(
+    pre_policy_df: pd.DataFrame,
+    input_row_count: int,
+    dropped_rows_by_reason: dict[str, int],
+    warned_rows_by_rule: dict[str, int],
+    violations: ValidationViolations | None,
+    provenance: UploadProvenance,
+    options: _IngestOptions,
+    timings: StageTimings | None = None,
+) -> PreparedUpload:
+    """Bundle retained rows, their accounting, and their duplicate groups (keyed by ``cpg_key`` if compact)."""
+    with timed_stage(timings, "duplicate_groups", int(len(pre_policy_df))) as stage:
+        if options.compact_keys:
+            pre_policy_df = with_cpg_key_column(pre_policy_df)
+        duplicate_groups = _duplicate_groups(pre_policy_df)
+        stage.rows_out = int(len(pre_policy_df))
+    return PreparedUpload(
         retained_df=pre_policy_df,
+        input_row_count=input_row_count,
+        dropped_rows_by_reason=dropped_rows_by_reason,
+        warned_rows_by_rule=warned_rows_by_rule,
+        provenance=provenance,
+        compact_keys=options.compact_keys,
+        dtype_policy=options.dtype_policy,
+        violations=violations,
+        timings=timings.to_dict() if timings is not None else None,
+        duplicate_groups=duplicate_groups,
+    )
+
+
+def _prepare_validated(
+    validated: ValidatedUpload,
+    provenance: UploadProvenance,
+    options: _IngestOptions,
+    timings: StageTimings | None = None,
+) -> PreparedUpload:
+    """Drop incomplete and filtered rows from a validated upload and prepare the rest."""
+    with timed_stage(timings, "row_filter", int(len(validated.dataframe))) as stage:
+        dropped_rows_by_reason, warned_rows_by_rule, valid_rows = _missing_row_counts(
+            validated, options.detection_pval_threshold
+        )
+        pre_policy_df = _retained_rows(validated.dataframe, valid_rows)
+        stage.rows_out = int(len(pre_policy_df))
+    _ensure_detection_filter_kept_rows(int(len(pre_policy_df)), dropped_rows_by_reason)
+    ensure_non_empty_dataframe(pre_policy_df)
+    return _prepared_upload(
+        pre_policy_df,
+        input_row_count=int(len(validated.dataframe)),
+        dropped_rows_by_reason=dropped_rows_by_reason,
+        warned_rows_by_rule=warned_rows_by_rule,
+        violations=validated.violations,
+        provenance=provenance,
+        options=options,
+        timings=timings,
+    )
+
+
+def _apply_prepared_duplicate_policy(
+    prepared: PreparedUpload,
+    duplicate_policy: DuplicatePolicy,
+    timings: StageTimings | None = None,
+) -> ProcessedUpload:
+    """Apply duplicate policy to prepared rows and build the processed upload and its report.
+
+    With ``compact_keys``, duplicate detection and aggregation group on the integer ``cpg_key``
+    column, which is kept in the output next to ``cpg_id`` alongside categorical ``chrom``/``gene``.
+    The report records the deep memory footprint of the output before and after ``dtype_policy``.
+    """
+    pre_policy_row_count = int(len(prepared.retained_df))
+    with timed_stage(timings, "duplicate_policy", pre_policy_row_count) as stage:
+        duplicate_policy_result = _apply_duplicate_policy_with_context(
+            retained_df=prepared.retained_df,
+            duplicate_policy=duplicate_policy,
+            source_file=prepared.provenance.source_file,
+            uploaded_at=prepared.provenance.uploaded_at,
+            groups=prepared.duplicate_groups,
+        )
+        stage.rows_out = int(len(duplicate_policy_result.output_df))
+    retained_df, report, aggregation_audit_df = _build_processing_report_from_policy_result(
+        duplicate_policy_result=duplicate_policy_result,
+        pre_policy_row_count=pre_policy_row_count,
+        input_row_count=prepared.input_row_count,
+        dropped_rows_by_reason=dict(prepared.dropped_rows_by_reason),
+        provenance=prepared.provenance,
         duplicate_policy=duplicate_policy,
-        source_file=source_file,
-        uploaded_at=uploaded_at,
+        compact_keys=prepared.compact_keys,
+        dtype_policy=prepared.dtype_policy,
+        warned_rows_by_rule=prepared.warned_rows_by_rule,
+        timings=timings,
     )
-    output_df = duplicate_policy_result.output_df.copy()
+    return ProcessedUpload(
+        normalized_df=retained_df,
+        report=report,
+        aggregation_audit_df=aggregation_audit_df,
+        violations=prepared.violations,
+    )
+
+
+def _build_processing_report_from_policy_result(
+    duplicate_policy_result: _DuplicatePolicyResult,
+    pre_policy_row_count: int,
+    input_row_count: int,
+    dropped_rows_by_reason: dict[str, int],
+    provenance: UploadProvenance,
+    duplicate_policy: DuplicatePolicy,
+    compact_keys: bool = False,
+    dtype_policy: DtypePolicy = DEFAULT_DTYPE_POLICY,
+    warned_rows_by_rule: dict[str, int] | None = None,
+    timings: StageTimings | None = None,
+) -> tuple[pd.DataFrame, ProcessingReport, pd.DataFrame | None]:
+    """Add provenance and storage policies to duplicate-policy output and build the report."""
+    with timed_stage(timings, "finalize", int(len(duplicate_policy_result.output_df))) as stage:
+        output_df = duplicate_policy_result.output_df.assign(
+            source_file=provenance.source_file,
+            uploaded_at=provenance.uploaded_at,
+        )
+        memory_bytes_before_compaction = frame_memory_bytes(output_df)
+        if compact_keys:
+            output_df = categorize_metadata_columns(output_df)
+        output_df = apply_dtype_policy(output_df, dtype_policy)
+        memory_bytes_after_compaction = frame_memory_bytes(output_df)
+        stage.rows_out = int(len(output_df))
 
     report = ProcessingReport(
         report_version=PROCESSING_REPORT_VERSION,
         run_id=str(uuid4()),
-        source_file=source_file,
-        uploaded_at=uploaded_at,
-        input_sha256=input_sha256,
-        parse_strategy=parse_strategy,
-        delimiter_used=delimiter_used,
-        recovered_from_extension_mismatch=recovered_from_extension_mismatch,
-        parse_warnings=parse_warnings,
-        input_row_count=int(len(validated_df)),
+        source_file=provenance.source_file,
+        uploaded_at=provenance.uploaded_at,
+        input_sha256=provenance.input_sha256,
+        parse_strategy=provenance.parse_strategy,
+        delimiter_used=provenance.delimiter_used,
+        recovered_from_extension_mismatch=provenance.recovered_from_extension_mismatch,
+        parse_warnings=provenance.parse_warnings,
+        input_row_count=input_row_count,
         retained_row_count=int(len(output_df)),
-        dropped_row_count=int((~valid_rows).sum()),
+        dropped_row_count=input_row_count - pre_policy_row_count,
         dropped_rows_by_reason=dropped_rows_by_reason,
         duplicate_cpg_id_groups=duplicate_policy_result.duplicate_groups,
         duplicate_cpg_id_extra_rows=duplicate_policy_result.duplicate_extra_rows,
         duplicate_metadata_conflict_groups=duplicate_policy_result.duplicate_metadata_conflict_groups,
         duplicate_policy=duplicate_policy,
         aggregation_applied=duplicate_policy_result.aggregation_applied,
-        pre_duplicate_policy_row_count=int(len(pre_policy_df)),
+        pre_duplicate_policy_row_count=pre_policy_row_count,
         aggregated_duplicate_cpg_id_groups=duplicate_policy_result.aggregated_duplicate_cpg_id_groups,
         aggregated_duplicate_input_rows=duplicate_policy_result.aggregated_duplicate_input_rows,
         aggregation_output_row_count=duplicate_policy_result.aggregation_output_row_count,
         aggregation_blocked_conflict_groups=duplicate_policy_result.aggregation_blocked_conflict_groups,
+        compression=provenance.compression,
+        memory_bytes_before_compaction=memory_bytes_before_compaction,
+        memory_bytes_after_compaction=memory_bytes_after_compaction,
+        warned_rows_by_rule=dict(warned_rows_by_rule or {}),
+        timings=timings.to_dict() if timings is not None else None,
     )
-
-    output_df["source_file"] = source_file
-    output_df["uploaded_at"] = uploaded_at
     return output_df.reset_index(drop=True), report, duplicate_policy_result.aggregation_audit_df
 
 
+def _stream_upload(
+    uploaded_file: BinaryIO,
+    name: str,
+    options: _IngestOptions,
+    max_upload_bytes: int,
+    max_decompressed_bytes: int,
+    chunk_rows: int,
+    timings: StageTimings | None = None,
+    spill: HashPartitionSpill | None = None,
+) -> tuple[_ChunkedIngestState, ValidationViolations | None, UploadProvenance]:
+    """Parse, canonicalize, validate, and row-filter an upload in fixed-size row chunks.
+
+    Only the retained canonical columns are accumulated; raw parsed chunks are released as soon as
+    they are validated. Validation fails fast on the first chunk that breaks a hard-fail rule unless
+    violations are collected, in which case per-chunk tables are merged with file-level row indexes.
+    Compressed uploads are decompressed incrementally into the chunk parser. With a ``spill``,
+    retained rows are hash-partitioned by ``cpg_id`` into its files instead of kept in memory.
+    """
+    compression = detect_compression(name)
+    hashing_reader = HashingReader(uploaded_file, max_upload_bytes=max_upload_bytes)
+    parse_stream = open_parse_stream(hashing_reader, compression, max_decompressed_bytes)
+    try:
+        with timed_stage(timings, "read_table"):
+            chunk_result = read_table_chunks(
+                parse_stream,  # type: ignore[arg-type]
+                filename=strip_compression_suffix(name),
+                chunk_rows=chunk_rows,
+                project_canonical_columns=True,
+            )
+    except pd.errors.EmptyDataError:
+        if parse_stream.bytes_read == 0:
+            raise empty_upload_error() from None
+        raise
+
+    state = _ChunkedIngestState(
+        detection_pval_threshold=options.detection_pval_threshold,
+        spill=spill,
+        key_codec=CpgKeyCodec() if spill is not None and options.compact_keys else None,
+    )
+    chunks = iter(chunk_result.chunks)
+    while True:
+        with timed_stage(timings, "read_table") as stage:
+            chunk = next(chunks, None)
+            stage.rows_out = 0 if chunk is None else int(len(chunk))
+        if chunk is None:
+            break
+        with timed_stage(timings, "normalize_upload", stage.rows_out) as stage:
+            normalized_chunk = normalize_upload(chunk)
+            stage.rows_out = int(len(normalized_chunk))
+        with timed_stage(timings, "validate_upload", stage.rows_out) as stage:
+            validated_chunk = validate_upload_with_kernel(
+                normalized_chunk,
+                options.validation_config,
+                require_valid_rows=False,
+                collect_violations=options.collect_violations,
+                max_violations=options.max_violations,
+                row_offset=state.input_row_count,
+            )
+            stage.rows_out = int(len(validated_chunk.dataframe))
+        with timed_stage(timings, "row_filter", stage.rows_out) as stage:
+            retained_before = state.retained_row_count
+            state.add_validated_chunk(validated_chunk)
+            stage.rows_out = state.retained_row_count - retained_before
+    while hashing_reader.read(READ_BLOCK_BYTES):
+        pass
+
+    violations = (
+        ValidationViolations.concat(state.violation_parts, options.max_violations)
+        if options.collect_violations
+        else None
+    )
+    if violations is not None and not state.retained_row_count:
+        raise ValidationError(
+            "No valid rows remain after excluding rows missing required cpg_id/beta values "
+            f"or breaking beta rules ({violations.total_count} rule violation(s)).",
+            violations=violations,
+        )
+    _ensure_detection_filter_kept_rows(state.retained_row_count, state.dropped_rows_by_reason)
+    if not state.retained_row_count:
+        raise ValidationError("No valid rows remain after excluding rows missing required cpg_id/beta values.")
+    return state, violations, upload_provenance(name, hashing_reader.hexdigest(), chunk_result, compression)
+
+
+def _prepare_upload_stream(
+    uploaded_file: BinaryIO,
+    name: str,
+    options: _IngestOptions,
+    max_upload_bytes: int,
+    max_decompressed_bytes: int,
+    chunk_rows: int,
+    timings: StageTimings | None = None,
+) -> PreparedUpload:
+    """Stream an upload in row chunks and prepare the concatenated retained rows."""
+    state, violations, provenance = _stream_upload(
+        uploaded_file, name, options, max_upload_bytes, max_decompressed_bytes, chunk_rows, timings
+    )
+    pre_policy_df = pd.concat([state.column_types.apply(chunk) for chunk in state.retained_chunks], ignore_index=True)
+    state.retained_chunks.clear()
+    return _prepared_upload(
+        pre_policy_df,
+        input_row_count=state.input_row_count,
+        dropped_rows_by_reason=state.dropped_rows_by_reason,
+        warned_rows_by_rule=state.warned_rows_by_rule,
+        violations=violations,
+        provenance=provenance,
+        options=options,
+        timings=timings,
+    )
+
+
+def _process_upload_stream(
+    uploaded_file: BinaryIO,
+    name: str,
+    options: _IngestOptions,
+    max_upload_bytes: int,
+    max_decompressed_bytes: int,
+    chunk_rows: int,
+) -> ProcessedUpload:
+    """Stream an upload in row chunks and apply the duplicate policy to its retained rows.
+
+    With ``options.spill_partitions``, retained rows are hash-partitioned by ``cpg_id`` into spill
+    files instead of kept in memory, and duplicates are resolved one partition at a time.
+    """
+    with ExitStack() as cleanup:
+        timings = cleanup.enter_context(stage_timings(options.collect_timings))
+        if options.spill_partitions is None:
+            prepared = _prepare_upload_stream(
+                uploaded_file, name, options, max_upload_bytes, max_decompressed_bytes, chunk_rows, timings
+            )
+            return _apply_prepared_duplicate_policy(prepared, options.duplicate_policy, timings)
+
+        spill = cleanup.enter_context(HashPartitionSpill(options.spill_partitions))
+        state, violations, provenance = _stream_upload(
+            uploaded_file, name, options, max_upload_bytes, max_decompressed_bytes, chunk_rows, timings, spill
+        )
+        with timed_stage(timings, "duplicate_policy", state.retained_row_count) as stage:
+            duplicate_policy_result = _apply_duplicate_policy_out_of_core(
+                spill,
+                duplicate_policy=options.duplicate_policy,
+                source_file=provenance.source_file,
+                uploaded_at=provenance.uploaded_at,
+                column_types=state.column_types,
+            )
+            stage.rows_out = int(len(duplicate_policy_result.output_df))
+        retained_df, report, aggregation_audit_df = _build_processing_report_from_policy_result(
+            duplicate_policy_result=duplicate_policy_result,
+            pre_policy_row_count=state.retained_row_count,
+            input_row_count=state.input_row_count,
+            dropped_rows_by_reason=state.dropped_rows_by_reason,
+            warned_rows_by_rule=state.warned_rows_by_rule,
+            provenance=provenance,
+            duplicate_policy=options.duplicate_policy,
+            compact_keys=options.compact_keys,
+            dtype_policy=options.dtype_policy,
+            timings=timings,
+        )
+    return ProcessedUpload(
+        normalized_df=retained_df,
+        report=report,
+        aggregation_audit_df=aggregation_audit_df,
+        violations=violations,
+    )
+
+
+def _validate_parsed_range(parsed_range: pd.DataFrame, config: ValidationConfig) -> pd.DataFrame:
+    """Normalize and validate one parsed byte range; whole-file row checks run after concatenation."""
+    return validate_upload(normalize_upload(parsed_range), config, require_valid_rows=False)
+
+
+def _validate_normalized(normalized: pd.DataFrame, options: _IngestOptions) -> ValidatedUpload:
+    """Validate a whole normalized upload with the configured violation handling."""
+    return validate_upload_with_kernel(
+        normalized,
+        options.validation_config,
+        collect_violations=options.collect_violations,
+        max_violations=options.max_violations,
+    )
+
+
+def _read_validated_table(
+    raw_bytes: bytes | mmap.mmap,
+    filename: str,
+    options: _IngestOptions,
+    timings: StageTimings | None = None,
+) -> tuple[TableReadResult, ValidatedUpload]:
+    """Parse, normalize, and validate in-memory upload bytes, optionally across parallel byte ranges.
+
+    Parallel ranges are validated as they are parsed. Any validation failure reruns the serial path,
+    so error messages stay identical to single-threaded ingestion. Collect-all validation and column
+    rules run once over the concatenated ranges, so violation row indexes and rule masks are file-level.
+    With parallel ranges, the ``read_table`` stage includes the per-range normalization (and validation).
+    """
+    if options.parse_workers > 1 and (options.collect_violations or options.validation_config.rules):
+        with timed_stage(timings, "read_table") as stage:
+            parse_result = read_table_bytes(
+                raw_bytes=raw_bytes,
+                filename=filename,
+                project_canonical_columns=True,
+                engine=options.csv_engine,
+                parse_ranges=options.parse_workers,
+                range_transform=normalize_upload,
+            )
+            stage.rows_out = int(len(parse_result.dataframe))
+        with timed_stage(timings, "validate_upload", stage.rows_out) as stage:
+            validated = _validate_normalized(parse_result.dataframe, options)
+            stage.rows_out = int(len(validated.dataframe))
+        return parse_result, validated
+    if options.parse_workers > 1:
+        try:
+            with timed_stage(timings, "read_table") as stage:
+                parse_result = read_table_bytes(
+                    raw_bytes=raw_bytes,
+                    filename=filename,
+                    project_canonical_columns=True,
+                    engine=options.csv_engine,
+                    parse_ranges=options.parse_workers,
+                    range_transform=partial(_validate_parsed_range, config=options.validation_config),
+                )
+                kernel = ValidationKernelResult.from_validated(parse_result.dataframe)
+                ensure_at_least_one_valid_required_row(parse_result.dataframe, kernel=kernel)
+                stage.rows_out = int(len(parse_result.dataframe))
+            return parse_result, ValidatedUpload(dataframe=parse_result.dataframe, kernel=kernel)
+        except ValidationError:
+            pass
+
+    with timed_stage(timings, "read_table") as stage:
+        parse_result = read_table_bytes(
+            raw_bytes=raw_bytes,
+            filename=filename,
+            project_canonical_columns=True,
+            engine=options.csv_engine,
+        )
+        stage.rows_out = int(len(parse_result.dataframe))
+    ensure_non_empty_dataframe(parse_result.dataframe)
+    with timed_stage(timings, "normalize_upload", stage.rows_out) as stage:
+        normalized = normalize_upload(parse_result.dataframe)
+        stage.rows_out = int(len(normalized))
+    with timed_stage(timings, "validate_upload", stage.rows_out) as stage:
+        validated = _validate_normalized(normalized, options)
+        stage.rows_out = int(len(validated.dataframe))
+    return parse_result, validated
+
+
+def _ingest_cache_key(input_sha256: str, name: str, options: _IngestOptions, stage: str = "processed") -> str:
+    """Return the cache key for one upload: content checksum, name, report version, options, and stage.
+
+    The name carries the parse hints (extension and compression) and is written into the report and
+    frames, so it is part of the key. ``parse_workers`` and ``spill_partitions`` do not change
+    results and are left out; ``stage`` separates prepared entries from processed ones.
+    """
+    key_fields = {
+        "input_sha256": input_sha256,
+        "source_file": name,
+        "report_version": PROCESSING_REPORT_VERSION,
+        "stage": stage,
+        "options": repr(replace(options, parse_workers=1, spill_partitions=None)),
+    }
+    return hashlib.sha256(json.dumps(key_fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _violations_cache_parts(
+    violations: ValidationViolations | None,
+    frames: dict[str, pd.DataFrame],
+    metadata: dict[str, Any],
+) -> None:
+    """Add a violation table, when present, to cache entry ``frames`` and ``metadata``."""
+    if violations is None:
+        return
+    frames["violations"] = violations.to_frame()
+    metadata["violations"] = {
+        "counts_by_rule": violations.counts_by_rule,
+        "max_violations": violations.max_violations,
+    }
+
+
+def _violations_from_cache_entry(entry: CacheEntry) -> ValidationViolations | None:
+    """Rebuild the violation table stored by ``_violations_cache_parts``, if any."""
+    if "violations" not in entry.metadata:
+        return None
+    listed = entry.frames["violations"]
+    return ValidationViolations(
+        row_index=listed["row_index"].to_numpy(dtype=np.int64),
+        rule_id=pd.Categorical(listed["rule_id"], categories=list(VIOLATION_RULE_IDS)),
+        value=listed["value"].astype("string").array,
+        counts_by_rule=entry.metadata["violations"]["counts_by_rule"],
+        max_violations=entry.metadata["violations"]["max_violations"],
+    )
+
+
+def _processed_upload_cache_entry(processed: ProcessedUpload) -> CacheEntry:
+    """Split a processed upload into cacheable frames and JSON metadata."""
+    frames = {"normalized": processed.normalized_df}
+    if processed.aggregation_audit_df is not None:
+        frames["aggregation_audit"] = processed.aggregation_audit_df
+    metadata: dict[str, Any] = {"report": processed.report.to_dict()}
+    _violations_cache_parts(processed.violations, frames, metadata)
+    return CacheEntry(frames=frames, metadata=metadata)
+
+
+def _with_uploaded_at(df: pd.DataFrame, uploaded_at: str) -> pd.DataFrame:
+    """Return ``df`` with every ``uploaded_at`` value replaced, keeping the column's dtype."""
+    if "uploaded_at" not in df.columns:
+        return df
+    dtype = df["uploaded_at"].dtype
+    column_dtype = "category" if isinstance(dtype, pd.CategoricalDtype) else dtype
+    return df.assign(uploaded_at=pd.Series(uploaded_at, index=df.index, dtype=column_dtype))
+
+
+def _processed_upload_from_cache_entry(entry: CacheEntry) -> ProcessedUpload:
+    """Rebuild a processed upload from a cache entry written by ``_processed_upload_cache_entry``.
+
+    The rebuilt upload is a new run: it gets a fresh ``run_id`` and ``uploaded_at``, and since no
+    stage ran, collected timings are empty rather than the stored run's.
+    """
+    uploaded_at = datetime.now(timezone.utc).isoformat()
+    report_fields = dict(entry.metadata["report"])
+    report_fields["parse_warnings"] = tuple(report_fields["parse_warnings"])
+    report_fields.update(run_id=str(uuid4()), uploaded_at=uploaded_at)
+    if "timings" in report_fields:
+        report_fields["timings"] = {}
+    aggregation_audit_df = entry.frames.get("aggregation_audit")
+    if aggregation_audit_df is not None:
+        aggregation_audit_df = _with_uploaded_at(aggregation_audit_df, uploaded_at)
+    return ProcessedUpload(
+        normalized_df=_with_uploaded_at(entry.frames["normalized"], uploaded_at),
+        report=ProcessingReport(**report_fields),
+        aggregation_audit_df=aggregation_audit_df,
+        violations=_violations_from_cache_entry(entry),
+    )
+
+
+def _prepared_upload_cache_entry(prepared: PreparedUpload) -> CacheEntry:
+    """Split a prepared upload into cacheable frames and JSON metadata."""
+    frames = {"retained": prepared.retained_df}
+    metadata: dict[str, Any] = {
+        "input_row_count": prepared.input_row_count,
+        "dropped_rows_by_reason": prepared.dropped_rows_by_reason,
+        "warned_rows_by_rule": prepared.warned_rows_by_rule,
+        "provenance": asdict(prepared.provenance),
+        "timings": prepared.timings,
+    }
+    _violations_cache_parts(prepared.violations, frames, metadata)
+    return CacheEntry(frames=frames, metadata=metadata)
+
+
+def _prepared_upload_from_cache_entry(entry: CacheEntry, options: _IngestOptions) -> PreparedUpload:
+    """Rebuild a prepared upload from a cache entry written by ``_prepared_upload_cache_entry``.
+
+    As with processed entries, ``uploaded_at`` is refreshed and collected timings are empty.
+    """
+    provenance_fields = dict(entry.metadata["provenance"])
+    provenance_fields["parse_warnings"] = tuple(provenance_fields["parse_warnings"])
+    provenance_fields["uploaded_at"] = datetime.now(timezone.utc).isoformat()
+    return PreparedUpload(
+        retained_df=entry.frames["retained"],
+        input_row_count=entry.metadata["input_row_count"],
+        dropped_rows_by_reason=entry.metadata["dropped_rows_by_reason"],
+        warned_rows_by_rule=entry.metadata["warned_rows_by_rule"],
+        provenance=UploadProvenance(**provenance_fields),
+        compact_keys=options.compact_keys,
+        dtype_policy=options.dtype_policy,
+        violations=_violations_from_cache_entry(entry),
+        timings={} if entry.metadata["timings"] is not None else None,
+        duplicate_groups=_duplicate_groups(entry.frames["retained"]),
+    )
+
+
+def _prepare_table_bytes(
+    raw_bytes: bytes | mmap.mmap,
+    name: str,
+    input_sha256: str,
+    compression: CompressionCodec | None,
+    options: _IngestOptions,
+    timings: StageTimings | None = None,
+) -> PreparedUpload:
+    """Parse, normalize, validate, and row-filter an upload that is fully available in memory."""
+    parse_result, validated = _read_validated_table(
+        raw_bytes,
+        filename=strip_compression_suffix(name),
+        options=options,
+        timings=timings,
+    )
+    return _prepare_validated(
+        validated,
+        provenance=upload_provenance(name, input_sha256, parse_result, compression),
+        options=options,
+        timings=timings,
+    )
+
+
+def _process_table_bytes(
+    raw_bytes: bytes | mmap.mmap,
+    name: str,
+    input_sha256: str,
+    compression: CompressionCodec | None,
+    options: _IngestOptions,
+    cache: IngestCache | None = None,
+) -> ProcessedUpload:
+    """Parse, normalize, validate, and report on an upload that is fully available in memory.
+
+    With a ``cache``, a stored result for the same content, name, and options is returned without
+    parsing, and fresh results are stored.
+    """
+    cache_key = _ingest_cache_key(input_sha256, name, options)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _processed_upload_from_cache_entry(cached)
+    with stage_timings(options.collect_timings) as timings:
+        prepared = _prepare_table_bytes(raw_bytes, name, input_sha256, compression, options, timings)
+        processed = _apply_prepared_duplicate_policy(prepared, options.duplicate_policy, timings)
+    if cache is not None:
+        entry = _processed_upload_cache_entry(processed)
+        cache.put(cache_key, entry.frames, entry.metadata)
+    return processed
+
+
+def _prepare_table_bytes_cached(
+    raw_bytes: bytes | mmap.mmap,
+    name: str,
+    input_sha256: str,
+    compression: CompressionCodec | None,
+    options: _IngestOptions,
+    cache: IngestCache | None = None,
+) -> PreparedUpload:
+    """Prepare in-memory upload bytes, reusing and storing the prepared stage in ``cache``."""
+    cache_key = _ingest_cache_key(input_sha256, name, options, stage="prepared")
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _prepared_upload_from_cache_entry(cached, options)
+    with stage_timings(options.collect_timings) as timings:
+        prepared = _prepare_table_bytes(raw_bytes, name, input_sha256, compression, options, timings)
+    if cache is not None:
+        entry = _prepared_upload_cache_entry(prepared)
+        cache.put(cache_key, entry.frames, entry.metadata)
+    return prepared
+
+
+def _ingest_options(
+    duplicate_policy: DuplicatePolicy,
+    csv_engine: CsvEngine | None,
+    parse_workers: int,
+    collect_violations: bool,
+    max_violations: int,
+    compact_keys: bool,
+    dtype_policy: DtypePolicy | None,
+    validation_config: ValidationConfig | None,
+    detection_pval_threshold: float | None,
+    spill_partitions: int | None = None,
+    collect_timings: bool = False,
+) -> _IngestOptions:
+    """Validate public ingest arguments and bundle them for the pipeline."""
+    if parse_workers <= 0:
+        raise ValueError("parse_workers must be a positive integer.")
+    if spill_partitions is not None and spill_partitions <= 0:
+        raise ValueError("spill_partitions must be a positive integer.")
+    if max_violations < 0:
+        raise ValueError("max_violations must be zero or a positive integer.")
+    if detection_pval_threshold is not None and not 0 <= detection_pval_threshold <= 1:
+        raise ValueError("detection_pval_threshold must be between 0 and 1.")
+    return _IngestOptions(
+        duplicate_policy=duplicate_policy,
+        csv_engine=resolve_csv_engine(csv_engine),
+        parse_workers=parse_workers,
+        collect_violations=collect_violations,
+        max_violations=max_violations,
+        compact_keys=compact_keys,
+        dtype_policy=dtype_policy or DEFAULT_DTYPE_POLICY,
+        validation_config=validation_config or ValidationConfig(),
+        detection_pval_threshold=detection_pval_threshold,
+        spill_partitions=spill_partitions,
+        collect_timings=collect_timings,
+    )
+
+
 def process_methylation_upload(
     uploaded_file: BinaryIO,
     source_name: str | None = None,
     duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
     max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    chunk_rows: int | None = None,
+    csv_engine: CsvEngine | None = None,
+    max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+    parse_workers: int = 1,
+    collect_violations: bool = False,
+    max_violations: int = DEFAULT_MAX_VIOLATIONS,
+    compact_keys: bool = False,
+    dtype_policy: DtypePolicy | None = None,
+    validation_config: ValidationConfig | None = None,
+    detection_pval_threshold: float | None = None,
+    spill_partitions: int | None = None,
+    cache: IngestCache | None = None,
+    collect_timings: bool = False,
 ) -> ProcessedUpload:
-    """Load, validate, normalize, and report on a methylation upload."""
+    """Load, validate, normalize, and report on a methylation upload.
+
+    Pass ``chunk_rows`` (for example ``DEFAULT_CHUNK_ROWS``) to stream the upload in fixed-size row
+    chunks instead of reading the whole payload into memory first. ``csv_engine`` selects the
+    in-memory parser backend; streaming always uses the pandas C engine. Uploads named ``.gz``,
+    ``.bz2``, ``.xz``, or ``.zst`` are decompressed as they are read: ``max_upload_bytes`` limits the
+    compressed bytes and ``max_decompressed_bytes`` limits the expanded table. ``parse_workers > 1``
+    parses and validates large in-memory uploads as parallel line-aligned byte ranges; results are
+    identical to ``parse_workers=1``.
+
+    With ``collect_violations``, non-numeric and out-of-range beta values no longer raise on the
+    first failing rule: offending rows are dropped under their rule id and listed (up to
+    ``max_violations``) on ``ProcessedUpload.violations``. When no valid rows remain, the raised
+    ``IngestError`` carries the same table.
+
+    ``compact_keys`` adds an integer ``cpg_key`` column (see ``core.keys``) used for duplicate
+    detection, aggregation, and panel lookups, and stores ``chrom``/``gene`` as categoricals.
+    ``dtype_policy`` (for example ``COMPACT_DTYPE_POLICY``) narrows numeric and provenance column
+    storage; the report records the frame's deep memory footprint before and after.
+    ``validation_config`` adds declarative column rules: failing rows are dropped (counted in
+    ``dropped_rows_by_reason`` under the rule id), counted in ``warned_rows_by_rule``, or reject
+    the upload, according to each rule's severity. ``detection_pval_threshold`` drops otherwise
+    retained rows whose numeric ``pval`` is above the threshold (reason
+    ``detection_pval_above_threshold``) before duplicate handling; missing ``pval`` values pass.
+
+    ``spill_partitions`` resolves duplicates out of core for uploads whose retained rows do not fit
+    comfortably in memory: it implies streaming (``DEFAULT_CHUNK_ROWS`` unless ``chunk_rows`` is
+    given), hash-partitions retained rows by ``cpg_id`` into that many temporary spill files, and
+    applies the duplicate policy one partition at a time. Counts, output, and audit match the
+    in-memory path.
+
+    ``cache`` (an ``IngestCache``, see ``core.cache``) returns the stored result of an earlier run
+    with the same upload bytes, name, ``PROCESSING_REPORT_VERSION``, and options under a fresh
+    ``run_id`` and ``uploaded_at`` (with empty ``timings``, as no stage ran), and stores new
+    results. Streaming ingest does not use it, since the checksum is only known once the whole
+    upload has been parsed.
+
+    ``collect_timings`` records per-stage wall time, CPU time, rows in/out, and peak traced
+    allocations in ``ProcessingReport.timings`` (see ``core.timing``). Allocation tracing slows
+    ingest while it is on; with the flag off the report carries no ``timings`` section.
+    """
     if uploaded_file is None:
         raise IngestError("No file was provided. Upload a CSV/TSV file to continue.")
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer.")
+    if spill_partitions is not None and chunk_rows is None:
+        chunk_rows = DEFAULT_CHUNK_ROWS
+    options = _ingest_options(
+        duplicate_policy,
+        csv_engine,
+        parse_workers,
+        collect_violations,
+        max_violations,
+        compact_keys,
+        dtype_policy,
+        validation_config,
+        detection_pval_threshold,
+        spill_partitions,
+        collect_timings,
+    )
 
-    try:
-        candidate_name = source_name if source_name is not None else getattr(uploaded_file, "name", "uploaded_file")
-        name = str(candidate_name or "uploaded_file")
-        raw_bytes = uploaded_file.read()
-        if not raw_bytes:
-            raise IngestError("The uploaded file is empty. Please choose a non-empty CSV/TSV file.")
-        if len(raw_bytes) > max_upload_bytes:
-            limit_mb = max_upload_bytes / (1024 * 1024)
-            raise IngestError(
-                f"The uploaded file exceeds the {limit_mb:.0f} MB limit. "
-                "Use a smaller file or raise the deployment upload limit intentionally."
-            )
-
-        parse_result = read_table_bytes(raw_bytes=raw_bytes, filename=name)
-        if "mixed_delimiters_inconsistent_structure" in parse_result.parse_warnings:
-            raise IngestError(
-                "Mixed delimiters produced inconsistent row structure. "
-                "Normalize the file to a single delimiter before upload."
+    with ingest_error_boundary():
+        name = upload_name(uploaded_file, source_name)
+        if chunk_rows is not None:
+            return _process_upload_stream(
+                uploaded_file=uploaded_file,
+                name=name,
+                options=options,
+                max_upload_bytes=max_upload_bytes,
+                max_decompressed_bytes=max_decompressed_bytes,
+                chunk_rows=chunk_rows,
             )
-        ensure_non_empty_dataframe(parse_result.dataframe)
 
-        normalized = normalize_upload(parse_result.dataframe)
-        validated = validate_upload(normalized)
-        uploaded_at = datetime.now(timezone.utc).isoformat()
-        retained_df, report, aggregation_audit_df = _build_processing_report(
-            validated_df=validated,
-            source_file=name,
-            uploaded_at=uploaded_at,
-            input_sha256=_input_sha256(raw_bytes),
-            parse_strategy=parse_result.parse_strategy,
-            delimiter_used=parse_result.delimiter_used,
-            recovered_from_extension_mismatch=parse_result.recovered_from_extension_mismatch,
-            parse_warnings=parse_result.parse_warnings,
-            duplicate_policy=duplicate_policy,
+        compression = detect_compression(name)
+        raw_bytes, input_sha256 = read_upload_bytes(
+            uploaded_file,
+            compression=compression,
+            max_upload_bytes=max_upload_bytes,
+            max_decompressed_bytes=max_decompressed_bytes,
         )
-        return ProcessedUpload(
-            normalized_df=retained_df,
-            report=report,
-            aggregation_audit_df=aggregation_audit_df,
+        return _process_table_bytes(
+            raw_bytes=raw_bytes,
+            name=name,
+            input_sha256=input_sha256,
+            compression=compression,
+            options=options,
+            cache=cache,
         )
-    except pd.errors.EmptyDataError as exc:
-        raise IngestError(
-            "The uploaded file appears empty. Please upload a CSV/TSV file with header and rows."
-        ) from exc
-    except pd.errors.ParserError as exc:
-        raise IngestError(
-            "Could not parse the uploaded file. Check for malformed quotes or inconsistent delimiter structure."
-        ) from exc
-    except ValidationError as exc:
-        if isinstance(exc, IngestError):
-            raise
-        raise IngestError(str(exc)) from exc
-    except Exception as exc:  # pragma: no cover
-        raise IngestError(
-            "Could not parse the uploaded file. Please upload a valid CSV/TSV with a header row."
-        ) from exc
+
+
+def prepare_methylation_upload(
+    uploaded_file: BinaryIO,
+    source_name: str | None = None,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    chunk_rows: int | None = None,
+    csv_engine: CsvEngine | None = None,
+    max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+    parse_workers: int = 1,
+    collect_violations: bool = False,
+    max_violations: int = DEFAULT_MAX_VIOLATIONS,
+    compact_keys: bool = False,
+    dtype_policy: DtypePolicy | None = None,
+    validation_config: ValidationConfig | None = None,
+    detection_pval_threshold: float | None = None,
+    cache: IngestCache | None = None,
+    collect_timings: bool = False,
+) -> PreparedUpload:
+    """Run the policy-independent part of ingest once, for ``apply_duplicate_policy`` to reuse.
+
+    Parsing, canonicalization, validation, row filtering, and ``cpg_key`` encoding happen here;
+    ``apply_duplicate_policy`` then only groups duplicates and builds the report, so switching the
+    duplicate policy does not re-read the upload. Arguments behave as in ``process_methylation_upload``.
+    ``cache`` stores the prepared stage under a key that leaves out the duplicate policy; streaming
+    (``chunk_rows``) does not use it.
+    """
+    if uploaded_file is None:
+        raise IngestError("No file was provided. Upload a CSV/TSV file to continue.")
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer.")
+    options = _ingest_options(
+        DEFAULT_DUPLICATE_POLICY,
+        csv_engine,
+        parse_workers,
+        collect_violations,
+        max_violations,
+        compact_keys,
+        dtype_policy,
+        validation_config,
+        detection_pval_threshold,
+        collect_timings=collect_timings,
+    )
+
+    with ingest_error_boundary():
+        name = upload_name(uploaded_file, source_name)
+        if chunk_rows is not None:
+            with stage_timings(options.collect_timings) as timings:
+                return _prepare_upload_stream(
+                    uploaded_file, name, options, max_upload_bytes, max_decompressed_bytes, chunk_rows, timings
+                )
+
+        compression = detect_compression(name)
+        raw_bytes, input_sha256 = read_upload_bytes(
+            uploaded_file,
+            compression=compression,
+            max_upload_bytes=max_upload_bytes,
+            max_decompressed_bytes=max_decompressed_bytes,
+        )
+        return _prepare_table_bytes_cached(raw_bytes, name, input_sha256, compression, options, cache)
+
+
+def apply_duplicate_policy(
+    prepared: PreparedUpload,
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
+) -> ProcessedUpload:
+    """Apply a duplicate policy to a prepared upload and build its processed upload and report.
+
+    The result matches ``process_methylation_upload`` with the same arguments and policy, apart from
+    a fresh ``run_id``. When the upload was prepared with ``collect_timings``, the report's timings
+    hold the preparation stages followed by this run's ``duplicate_policy`` and ``finalize`` stages.
+    """
+    with ingest_error_boundary(), stage_timings(prepared.timings is not None) as timings:
+        if timings is not None and prepared.timings is not None:
+            timings.stages.update({name: dict(metrics) for name, metrics in prepared.timings.items()})
+        return _apply_prepared_duplicate_policy(prepared, duplicate_policy, timings)
+
+
+def _hash_mapped_file(mapped: mmap.mmap) -> str:
+    """Hash a memory-mapped file block by block without copying it into Python bytes."""
+    digest = hashlib.sha256()
+    with memoryview(mapped) as view:
+        for offset in range(0, len(view), READ_BLOCK_BYTES):
+            digest.update(view[offset : offset + READ_BLOCK_BYTES])
+    return digest.hexdigest()
+
+
+def process_methylation_file(
+    path: str | os.PathLike[str],
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    chunk_rows: int | None = None,
+    csv_engine: CsvEngine | None = None,
+    max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+    parse_workers: int = 1,
+    collect_violations: bool = False,
+    max_violations: int = DEFAULT_MAX_VIOLATIONS,
+    compact_keys: bool = False,
+    dtype_policy: DtypePolicy | None = None,
+    validation_config: ValidationConfig | None = None,
+    detection_pval_threshold: float | None = None,
+    spill_partitions: int | None = None,
+    cache: IngestCache | None = None,
+    collect_timings: bool = False,
+) -> ProcessedUpload:
+    """Load, validate, normalize, and report on a methylation file already on local disk.
+
+    Plain-text files are memory-mapped, hashed incrementally, and parsed straight from the mapping,
+    so the payload is never copied into one Python ``bytes`` object. Compressed files and
+    ``chunk_rows`` requests stream from the open file through ``process_methylation_upload``.
+    ``parse_workers``, ``compact_keys``, ``dtype_policy``, ``validation_config``,
+    ``detection_pval_threshold``, ``spill_partitions`` (which also streams), ``cache``,
+    ``collect_timings``, and the violation options behave as in ``process_methylation_upload``.
+    The report ``source_file`` is the file name without its directory.
+    """
+    file_path = Path(path)
+    name = file_path.name
+    if chunk_rows is not None or spill_partitions is not None or detect_compression(name) is not None:
+        with file_path.open("rb") as handle:
+            return process_methylation_upload(
+                handle,
+                source_name=name,
+                duplicate_policy=duplicate_policy,
+                max_upload_bytes=max_upload_bytes,
+                chunk_rows=chunk_rows,
+                csv_engine=csv_engine,
+                max_decompressed_bytes=max_decompressed_bytes,
+                parse_workers=parse_workers,
+                collect_violations=collect_violations,
+                max_violations=max_violations,
+                compact_keys=compact_keys,
+                dtype_policy=dtype_policy,
+                validation_config=validation_config,
+                detection_pval_threshold=detection_pval_threshold,
+                spill_partitions=spill_partitions,
+                cache=cache,
+                collect_timings=collect_timings,
+            )
+
+    options = _ingest_options(
+        duplicate_policy,
+        csv_engine,
+        parse_workers,
+        collect_violations,
+        max_violations,
+        compact_keys,
+        dtype_policy,
+        validation_config,
+        detection_pval_threshold,
+        collect_timings=collect_timings,
+    )
+    with file_path.open("rb") as handle, ingest_error_boundary():
+        file_size = os.fstat(handle.fileno()).st_size
+        if file_size == 0:
+            raise empty_upload_error()
+        if file_size > max_upload_bytes:
+            raise upload_limit_error(max_upload_bytes)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _process_table_bytes(
+                raw_bytes=mapped,
+                name=name,
+                input_sha256=_hash_mapped_file(mapped),
+                compression=None,
+                options=options,
+                cache=cache,
+            )
 
 
 def load_methylation_file(uploaded_file: BinaryIO, source_name: str | None = None) -> pd.DataFrame:
@@ -2,13 +2,46 @@
 
 from __future__ import annotations
 
+import bz2
 import csv
-from dataclasses import dataclass
-from io import BytesIO
+import gzip
+import importlib
+import importlib.util
+import lzma
+import mmap
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BufferedIOBase, BufferedReader, BytesIO, RawIOBase
 from pathlib import Path
+from typing import BinaryIO, Literal, get_args
 
+import numpy as np
 import pandas as pd
 
+from .transform import canonical_source_columns
+
+CsvEngine = Literal["c", "pyarrow"]
+CompressionCodec = Literal["gzip", "bz2", "xz", "zstd"]
+COMPRESSION_SUFFIXES: dict[str, CompressionCodec] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+DEFAULT_CSV_ENGINE: CsvEngine = "c"
+CSV_ENGINE_ENV_VAR = "CPG_MVP_CSV_ENGINE"
+DEFAULT_STREAM_SAMPLE_BYTES = 64 * 1024
+_MIN_PARALLEL_RANGE_BYTES = 8 * 1024 * 1024
+_READ_BLOCK_BYTES = 1024 * 1024
+_QUOTE_BYTE = ord('"')
+_PROJECTED_COLUMN_DTYPES: dict[str, str] = {
+    "cpg_id": "string",
+    "beta": "float64",
+}
+STREAMED_OPTIONAL_COLUMNS: tuple[str, ...] = ("chrom", "pos", "gene", "pval")
+
 
 @dataclass(frozen=True)
 class TableReadResult:
@@ -19,6 +52,236 @@ class TableReadResult:
     parse_strategy: str
     recovered_from_extension_mismatch: bool
     parse_warnings: tuple[str, ...]
+    csv_engine: str = DEFAULT_CSV_ENGINE
+
+
+@dataclass(frozen=True)
+class TableChunkResult:
+    """Lazily parsed table chunks plus delimiter-detection metadata."""
+
+    chunks: Iterator[pd.DataFrame]
+    delimiter_used: str | None
+    parse_strategy: str
+    recovered_from_extension_mismatch: bool
+    parse_warnings: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _ParsePlan:
+    """Delimiter and recovery decision made from sampled lines before parsing."""
+
+    delimiter: str | None
+    delimiter_used: str | None
+    parse_strategy: str
+    recovered_from_extension_mismatch: bool
+    parse_warnings: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _ColumnProjection:
+    """Header-resolved canonical source columns to read, with explicit parse dtypes."""
+
+    usecols: tuple[int, ...]
+    columns: tuple[str, ...]
+    dtypes: dict[str, str]
+
+    def without_numeric_dtypes(self) -> _ColumnProjection:
+        """Return the projection keeping only string dtypes, which cannot fail conversion."""
+        return _ColumnProjection(
+            usecols=self.usecols,
+            columns=self.columns,
+            dtypes={column: dtype for column, dtype in self.dtypes.items() if dtype == "string"},
+        )
+
+
+def _numeric_text(value: object) -> object:
+    """Render a parsed number as the text it was most likely read from; text and missing values pass."""
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.integer, np.floating)):
+        return value
+    number = float(value)
+    if np.isnan(number):
+        return value
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+@dataclass
+class StreamedColumnTypes:
+    """File-wide dtypes for the optional canonical columns of a table parsed in row chunks.
+
+    A whole-file parse infers one dtype per column, while each chunk's dtype only reflects its own
+    rows, so the same column can come back ``int64`` in one chunk, ``float64`` in another (missing
+    values), and text in a third. ``observe`` every parsed chunk, then ``apply`` the file-wide dtype
+    to retained rows before they are combined: ``int64`` when every chunk held whole numbers,
+    ``float64`` when every chunk was numeric, the chunks' own dtype when they all agree, and text
+    otherwise. Numbers from numeric chunks of a
+    text column are rendered as their shortest text (``10``, ``10.5``), so they match a whole-file
+    parse unless the file wrote them another way (``10.0``, ``1e1``).
+    """
+
+    kinds: dict[str, str] = field(default_factory=dict)
+
+    def observe(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk's parsed dtypes into the file-wide kind of each optional column."""
+        for column in STREAMED_OPTIONAL_COLUMNS:
+            if column not in chunk.columns:
+                continue
+            dtype = chunk[column].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                kind = "bool"
+            elif pd.api.types.is_integer_dtype(dtype):
+                kind = "int64"
+            elif pd.api.types.is_float_dtype(dtype):
+                kind = "float64"
+            else:
+                kind = "text"
+            seen = {self.kinds.get(column, kind), kind}
+            if len(seen) > 1:
+                kind = "float64" if seen == {"int64", "float64"} else "text"
+            self.kinds[column] = kind
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return ``df`` with each observed optional column stored as its file-wide dtype."""
+        converted: dict[str, pd.Series] = {}
+        for column, kind in self.kinds.items():
+            if column not in df.columns or str(df[column].dtype) == ("str" if kind == "text" else kind):
+                continue
+            if kind == "text":
+                converted[column] = df[column].map(_numeric_text).astype("str")
+            else:
+                converted[column] = df[column].astype(np.dtype(kind))
+        return df.assign(**converted) if converted else df
+
+
+class DelimiterStructureError(pd.errors.ParserError):
+    """Raised before parsing when mixed delimiters break header-aligned row structure."""
+
+    def __init__(self, message: str, line_numbers: np.ndarray | None = None) -> None:
+        super().__init__(message)
+        self.line_numbers = np.empty(0, dtype=np.int64) if line_numbers is None else line_numbers
+
+
+@dataclass(frozen=True)
+class DelimiterStructureScan:
+    """Per-record field counts from a full-buffer delimiter scan, keyed to 1-based line numbers."""
+
+    delimiter: str
+    expected_field_count: int
+    record_count: int
+    inconsistent_line_numbers: np.ndarray
+
+    @property
+    def consistent(self) -> bool:
+        """Return whether every non-blank record matches the header field count."""
+        return len(self.inconsistent_line_numbers) == 0
+
+
+class DecompressionError(ValueError):
+    """Raised with a user-facing message when a compressed upload cannot be decompressed."""
+
+
+class _ProjectionDtypeMismatch(ValueError):
+    """Raised when projected values do not fit the explicit projection dtypes."""
+
+
+class _PrefixedReader(RawIOBase):
+    """Raw stream that replays already-sampled bytes before the remaining stream."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO) -> None:
+        self._prefix = memoryview(prefix)
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class _BufferRangeReader(RawIOBase):
+    """Raw stream over ``buffer[start:end]`` that copies one parser read block at a time."""
+
+    def __init__(self, buffer: bytes | mmap.mmap, start: int = 0, end: int | None = None) -> None:
+        self._buffer = buffer
+        self._position = start
+        self._end = len(buffer) if end is None else end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        end = min(self._position + len(buffer), self._end)
+        size = end - self._position
+        buffer[:size] = self._buffer[self._position : end]
+        self._position = end
+        return size
+
+
+class _DecompressingReader:
+    """Binary reader that turns codec-specific failures into ``DecompressionError``."""
+
+    def __init__(self, stream: BufferedIOBase, compression: CompressionCodec, codec_errors: tuple[type[Exception], ...]) -> None:
+        self._stream = stream
+        self._compression = compression
+        self._codec_errors = codec_errors
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._stream.read(size)
+        except self._codec_errors as exc:
+            raise DecompressionError(
+                f"Could not decompress the uploaded {self._compression} file. "
+                "Check that the archive is complete and valid."
+            ) from exc
+
+
+def detect_compression(filename: str) -> CompressionCodec | None:
+    """Infer the compression codec from the final filename suffix."""
+    return COMPRESSION_SUFFIXES.get(Path(filename).suffix.lower())
+
+
+def strip_compression_suffix(filename: str) -> str:
+    """Return the filename without a recognized compression suffix (``x.csv.gz`` -> ``x.csv``)."""
+    if detect_compression(filename) is None:
+        return filename
+    return filename[: -len(Path(filename).suffix)]
+
+
+def open_decompressed_stream(stream: BinaryIO, compression: CompressionCodec) -> BinaryIO:
+    """Wrap a compressed binary stream in an incremental decompressor."""
+    codec_errors: tuple[type[Exception], ...] = (OSError, EOFError, lzma.LZMAError)
+    decompressed: BufferedIOBase
+    if compression == "gzip":
+        decompressed = gzip.GzipFile(fileobj=stream, mode="rb")
+    elif compression == "bz2":
+        decompressed = bz2.BZ2File(stream, mode="rb")
+    elif compression == "xz":
+        decompressed = lzma.LZMAFile(stream, mode="rb")
+    else:
+        if importlib.util.find_spec("zstandard") is None:
+            raise DecompressionError(
+                "Zstandard (.zst) uploads require the optional zstandard package. "
+                "Upload a gzip/bz2/xz file instead or install zstandard."
+            )
+        zstandard = importlib.import_module("zstandard")
+        decompressed = zstandard.ZstdDecompressor().stream_reader(stream)
+        codec_errors = codec_errors + (zstandard.ZstdError,)
+    return _DecompressingReader(decompressed, compression=compression, codec_errors=codec_errors)  # type: ignore[return-value]
+
+
+def decompressed_limit_message(max_decompressed_bytes: int) -> str:
+    """Return the user-facing message for compressed uploads that expand beyond the configured limit."""
+    limit_mb = max_decompressed_bytes / (1024 * 1024)
+    return (
+        f"The decompressed upload exceeds the {limit_mb:.0f} MB limit. "
+        "Split the file or raise the deployment decompressed-size limit intentionally."
+    )
 
 
 def detect_delimiter(filename: str) -> str | None:
@@ -38,9 +301,27 @@ def _strip_utf8_bom(raw_bytes: bytes) -> tuple[bytes, tuple[str, ...]]:
     return raw_bytes, ()
 
 
-def _sample_non_empty_lines(raw_bytes: bytes, max_lines: int = 5) -> list[str]:
-    """Return the first non-empty decoded lines for delimiter diagnostics."""
-    sample_text = raw_bytes.decode("utf-8", errors="replace")
+def _utf8_bom_length(raw_bytes: bytes | mmap.mmap) -> tuple[int, tuple[str, ...]]:
+    """Return how many leading bytes a UTF-8 BOM occupies, plus related parse warnings."""
+    if raw_bytes[:3] == b"\xef\xbb\xbf":
+        return 3, ("removed_utf8_bom",)
+    return 0, ()
+
+
+def _sample_non_empty_lines(raw_bytes: bytes | mmap.mmap, max_lines: int = 5, start: int = 0) -> list[str]:
+    """Return the first non-empty decoded lines for delimiter diagnostics.
+
+    Only the leading ``max_lines`` newline-terminated lines are decoded, so sampling a large buffer
+    or memory-mapped file does not copy the whole payload.
+    """
+    end = start
+    for _ in range(max_lines):
+        newline = raw_bytes.find(b"\n", end)
+        if newline < 0:
+            end = len(raw_bytes)
+            break
+        end = newline + 1
+    sample_text = raw_bytes[start:end].decode("utf-8", errors="replace")
     return [line for line in sample_text.splitlines()[:max_lines] if line.strip()]
 
 
@@ -56,6 +337,13 @@ def _detect_mixed_delimiters(sample_lines: list[str]) -> tuple[str, ...]:
     return ()
 
 
+def _detect_mixed_delimiters_in_buffer(raw_bytes: bytes | mmap.mmap, start: int = 0) -> tuple[str, ...]:
+    """Return warnings when both comma and tab bytes occur anywhere in the table content."""
+    if raw_bytes.find(b",", start) >= 0 and raw_bytes.find(b"\t", start) >= 0:
+        return ("mixed_delimiters_detected",)
+    return ()
+
+
 def _header_delimiter(sample_lines: list[str]) -> str | None:
     """Infer the delimiter used by the header row when unambiguous."""
     if not sample_lines:
@@ -71,14 +359,49 @@ def _header_delimiter(sample_lines: list[str]) -> str | None:
     return None
 
 
-def _csv_field_count(line: str, delimiter: str) -> int | None:
-    """Return parsed field count for a single line, respecting CSV quoting."""
+def _csv_fields(line: str, delimiter: str) -> list[str] | None:
+    """Return parsed fields for a single line, respecting CSV quoting."""
     try:
-        return len(next(csv.reader([line], delimiter=delimiter)))
+        return next(csv.reader([line], delimiter=delimiter))
     except (StopIteration, csv.Error):
         return None
 
 
+def _csv_field_count(line: str, delimiter: str) -> int | None:
+    """Return parsed field count for a single line, respecting CSV quoting."""
+    fields = _csv_fields(line, delimiter=delimiter)
+    return None if fields is None else len(fields)
+
+
+def _plan_column_projection(sample_lines: list[str], delimiter: str | None) -> _ColumnProjection | None:
+    """Resolve canonical aliases from the header line alone and return the columns to read.
+
+    Projection is skipped when the delimiter is unknown, the header repeats a column name, or no
+    canonical alias is present, so those uploads keep full-width parsing and existing error messages.
+    """
+    if delimiter is None or not sample_lines:
+        return None
+
+    header_fields = _csv_fields(sample_lines[0], delimiter=delimiter)
+    if not header_fields or len(set(header_fields)) != len(header_fields):
+        return None
+
+    source_columns = canonical_source_columns(header_fields)
+    if not source_columns:
+        return None
+
+    usecols = tuple(sorted(header_fields.index(source) for source in source_columns.values()))
+    return _ColumnProjection(
+        usecols=usecols,
+        columns=tuple(header_fields[index] for index in usecols),
+        dtypes={
+            source: _PROJECTED_COLUMN_DTYPES[canonical]
+            for canonical, source in source_columns.items()
+            if canonical in _PROJECTED_COLUMN_DTYPES
+        },
+    )
+
+
 def _mixed_delimiter_structure_warnings(sample_lines: list[str]) -> tuple[str, ...]:
     """Return a warning when mixed delimiters break header-aligned row widths."""
     if "mixed_delimiters_detected" not in _detect_mixed_delimiters(sample_lines):
@@ -99,59 +422,503 @@ def _mixed_delimiter_structure_warnings(sample_lines: list[str]) -> tuple[str, .
     return ()
 
 
-def _prepare_raw_bytes(raw_bytes: bytes) -> tuple[bytes, tuple[str, ...]]:
-    """Normalize raw bytes before parsing and collect parse warnings."""
-    cleaned_bytes, bom_warnings = _strip_utf8_bom(raw_bytes)
-    sample_lines = _sample_non_empty_lines(cleaned_bytes)
-    mixed_delimiter_warnings = _detect_mixed_delimiters(sample_lines)
-    structural_warnings = _mixed_delimiter_structure_warnings(sample_lines)
-    return cleaned_bytes, bom_warnings + mixed_delimiter_warnings + structural_warnings
-
-
-def _parse_table(raw_bytes: bytes, delimiter: str | None) -> pd.DataFrame:
-    """Parse raw bytes with a specific delimiter or pandas sniffing."""
-    buffer = BytesIO(raw_bytes)
-    if delimiter is None:
-        return pd.read_csv(buffer, sep=None, engine="python")
-    return pd.read_csv(buffer, sep=delimiter)
-
-
-def _should_try_fallback(primary_df: pd.DataFrame, fallback_df: pd.DataFrame) -> bool:
-    """Return whether fallback parsing is clearly better than the primary parse."""
-    return len(primary_df.columns) <= 1 and len(fallback_df.columns) > len(primary_df.columns)
+def _sniff_header_delimiter(sample_lines: list[str]) -> str | None:
+    """Sniff the header delimiter the way pandas' python engine does for ``sep=None``."""
+    if not sample_lines:
+        return None
+    try:
+        return csv.Sniffer().sniff(sample_lines[0]).delimiter
+    except csv.Error:
+        return None
 
 
-def read_table_bytes(raw_bytes: bytes, filename: str) -> TableReadResult:
-    """Read CSV/TSV bytes into a dataframe with conservative delimiter recovery."""
-    prepared_bytes, parse_warnings = _prepare_raw_bytes(raw_bytes)
+def _plan_parse(sample_lines: list[str], filename: str, parse_warnings: tuple[str, ...]) -> _ParsePlan:
+    """Choose delimiter and recovery strategy from sampled lines only."""
     preferred_delimiter = detect_delimiter(filename)
+    sniffed_delimiter = _sniff_header_delimiter(sample_lines)
 
     if preferred_delimiter is None:
-        sniffed_df = _parse_table(raw_bytes=prepared_bytes, delimiter=None)
-        return TableReadResult(
-            dataframe=sniffed_df,
+        return _ParsePlan(
+            delimiter=sniffed_delimiter,
             delimiter_used=None,
             parse_strategy="sniffed_from_content",
             recovered_from_extension_mismatch=False,
             parse_warnings=parse_warnings + ("sniffed_delimiter_for_unknown_extension",),
         )
 
-    primary_df = _parse_table(raw_bytes=prepared_bytes, delimiter=preferred_delimiter)
-    fallback_df = _parse_table(raw_bytes=prepared_bytes, delimiter=None)
-
-    if _should_try_fallback(primary_df=primary_df, fallback_df=fallback_df):
-        return TableReadResult(
-            dataframe=fallback_df,
+    header_line = sample_lines[0] if sample_lines else ""
+    preferred_field_count = _csv_field_count(header_line, delimiter=preferred_delimiter) or 0
+    sniffed_field_count = 0
+    if sniffed_delimiter is not None:
+        sniffed_field_count = _csv_field_count(header_line, delimiter=sniffed_delimiter) or 0
+    if preferred_field_count <= 1 and sniffed_field_count > preferred_field_count:
+        return _ParsePlan(
+            delimiter=sniffed_delimiter,
             delimiter_used=None,
             parse_strategy="recovered_from_mislabeled_extension",
             recovered_from_extension_mismatch=True,
             parse_warnings=parse_warnings + ("recovered_from_mislabeled_extension",),
         )
 
-    return TableReadResult(
-        dataframe=primary_df,
+    return _ParsePlan(
+        delimiter=preferred_delimiter,
         delimiter_used=preferred_delimiter,
         parse_strategy="extension_delimiter",
         recovered_from_extension_mismatch=False,
         parse_warnings=parse_warnings,
     )
+
+
+def _prepare_raw_bytes(raw_bytes: bytes | mmap.mmap) -> tuple[int, list[str], tuple[str, ...]]:
+    """Find where table content starts and collect sampled lines plus parse warnings.
+
+    Returns the content offset (past any UTF-8 BOM) instead of a stripped copy, so the payload is
+    never duplicated before parsing. Raises ``DelimiterStructureError`` when mixed delimiters already
+    break row structure, so no parser backend is asked to partially parse a malformed file.
+    """
+    content_start, bom_warnings = _utf8_bom_length(raw_bytes)
+    sample_lines = _sample_non_empty_lines(raw_bytes, start=content_start)
+    mixed_delimiter_warnings = _detect_mixed_delimiters_in_buffer(raw_bytes, start=content_start)
+    header_delimiter = _header_delimiter(sample_lines)
+    if mixed_delimiter_warnings and header_delimiter is not None:
+        scan = scan_delimiter_structure(raw_bytes, header_delimiter, start=content_start)
+        if scan is None:
+            if _mixed_delimiter_structure_warnings(sample_lines):
+                raise DelimiterStructureError("mixed_delimiters_inconsistent_structure")
+        elif not scan.consistent:
+            raise DelimiterStructureError(
+                "mixed_delimiters_inconsistent_structure",
+                line_numbers=scan.inconsistent_line_numbers,
+            )
+    return content_start, sample_lines, bom_warnings + mixed_delimiter_warnings
+
+
+def _read_decompressed(stream: BinaryIO, max_bytes: int | None) -> bytes:
+    """Read a decompressed stream, raising ``DecompressionError`` once it expands past ``max_bytes``."""
+    if max_bytes is None:
+        return stream.read()
+    blocks: list[bytes] = []
+    total_bytes = 0
+    while block := stream.read(min(_READ_BLOCK_BYTES, max_bytes + 1 - total_bytes)):
+        total_bytes += len(block)
+        if total_bytes > max_bytes:
+            raise DecompressionError(decompressed_limit_message(max_bytes))
+        blocks.append(block)
+    return b"".join(blocks)
+
+
+def _open_table_stream(raw_bytes: bytes | mmap.mmap, start: int = 0) -> BinaryIO:
+    """Return a binary stream over table content without copying the underlying buffer."""
+    if isinstance(raw_bytes, mmap.mmap):
+        return BufferedReader(_BufferRangeReader(raw_bytes, start))
+    stream = BytesIO(raw_bytes)
+    stream.seek(start)
+    return stream
+
+
+def resolve_csv_engine(engine: str | None = None) -> CsvEngine:
+    """Return the requested CSV engine, defaulting to the ``CPG_MVP_CSV_ENGINE`` deployment setting."""
+    candidate = engine if engine is not None else os.getenv(CSV_ENGINE_ENV_VAR, DEFAULT_CSV_ENGINE)
+    candidate = candidate.strip().lower()
+    supported_engines: tuple[CsvEngine, ...] = get_args(CsvEngine)
+    for supported_engine in supported_engines:
+        if candidate == supported_engine:
+            return supported_engine
+    raise ValueError(f"Unsupported CSV engine {candidate!r}. Choose one of: {', '.join(supported_engines)}.")
+
+
+def _available_csv_engine(engine: CsvEngine) -> tuple[CsvEngine, tuple[str, ...]]:
+    """Return the engine that can run here plus a warning when an optional backend is missing."""
+    if engine == "pyarrow" and importlib.util.find_spec("pyarrow") is None:
+        return "c", ("pyarrow_engine_unavailable_used_c_engine",)
+    return engine, ()
+
+
+def _read_csv_pandas(stream: BinaryIO, delimiter: str, projection: _ColumnProjection | None) -> pd.DataFrame:
+    """Parse a delimited byte stream with the pandas C engine."""
+    if projection is None:
+        return pd.read_csv(stream, sep=delimiter)
+    try:
+        return pd.read_csv(
+            stream,
+            sep=delimiter,
+            usecols=list(projection.usecols),
+            dtype=projection.dtypes,
+        )
+    except pd.errors.ParserError:
+        raise
+    except (TypeError, ValueError) as exc:
+        raise _ProjectionDtypeMismatch(str(exc)) from exc
+
+
+def _mangle_duplicate_column_names(columns: list[str]) -> list[str]:
+    """Rename repeated header names the way pandas does (``beta``, ``beta.1``, ...)."""
+    seen: dict[str, int] = {}
+    mangled: list[str] = []
+    for column in columns:
+        count = seen.get(column, 0)
+        seen[column] = count + 1
+        mangled.append(column if count == 0 else f"{column}.{count}")
+    return mangled
+
+
+def _read_csv_arrow(stream: BinaryIO, delimiter: str, projection: _ColumnProjection | None) -> pd.DataFrame:
+    """Parse a delimited byte stream with the multithreaded Arrow CSV reader."""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+    if projection is not None:
+        arrow_types = {"string": pa.string(), "float64": pa.float64()}
+        convert_options = pa_csv.ConvertOptions(
+            strings_can_be_null=True,
+            include_columns=list(projection.columns),
+            column_types={column: arrow_types[dtype] for column, dtype in projection.dtypes.items()},
+        )
+
+    try:
+        table = pa_csv.read_csv(
+            stream,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+            convert_options=convert_options,
+        )
+    except pa.ArrowInvalid as exc:
+        message = str(exc)
+        if "Empty CSV file" in message:
+            raise pd.errors.EmptyDataError(message) from exc
+        if projection is not None and "conversion error" in message:
+            raise _ProjectionDtypeMismatch(message) from exc
+        raise pd.errors.ParserError(message) from exc
+
+    table = table.rename_columns(_mangle_duplicate_column_names(table.column_names))
+    dataframe = table.to_pandas()
+    if projection is not None:
+        dataframe = dataframe.astype(projection.dtypes)
+    return dataframe
+
+
+def _parse_table(
+    raw_bytes: bytes | mmap.mmap,
+    delimiter: str | None,
+    projection: _ColumnProjection | None = None,
+    engine: CsvEngine = DEFAULT_CSV_ENGINE,
+    start: int = 0,
+) -> pd.DataFrame:
+    """Parse raw bytes from ``start`` with a specific delimiter or pandas sniffing.
+
+    With a column projection, only the resolved canonical source columns are read using explicit
+    dtypes. Values that do not fit those dtypes fall back to the unprojected parse so validation can
+    report them exactly as before. Content sniffing always uses the pandas python engine.
+    """
+    if delimiter is None:
+        return pd.read_csv(_open_table_stream(raw_bytes, start), sep=None, engine="python")
+
+    read_csv = _read_csv_arrow if engine == "pyarrow" else _read_csv_pandas
+    if projection is not None:
+        try:
+            return read_csv(_open_table_stream(raw_bytes, start), delimiter, projection)
+        except _ProjectionDtypeMismatch:
+            pass
+    return read_csv(_open_table_stream(raw_bytes, start), delimiter, None)
+
+
+def _record_end(raw_bytes: bytes | mmap.mmap, position: int, quote_positions: np.ndarray) -> int:
+    """Return the offset just past the first newline at or after ``position`` that ends a record.
+
+    A newline ends a record only when an even number of quote bytes precedes it, so newlines
+    inside quoted fields never become range boundaries.
+    """
+    while True:
+        newline = raw_bytes.find(b"\n", position)
+        if newline < 0:
+            return len(raw_bytes)
+        if int(np.searchsorted(quote_positions, newline)) % 2 == 0:
+            return newline + 1
+        position = newline + 1
+
+
+def _quote_positions_if_well_formed(raw_bytes: bytes | mmap.mmap, start: int, delimiter: str) -> np.ndarray | None:
+    """Return sorted quote-byte offsets when quoting follows RFC 4180 field boundaries, else ``None``.
+
+    Counting quotes is only a reliable record-boundary test when every quote opens a field, closes a
+    field, or is half of an escaped ``""`` pair. Literal quotes inside unquoted fields make the parity
+    test unsafe, so those payloads are left to the serial parser.
+    """
+    if raw_bytes.find(b'"', start) < 0:
+        return np.empty(0, dtype=np.int64)
+
+    data = np.frombuffer(raw_bytes, dtype=np.uint8)
+    quote_positions = np.flatnonzero(data[start:] == _QUOTE_BYTE) + start
+    if len(quote_positions) % 2:
+        return None
+
+    boundary_bytes = np.array([ord(delimiter), ord("\n"), ord("\r"), _QUOTE_BYTE], dtype=np.uint8)
+    opening = quote_positions[0::2]
+    closing = quote_positions[1::2]
+    opening_previous = data[np.maximum(opening - 1, start)]
+    closing_next = data[np.minimum(closing + 1, len(data) - 1)]
+    opening_ok = (opening == start) | np.isin(opening_previous, boundary_bytes)
+    closing_ok = (closing == len(data) - 1) | np.isin(closing_next, boundary_bytes)
+    if not bool(opening_ok.all() and closing_ok.all()):
+        return None
+    return quote_positions
+
+
+def scan_delimiter_structure(
+    raw_bytes: bytes | mmap.mmap,
+    delimiter: str,
+    start: int = 0,
+) -> DelimiterStructureScan | None:
+    """Count unquoted delimiters per record across the whole buffer without decoding it.
+
+    Records end at newlines preceded by an even number of quote bytes, so quoted delimiters and
+    quoted newlines are handled. Blank records are ignored and the first non-blank record is the
+    header. Returns ``None`` when quoting does not follow RFC 4180 field boundaries and quote parity
+    cannot be trusted.
+    """
+    if len(raw_bytes) <= start:
+        return DelimiterStructureScan(delimiter, 0, 0, np.empty(0, dtype=np.int64))
+    quote_positions = _quote_positions_if_well_formed(raw_bytes, start, delimiter)
+    if quote_positions is None:
+        return None
+
+    data = np.frombuffer(raw_bytes, dtype=np.uint8)
+    newlines = np.flatnonzero(data[start:] == ord("\n")) + start
+    delimiters = np.flatnonzero(data[start:] == ord(delimiter)) + start
+    if len(quote_positions):
+        delimiters = delimiters[np.searchsorted(quote_positions, delimiters) % 2 == 0]
+        record_ends = newlines[np.searchsorted(quote_positions, newlines) % 2 == 0]
+    else:
+        record_ends = newlines
+    if not len(record_ends) or record_ends[-1] + 1 < len(data):
+        record_ends = np.append(record_ends, len(data))
+    record_starts = np.concatenate(([start], record_ends[:-1] + 1))
+
+    field_counts = np.bincount(np.searchsorted(record_ends, delimiters), minlength=len(record_ends)) + 1
+    record_lengths = record_ends - record_starts
+    last_bytes = data[np.maximum(record_ends - 1, 0)]
+    non_blank = (record_lengths > 1) | ((record_lengths == 1) & (last_bytes != ord("\r")))
+    del data
+    if not bool(non_blank.any()):
+        return DelimiterStructureScan(delimiter, 0, 0, np.empty(0, dtype=np.int64))
+
+    header_index = int(np.argmax(non_blank))
+    expected_field_count = int(field_counts[header_index])
+    inconsistent = np.flatnonzero(non_blank & (field_counts != expected_field_count))
+    if expected_field_count <= 1:
+        inconsistent = inconsistent[:0]
+    return DelimiterStructureScan(
+        delimiter=delimiter,
+        expected_field_count=expected_field_count,
+        record_count=int(non_blank.sum()),
+        inconsistent_line_numbers=np.searchsorted(newlines, record_starts[inconsistent]) + 1,
+    )
+
+
+def _plan_byte_ranges(
+    raw_bytes: bytes | mmap.mmap,
+    start: int,
+    delimiter: str,
+    range_count: int,
+) -> tuple[bytes, list[tuple[int, int]]] | None:
+    """Split table content into the header line plus line-aligned, quote-safe data byte ranges.
+
+    Returns ``None`` when the payload is too small to split or quoting makes boundaries unsafe.
+    """
+    range_count = min(range_count, (len(raw_bytes) - start) // _MIN_PARALLEL_RANGE_BYTES)
+    if range_count < 2:
+        return None
+    quote_positions = _quote_positions_if_well_formed(raw_bytes, start, delimiter)
+    if quote_positions is None:
+        return None
+
+    header_end = _record_end(raw_bytes, start, quote_positions)
+    range_size = (len(raw_bytes) - header_end) // range_count
+    boundaries = [header_end]
+    for index in range(1, range_count):
+        boundary = _record_end(raw_bytes, max(header_end + index * range_size, boundaries[-1]), quote_positions)
+        if boundary > boundaries[-1] and boundary < len(raw_bytes):
+            boundaries.append(boundary)
+    boundaries.append(len(raw_bytes))
+    if len(boundaries) < 3:
+        return None
+    return bytes(raw_bytes[start:header_end]), list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _parse_byte_range(
+    raw_bytes: bytes | mmap.mmap,
+    header: bytes,
+    byte_range: tuple[int, int],
+    delimiter: str,
+    projection: _ColumnProjection | None,
+    engine: CsvEngine,
+) -> pd.DataFrame:
+    """Parse one data byte range with the header line replayed in front of it."""
+    range_stream = _BufferRangeReader(raw_bytes, *byte_range)
+    stream = BufferedReader(_PrefixedReader(header, BufferedReader(range_stream)))
+    read_csv = _read_csv_arrow if engine == "pyarrow" else _read_csv_pandas
+    return read_csv(stream, delimiter, projection)
+
+
+def _parse_table_ranges(
+    raw_bytes: bytes | mmap.mmap,
+    header: bytes,
+    byte_ranges: list[tuple[int, int]],
+    delimiter: str,
+    projection: _ColumnProjection | None,
+    engine: CsvEngine,
+    range_transform: Callable[[pd.DataFrame], pd.DataFrame] | None,
+) -> pd.DataFrame | None:
+    """Parse byte ranges in parallel threads and concatenate them in original row order.
+
+    Returns ``None`` when any range fails to parse or ranges infer different column dtypes, so the
+    caller can reparse serially and keep results identical to the single-pass parse. Exceptions from
+    ``range_transform`` propagate unchanged.
+    """
+
+    def parse_range(byte_range: tuple[int, int]) -> tuple[pd.DataFrame, pd.Series] | None:
+        try:
+            frame = _parse_byte_range(raw_bytes, header, byte_range, delimiter, projection, engine)
+        except (ValueError, pd.errors.ParserError, pd.errors.EmptyDataError):
+            return None
+        if not isinstance(frame.index, pd.RangeIndex):
+            return None
+        raw_dtypes = frame.dtypes
+        return (frame if range_transform is None else range_transform(frame)), raw_dtypes
+
+    with ThreadPoolExecutor(max_workers=len(byte_ranges)) as executor:
+        parsed = list(executor.map(parse_range, byte_ranges))
+
+    if any(result is None for result in parsed):
+        return None
+    frames = [result[0] for result in parsed if result is not None]
+    non_empty_dtypes = [result[1] for result in parsed if result is not None and len(result[0])]
+    if any(not dtypes.equals(non_empty_dtypes[0]) for dtypes in non_empty_dtypes[1:]):
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_table_bytes(
+    raw_bytes: bytes | mmap.mmap,
+    filename: str,
+    project_canonical_columns: bool = False,
+    engine: CsvEngine | None = None,
+    parse_ranges: int = 1,
+    range_transform: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    max_decompressed_bytes: int | None = None,
+) -> TableReadResult:
+    """Read CSV/TSV bytes into a dataframe with conservative delimiter recovery.
+
+    The delimiter and any extension-mismatch recovery are decided from the sampled header before
+    parsing, so the full payload is parsed exactly once. The pandas python-engine sniffer is only
+    used when the sampled header gives no usable delimiter. With ``project_canonical_columns``, only
+    header columns that resolve to canonical aliases are read. ``engine`` selects the pandas C
+    parser or the Arrow CSV reader; when omitted, ``CPG_MVP_CSV_ENGINE`` decides. Compressed
+    filenames (``.gz``, ``.bz2``, ``.xz``, ``.zst``) are decompressed first and parsed by their
+    inner extension; ``max_decompressed_bytes`` caps the expanded size with a ``DecompressionError``
+    and is unbounded when omitted, so callers handling untrusted uploads should set it.
+    ``raw_bytes`` may be a read-only ``mmap`` of a local file, which is parsed without a full copy.
+
+    ``parse_ranges > 1`` splits large payloads into line-aligned, quote-safe byte ranges parsed in
+    parallel threads and concatenated in row order; the dataframe is identical to the serial parse.
+    ``range_transform`` must be row-wise: it runs on each range (or once on the serial parse) and
+    the transformed frames are concatenated.
+    """
+    compression = detect_compression(filename)
+    if compression is not None:
+        raw_bytes = _read_decompressed(
+            open_decompressed_stream(_open_table_stream(raw_bytes), compression), max_decompressed_bytes
+        )
+        filename = strip_compression_suffix(filename)
+
+    csv_engine, engine_warnings = _available_csv_engine(resolve_csv_engine(engine))
+    content_start, sample_lines, parse_warnings = _prepare_raw_bytes(raw_bytes)
+    plan = _plan_parse(sample_lines, filename=filename, parse_warnings=parse_warnings + engine_warnings)
+    projection = _plan_column_projection(sample_lines, plan.delimiter) if project_canonical_columns else None
+
+    dataframe = None
+    range_plan = None
+    if parse_ranges > 1 and plan.delimiter is not None:
+        range_plan = _plan_byte_ranges(raw_bytes, content_start, plan.delimiter, parse_ranges)
+    if range_plan is not None and plan.delimiter is not None:
+        header, byte_ranges = range_plan
+        dataframe = _parse_table_ranges(
+            raw_bytes, header, byte_ranges, plan.delimiter, projection, csv_engine, range_transform
+        )
+    if dataframe is None:
+        dataframe = _parse_table(
+            raw_bytes=raw_bytes,
+            delimiter=plan.delimiter,
+            projection=projection,
+            engine=csv_engine,
+            start=content_start,
+        )
+        if range_transform is not None:
+            dataframe = range_transform(dataframe)
+    return TableReadResult(
+        dataframe=dataframe,
+        delimiter_used=plan.delimiter_used,
+        parse_strategy=plan.parse_strategy,
+        recovered_from_extension_mismatch=plan.recovered_from_extension_mismatch,
+        parse_warnings=plan.parse_warnings,
+        csv_engine="python" if plan.delimiter is None else csv_engine,
+    )
+
+
+def _complete_line_sample(sample_bytes: bytes, at_end_of_stream: bool) -> bytes:
+    """Drop a trailing partial line from a sample that did not reach end of stream."""
+    if at_end_of_stream:
+        return sample_bytes
+    last_newline = sample_bytes.rfind(b"\n")
+    return sample_bytes if last_newline < 0 else sample_bytes[: last_newline + 1]
+
+
+def read_table_chunks(
+    stream: BinaryIO,
+    filename: str,
+    chunk_rows: int,
+    sample_bytes: int = DEFAULT_STREAM_SAMPLE_BYTES,
+    project_canonical_columns: bool = False,
+) -> TableChunkResult:
+    """Plan delimiter handling from a leading sample and parse the stream in row chunks.
+
+    Only the leading sample is held for diagnostics; the remaining stream is handed to pandas
+    incrementally so memory is bounded by ``chunk_rows`` rather than by file size. Column projection
+    reads only canonical source columns; numeric dtypes are left to validation because a consumed
+    stream cannot fall back to an untyped re-parse. Each chunk infers its own dtypes, so callers
+    reconcile optional columns across chunks with ``StreamedColumnTypes``.
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer.")
+
+    head_bytes = stream.read(sample_bytes)
+    _, sample_lines, parse_warnings = _prepare_raw_bytes(
+        _complete_line_sample(head_bytes, at_end_of_stream=len(head_bytes) < sample_bytes)
+    )
+    replay_bytes, _ = _strip_utf8_bom(head_bytes)
+    plan = _plan_parse(sample_lines, filename=filename, parse_warnings=parse_warnings)
+
+    projection = _plan_column_projection(sample_lines, plan.delimiter) if project_canonical_columns else None
+    if projection is not None:
+        projection = projection.without_numeric_dtypes()
+
+    buffered = BufferedReader(_PrefixedReader(replay_bytes, stream))
+    if plan.delimiter is None:
+        chunks = pd.read_csv(buffered, sep=None, engine="python", chunksize=chunk_rows)
+    else:
+        chunks = pd.read_csv(
+            buffered,
+            sep=plan.delimiter,
+            chunksize=chunk_rows,
+            usecols=None if projection is None else list(projection.usecols),
+            dtype=None if projection is None else projection.dtypes,
+        )
+
+    return TableChunkResult(
+        chunks=iter(chunks),
+        delimiter_used=plan.delimiter_used,
+        parse_strategy=plan.parse_strategy,
+        recovered_from_extension_mismatch=plan.recovered_from_extension_mismatch,
+        parse_warnings=plan.parse_warnings,
+    )
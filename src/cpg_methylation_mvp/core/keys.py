@@ -0,0 +1,186 @@
+"""Compact integer keys for CpG identifiers and categorical metadata columns."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+CPG_KEY_COLUMN = "cpg_key"
+CATEGORICAL_METADATA_COLUMNS: tuple[str, ...] = ("chrom", "gene")
+
+MISSING_CPG_KEY = np.uint64(2**64 - 1)
+UNKNOWN_CPG_KEY = np.uint64(2**64 - 2)
+
+_TAG_SHIFT = 56
+_PAYLOAD_MASK = np.uint64((1 << _TAG_SHIFT) - 1)
+_CG_TAG = np.uint64(1 << _TAG_SHIFT)
+_CH_TAG = np.uint64(2 << _TAG_SHIFT)
+_RS_TAG = np.uint64(3 << _TAG_SHIFT)
+_FALLBACK_TAG = np.uint64(4 << _TAG_SHIFT)
+
+_CG_PATTERN = r"cg\d{8}"
+_RS_PATTERN = r"rs[1-9]\d{0,15}"
+_CH_PATTERN = r"^ch\.([1-9]|1\d|2[0-2]|X|Y)\.([1-9]\d{0,8})([FR])$"
+_CH_CHROM_LABELS: tuple[str, ...] = ("", *(str(number) for number in range(1, 23)), "X", "Y")
+_CH_CHROM_CODES = {label: code for code, label in enumerate(_CH_CHROM_LABELS) if label}
+_CH_CHROM_SHIFT = 32
+
+
+def _as_string_series(values: pd.Series | Iterable[object]) -> pd.Series:
+    """Return identifier values as a positionally indexed pandas string series."""
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype="object")
+    return series.astype("string").reset_index(drop=True)
+
+
+def _matching_rows(values: pd.Series, pattern: str) -> np.ndarray:
+    """Return a boolean array of rows whose full value matches ``pattern``."""
+    return values.str.fullmatch(pattern).fillna(False).to_numpy(dtype=bool)
+
+
+def _digit_payload(values: pd.Series) -> np.ndarray:
+    """Parse the digits after a two-letter identifier prefix as unsigned integers."""
+    return values.str.slice(2).astype("uint64").to_numpy(dtype=np.uint64)
+
+
+def _ch_payload(values: pd.Series) -> np.ndarray:
+    """Pack ``ch.<chrom>.<pos><strand>`` probes into chromosome, position, and strand bits."""
+    parts = values.str.extract(_CH_PATTERN)
+    chrom = parts[0].map(_CH_CHROM_CODES).to_numpy(dtype=np.uint64)
+    position = parts[1].astype("uint64").to_numpy(dtype=np.uint64)
+    reverse_strand = (parts[2] == "R").to_numpy(dtype=np.uint64)
+    return (chrom << np.uint64(_CH_CHROM_SHIFT)) | (position << np.uint64(1)) | reverse_strand
+
+
+class CpgKeyCodec:
+    """Encode CpG identifiers as fixed-width ``uint64`` keys.
+
+    Canonical Illumina identifiers (``cg########``, ``ch.<chrom>.<pos><strand>``, ``rs<number>``)
+    are parsed straight into the key, so equal identifiers always produce equal keys. Anything else
+    is assigned the next slot of a fallback dictionary owned by the codec; keys from two codecs are
+    only comparable for canonical identifiers. Missing values encode to ``MISSING_CPG_KEY``.
+    """
+
+    def __init__(self, fallback_labels: Iterable[str] = ()) -> None:
+        labels = pd.Index(pd.unique(pd.Series(list(fallback_labels), dtype="object")), dtype="object")
+        self._fallback_index = labels
+        self._fallback_codes = np.arange(len(labels), dtype=np.uint64)
+        self._next_fallback_code = len(labels)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> CpgKeyCodec:
+        """Rebuild the fallback dictionary from a frame carrying both ``cpg_id`` and ``cpg_key``."""
+        keys = df[CPG_KEY_COLUMN].to_numpy(dtype=np.uint64)
+        fallback_rows = (keys & ~_PAYLOAD_MASK) == _FALLBACK_TAG
+        pairs = (
+            pd.DataFrame(
+                {
+                    "label": df["cpg_id"].astype("string").to_numpy(dtype=object)[fallback_rows],
+                    "code": keys[fallback_rows] & _PAYLOAD_MASK,
+                }
+            )
+            .drop_duplicates("label")
+        )
+        codec = cls()
+        codec._fallback_index = pd.Index(pairs["label"].to_numpy(dtype=object), dtype="object")
+        codec._fallback_codes = pairs["code"].to_numpy(dtype=np.uint64)
+        codec._next_fallback_code = int(codec._fallback_codes.max()) + 1 if len(pairs) else 0
+        return codec
+
+    @property
+    def fallback_labels(self) -> tuple[str, ...]:
+        """Return the non-canonical identifiers known to this codec."""
+        return tuple(self._fallback_index)
+
+    def encode(self, values: pd.Series | Iterable[object], *, extend: bool = True) -> np.ndarray:
+        """Return one ``uint64`` key per identifier.
+
+        With ``extend=False`` the fallback dictionary is used for lookup only, and unseen
+        non-canonical identifiers encode to ``UNKNOWN_CPG_KEY``.
+        """
+        identifiers = _as_string_series(values)
+        keys = np.full(len(identifiers), MISSING_CPG_KEY, dtype=np.uint64)
+        present = identifiers.notna().to_numpy(dtype=bool)
+
+        cg_rows = _matching_rows(identifiers, _CG_PATTERN)
+        keys[cg_rows] = _CG_TAG | _digit_payload(identifiers[cg_rows])
+        rs_rows = _matching_rows(identifiers, _RS_PATTERN)
+        keys[rs_rows] = _RS_TAG | _digit_payload(identifiers[rs_rows])
+        ch_rows = _matching_rows(identifiers, _CH_PATTERN)
+        keys[ch_rows] = _CH_TAG | _ch_payload(identifiers[ch_rows])
+
+        fallback_rows = present & ~(cg_rows | rs_rows | ch_rows)
+        if fallback_rows.any():
+            keys[fallback_rows] = self._fallback_keys(identifiers[fallback_rows].to_numpy(dtype=object), extend)
+        return keys
+
+    def decode(self, keys: np.ndarray | pd.Series) -> pd.Series:
+        """Return the identifiers for previously encoded keys as a pandas string series."""
+        key_array = np.asarray(keys, dtype=np.uint64)
+        tags = key_array & ~_PAYLOAD_MASK
+        payloads = key_array & _PAYLOAD_MASK
+        decoded = pd.Series(pd.NA, index=range(len(key_array)), dtype="string")
+
+        cg_rows = tags == _CG_TAG
+        decoded[cg_rows] = "cg" + pd.Series(payloads[cg_rows]).astype(str).str.zfill(8).to_numpy(dtype=object)
+        rs_rows = tags == _RS_TAG
+        decoded[rs_rows] = "rs" + pd.Series(payloads[rs_rows]).astype(str).to_numpy(dtype=object)
+        ch_rows = tags == _CH_TAG
+        if ch_rows.any():
+            ch_payloads = payloads[ch_rows]
+            chrom_codes = (ch_payloads >> np.uint64(_CH_CHROM_SHIFT)).astype(np.intp)
+            chrom = np.asarray(_CH_CHROM_LABELS, dtype=object)[chrom_codes]
+            position = ((ch_payloads & np.uint64((1 << _CH_CHROM_SHIFT) - 1)) >> np.uint64(1)).astype(str)
+            strand = np.where(ch_payloads & np.uint64(1), "R", "F")
+            decoded[ch_rows] = "ch." + chrom + "." + position.astype(object) + strand.astype(object)
+        fallback_rows = tags == _FALLBACK_TAG
+        if fallback_rows.any():
+            label_positions = pd.Index(self._fallback_codes).get_indexer(pd.Index(payloads[fallback_rows]))
+            labels = np.asarray(self._fallback_index, dtype=object)[label_positions]
+            labels[label_positions < 0] = pd.NA
+            decoded[fallback_rows] = labels
+        return decoded
+
+    def _fallback_keys(self, labels: np.ndarray, extend: bool) -> np.ndarray:
+        """Look up (and optionally register) fallback-dictionary keys for non-canonical labels."""
+        positions = self._fallback_index.get_indexer(pd.Index(labels, dtype="object"))
+        unseen = positions < 0
+        if extend and unseen.any():
+            new_labels = pd.unique(labels[unseen])
+            new_codes = np.arange(
+                self._next_fallback_code,
+                self._next_fallback_code + len(new_labels),
+                dtype=np.uint64,
+            )
+            self._fallback_index = self._fallback_index.append(pd.Index(new_labels, dtype="object"))
+            self._fallback_codes = np.concatenate([self._fallback_codes, new_codes])
+            self._next_fallback_code += len(new_labels)
+            positions = self._fallback_index.get_indexer(pd.Index(labels, dtype="object"))
+
+        keys = np.full(len(labels), UNKNOWN_CPG_KEY, dtype=np.uint64)
+        known = positions >= 0
+        keys[known] = _FALLBACK_TAG | self._fallback_codes[positions[known]]
+        return keys
+
+
+def encode_cpg_ids(values: pd.Series | Iterable[object], codec: CpgKeyCodec | None = None) -> np.ndarray:
+    """Encode identifiers with ``codec`` (or a fresh codec) and return the ``uint64`` keys."""
+    return (codec or CpgKeyCodec()).encode(values)
+
+
+def with_cpg_key_column(df: pd.DataFrame, codec: CpgKeyCodec | None = None) -> pd.DataFrame:
+    """Return ``df`` with an integer ``cpg_key`` column inserted right after ``cpg_id``."""
+    keyed = df.drop(columns=CPG_KEY_COLUMN, errors="ignore")
+    keyed.insert(keyed.columns.get_loc("cpg_id") + 1, CPG_KEY_COLUMN, encode_cpg_ids(keyed["cpg_id"], codec))
+    return keyed
+
+
+def categorize_metadata_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with low-cardinality ``chrom``/``gene`` text stored as categoricals."""
+    columns = {
+        column: df[column].astype("category")
+        for column in CATEGORICAL_METADATA_COLUMNS
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**columns) if columns else df
@@ -0,0 +1,345 @@
+"""Ingestion of wide probe-by-sample beta matrices from multi-sample array exports."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import BinaryIO
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from .duplicates import (
+    AGGREGATION_REDUCERS,
+    DuplicatePolicy,
+    carried_metadata,
+    conflict_excluded_columns,
+    duplicate_metadata_conflict_groups,
+)
+from .ingest import (
+    DEFAULT_DUPLICATE_POLICY,
+    DEFAULT_MAX_DECOMPRESSED_BYTES,
+    DEFAULT_MAX_UPLOAD_BYTES,
+    PROCESSING_REPORT_VERSION,
+    ProcessingReport,
+)
+from .io import CsvEngine, detect_compression, read_table_bytes, resolve_csv_engine, strip_compression_suffix
+from .transform import canonical_source_columns
+from .uploads import (
+    IngestError,
+    UploadProvenance,
+    ingest_error_boundary,
+    read_upload_bytes,
+    upload_name,
+    upload_provenance,
+)
+from .validate import (
+    ValidationError,
+    coerce_numeric,
+    ensure_non_empty_dataframe,
+    ensure_required_columns,
+)
+
+MATRIX_BETA_DTYPE = np.float32
+
+
+@dataclass(frozen=True)
+class ProcessedMatrixUpload:
+    """Probe-by-sample beta matrix plus one processing report per sample.
+
+    ``beta`` is a column-major ``float32`` array with one row per entry of ``cpg_ids`` and one column
+    per entry of ``sample_ids``; ``NaN`` marks a missing value for that sample. ``probe_metadata``
+    holds the optional ``chrom``/``pos``/``gene``/``pval`` columns aligned with the matrix rows.
+    """
+
+    beta: np.ndarray
+    cpg_ids: pd.Index
+    sample_ids: tuple[str, ...]
+    reports: dict[str, ProcessingReport]
+    probe_metadata: pd.DataFrame | None = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the matrix as a wide dataframe indexed by ``cpg_id`` without copying the values."""
+        return pd.DataFrame(self.beta, index=self.cpg_ids, columns=list(self.sample_ids), copy=False)
+
+    def sample_frame(self, sample_id: str) -> pd.DataFrame:
+        """Return one sample's retained values as a canonical long dataframe (``cpg_id``, ``beta``, ...)."""
+        beta = self.beta[:, self.sample_ids.index(sample_id)]
+        present = ~np.isnan(beta)
+        sample_df = pd.DataFrame({"cpg_id": self.cpg_ids.to_numpy()[present], "beta": beta[present]})
+        if self.probe_metadata is not None:
+            sample_df = pd.concat([sample_df, self.probe_metadata.loc[present].reset_index(drop=True)], axis=1)
+        return sample_df
+
+
+@dataclass(frozen=True)
+class _MatrixDuplicateResult:
+    """Private per-sample duplicate counts and the matrix after duplicate policy."""
+
+    beta: np.ndarray
+    row_positions: np.ndarray
+    duplicate_groups: np.ndarray
+    duplicate_extra_rows: np.ndarray
+    duplicate_input_rows: np.ndarray
+    duplicate_metadata_conflict_groups: int
+    aggregated: bool = False
+
+
+def _matrix_columns(columns: list[str]) -> tuple[dict[str, str], list[str]]:
+    """Return canonical probe columns resolved from the header and the remaining sample columns."""
+    probe_columns = {
+        canonical: source
+        for canonical, source in canonical_source_columns(columns).items()
+        if canonical != "beta"
+    }
+    probe_sources = set(probe_columns.values())
+    return probe_columns, [column for column in columns if column not in probe_sources]
+
+
+def _sample_matrix(samples: pd.DataFrame) -> np.ndarray:
+    """Coerce sample columns to one column-major ``float32`` matrix, rejecting non-numeric values.
+
+    Columns the parser already read as numbers convert in a single block; only text columns are
+    coerced individually.
+    """
+    coerced: dict[str, pd.Series] = {}
+    non_numeric: dict[str, int] = {}
+    for column in samples.columns:
+        if pd.api.types.is_numeric_dtype(samples[column]) and not isinstance(samples[column].dtype, pd.ArrowDtype):
+            continue
+        cleaned, numeric = coerce_numeric(samples[column])
+        invalid_count = int((numeric.isna() & cleaned.notna()).sum())
+        if invalid_count:
+            non_numeric[column] = invalid_count
+        coerced[column] = numeric
+    if non_numeric:
+        raise ValidationError(
+            f"Found {sum(non_numeric.values())} non-numeric beta value(s) in sample(s) "
+            f"{', '.join(non_numeric)}. Beta values must be numeric between 0 and 1."
+        )
+    numeric_samples = samples.assign(**coerced) if coerced else samples
+    return np.asfortranarray(numeric_samples.to_numpy(dtype=MATRIX_BETA_DTYPE, na_value=np.nan))
+
+
+def _ensure_matrix_in_range(beta: np.ndarray, sample_ids: tuple[str, ...]) -> None:
+    """Raise when any sample holds beta values outside [0, 1]."""
+    with np.errstate(invalid="ignore"):
+        out_of_range = ((beta < 0) | (beta > 1)).sum(axis=0)
+    if out_of_range.any():
+        failing = [sample_id for sample_id, count in zip(sample_ids, out_of_range) if count]
+        raise ValidationError(
+            f"Found {int(out_of_range.sum())} beta value(s) outside [0, 1] in sample(s) {', '.join(failing)}. "
+            "Fix out-of-range values and re-upload."
+        )
+
+
+def _group_sample_counts(present: np.ndarray, group_codes: np.ndarray) -> np.ndarray:
+    """Return a groups-by-samples array counting present values per duplicate group."""
+    return pd.DataFrame(present, copy=False).groupby(group_codes, sort=True).sum().to_numpy(dtype=np.int64)
+
+
+def _apply_matrix_duplicate_policy(
+    beta: np.ndarray,
+    cpg_ids: pd.Series,
+    probe_metadata: pd.DataFrame,
+    duplicate_policy: DuplicatePolicy,
+) -> _MatrixDuplicateResult:
+    """Count duplicate ``cpg_id`` groups for every sample at once and apply the duplicate policy.
+
+    A row only counts toward a sample's group when that sample has a value on it. Metadata is shared
+    by all samples, so conflicting metadata is judged once on the probe rows. Aggregation reduces
+    each sample's present values per group with the policy's reducer onto the group's first row.
+    """
+    sample_count = beta.shape[1]
+    duplicate_rows = cpg_ids.duplicated(keep=False).to_numpy(dtype=bool)
+    row_positions = np.arange(len(cpg_ids))
+    if not duplicate_rows.any():
+        no_duplicates = np.zeros(sample_count, dtype=np.int64)
+        return _MatrixDuplicateResult(beta, row_positions, no_duplicates, no_duplicates, no_duplicates, 0)
+
+    group_codes, _ = pd.factorize(cpg_ids[duplicate_rows])
+    duplicate_beta = beta[duplicate_rows]
+    group_counts = _group_sample_counts(~np.isnan(duplicate_beta), group_codes)
+    duplicated_groups = group_counts > 1
+    duplicate_groups = duplicated_groups.sum(axis=0)
+    duplicate_input_rows = np.where(duplicated_groups, group_counts, 0).sum(axis=0)
+    duplicate_extra_rows = duplicate_input_rows - duplicate_groups
+    conflict_groups = duplicate_metadata_conflict_groups(
+        probe_metadata.loc[duplicate_rows].assign(cpg_id=cpg_ids[duplicate_rows].to_numpy()),
+        conflict_excluded_columns(duplicate_policy),
+    )
+    counts = (duplicate_groups, duplicate_extra_rows, duplicate_input_rows)
+
+    if duplicate_policy == "reject_duplicates" and duplicate_groups.any():
+        raise ValidationError(
+            f"Found {int(duplicated_groups.any(axis=1).sum())} duplicated cpg_id value(s). "
+            "Selected duplicate policy requires unique cpg_id values."
+        )
+    if duplicate_policy not in AGGREGATION_REDUCERS:
+        return _MatrixDuplicateResult(beta, row_positions, *counts, conflict_groups)
+    if conflict_groups > 0:
+        raise ValidationError(
+            f"Cannot aggregate {conflict_groups} duplicated cpg_id group(s) because "
+            "optional metadata values conflict. Re-run with preserve_rows_and_warn to inspect them."
+        )
+
+    first_rows = ~cpg_ids.duplicated(keep="first").to_numpy(dtype=bool)
+    aggregated_beta = np.asfortranarray(beta[first_rows])
+    duplicate_probes = probe_metadata.loc[duplicate_rows]
+    reducer = AGGREGATION_REDUCERS[duplicate_policy]
+    group_values = reducer.reduce(pd.DataFrame(duplicate_beta, copy=False), group_codes, duplicate_probes)
+    output_rows = np.flatnonzero(duplicate_rows[first_rows])
+    aggregated_beta[output_rows] = group_values.to_numpy(dtype=MATRIX_BETA_DTYPE)
+    output_positions = row_positions[first_rows]
+    for column, values in carried_metadata(duplicate_probes, group_codes, reducer.weight_columns).items():
+        if column in probe_metadata.columns:
+            probe_metadata.loc[output_positions[output_rows], column] = values
+    return _MatrixDuplicateResult(aggregated_beta, output_positions, *counts, conflict_groups, aggregated=True)
+
+
+def _sample_report(
+    sample_index: int,
+    run_id: str,
+    provenance: UploadProvenance,
+    input_row_count: int,
+    dropped_rows_by_reason: dict[str, np.ndarray],
+    retained_row_counts: np.ndarray,
+    duplicates: _MatrixDuplicateResult,
+    duplicate_policy: DuplicatePolicy,
+) -> ProcessingReport:
+    """Build the processing report for one sample column from the matrix-wide count arrays."""
+    pre_policy_row_count = input_row_count - sum(int(counts[sample_index]) for counts in dropped_rows_by_reason.values())
+    aggregated_groups = int(duplicates.duplicate_groups[sample_index]) if duplicates.aggregated else 0
+    return ProcessingReport(
+        report_version=PROCESSING_REPORT_VERSION,
+        run_id=run_id,
+        source_file=provenance.source_file,
+        uploaded_at=provenance.uploaded_at,
+        input_sha256=provenance.input_sha256,
+        parse_strategy=provenance.parse_strategy,
+        delimiter_used=provenance.delimiter_used,
+        recovered_from_extension_mismatch=provenance.recovered_from_extension_mismatch,
+        parse_warnings=provenance.parse_warnings,
+        input_row_count=input_row_count,
+        retained_row_count=int(retained_row_counts[sample_index]),
+        dropped_row_count=input_row_count - pre_policy_row_count,
+        dropped_rows_by_reason={reason: int(counts[sample_index]) for reason, counts in dropped_rows_by_reason.items()},
+        duplicate_cpg_id_groups=int(duplicates.duplicate_groups[sample_index]),
+        duplicate_cpg_id_extra_rows=int(duplicates.duplicate_extra_rows[sample_index]),
+        duplicate_metadata_conflict_groups=duplicates.duplicate_metadata_conflict_groups,
+        duplicate_policy=duplicate_policy,
+        aggregation_applied=aggregated_groups > 0,
+        pre_duplicate_policy_row_count=pre_policy_row_count,
+        aggregated_duplicate_cpg_id_groups=aggregated_groups,
+        aggregated_duplicate_input_rows=int(duplicates.duplicate_input_rows[sample_index]) if aggregated_groups else 0,
+        aggregation_output_row_count=int(retained_row_counts[sample_index]),
+        compression=provenance.compression,
+    )
+
+
+def _process_matrix_table(
+    table: pd.DataFrame,
+    provenance: UploadProvenance,
+    duplicate_policy: DuplicatePolicy,
+) -> ProcessedMatrixUpload:
+    """Validate a parsed wide table, drop unusable probe rows, and apply the duplicate policy."""
+    ensure_non_empty_dataframe(table)
+    probe_columns, sample_columns = _matrix_columns([str(column) for column in table.columns])
+    probes = table.loc[:, list(probe_columns.values())].rename(
+        columns={source: canonical for canonical, source in probe_columns.items()}
+    )
+    ensure_required_columns(probes, ("cpg_id",))
+    if not sample_columns:
+        raise ValidationError(
+            "No sample columns found. A beta matrix needs a cpg_id column followed by one column per sample."
+        )
+
+    sample_ids = tuple(sample_columns)
+    beta = _sample_matrix(table.loc[:, sample_columns])
+    _ensure_matrix_in_range(beta, sample_ids)
+
+    cpg_ids = probes["cpg_id"].astype("string").str.strip()
+    missing_cpg_id = (cpg_ids.isna() | cpg_ids.eq("")).fillna(True).to_numpy(dtype=bool)
+    missing_beta = np.isnan(beta)
+    missing_cpg_id_and_beta = missing_beta[missing_cpg_id].sum(axis=0)
+    dropped_rows_by_reason = {
+        "missing_cpg_id": int(missing_cpg_id.sum()) - missing_cpg_id_and_beta,
+        "missing_beta": missing_beta.sum(axis=0) - missing_cpg_id_and_beta,
+        "missing_cpg_id_and_beta": missing_cpg_id_and_beta,
+    }
+
+    kept_rows = ~missing_cpg_id & ~missing_beta.all(axis=1)
+    if not kept_rows.any():
+        raise ValidationError("No valid rows remain after excluding rows missing required cpg_id/beta values.")
+    probe_metadata = probes.drop(columns="cpg_id").loc[kept_rows].reset_index(drop=True)
+    duplicates = _apply_matrix_duplicate_policy(
+        beta=np.asfortranarray(beta[kept_rows]),
+        cpg_ids=cpg_ids[kept_rows].reset_index(drop=True),
+        probe_metadata=probe_metadata,
+        duplicate_policy=duplicate_policy,
+    )
+    output_cpg_ids = cpg_ids[kept_rows].reset_index(drop=True).iloc[duplicates.row_positions]
+    retained_row_counts = (~np.isnan(duplicates.beta)).sum(axis=0)
+
+    run_id = str(uuid4())
+    input_row_count = int(len(table))
+    reports = {
+        sample_id: _sample_report(
+            sample_index,
+            run_id=run_id,
+            provenance=provenance,
+            input_row_count=input_row_count,
+            dropped_rows_by_reason=dropped_rows_by_reason,
+            retained_row_counts=retained_row_counts,
+            duplicates=duplicates,
+            duplicate_policy=duplicate_policy,
+        )
+        for sample_index, sample_id in enumerate(sample_ids)
+    }
+    return ProcessedMatrixUpload(
+        beta=duplicates.beta,
+        cpg_ids=pd.Index(output_cpg_ids.to_numpy(), name="cpg_id", dtype="string"),
+        sample_ids=sample_ids,
+        reports=reports,
+        probe_metadata=(
+            probe_metadata.iloc[duplicates.row_positions].reset_index(drop=True) if len(probe_metadata.columns) else None
+        ),
+    )
+
+
+def process_methylation_matrix_upload(
+    uploaded_file: BinaryIO,
+    source_name: str | None = None,
+    duplicate_policy: DuplicatePolicy = DEFAULT_DUPLICATE_POLICY,
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    csv_engine: CsvEngine | None = None,
+    max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+) -> ProcessedMatrixUpload:
+    """Load, validate, and report on a wide ``cpg_id, S1, S2, ...`` beta-matrix export.
+
+    The ``cpg_id`` column (or a known alias) and optional ``chrom``/``pos``/``gene``/``pval`` columns
+    describe the probes; every other column is one sample. Beta validation, missing-value counts, and
+    duplicate handling run on the whole matrix at once, and each sample gets its own
+    ``ProcessingReport`` sharing one ``run_id``. A value missing in one sample only drops that
+    sample's row; probe rows without a ``cpg_id`` or without any sample value are removed from the
+    matrix. Upload limits and compressed uploads behave as in ``process_methylation_upload``.
+    """
+    if uploaded_file is None:
+        raise IngestError("No file was provided. Upload a CSV/TSV file to continue.")
+    engine = resolve_csv_engine(csv_engine)
+
+    with ingest_error_boundary():
+        name = upload_name(uploaded_file, source_name)
+        compression = detect_compression(name)
+        raw_bytes, input_sha256 = read_upload_bytes(
+            uploaded_file,
+            compression=compression,
+            max_upload_bytes=max_upload_bytes,
+            max_decompressed_bytes=max_decompressed_bytes,
+        )
+        parse_result = read_table_bytes(raw_bytes, filename=strip_compression_suffix(name), engine=engine)
+        return _process_matrix_table(
+            parse_result.dataframe,
+            provenance=upload_provenance(name, input_sha256, parse_result, compression),
+            duplicate_policy=duplicate_policy,
+        )
@@ -6,6 +6,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from .keys import CPG_KEY_COLUMN, CpgKeyCodec
+
 PANEL_REQUIRED_COLUMNS: tuple[str, ...] = (
     "panel_id",
     "cpg_id",
@@ -43,6 +45,27 @@ def load_panel(panel_path: str | Path) -> pd.DataFrame:
     return panel_df
 
 
+def _match_panel_markers(panel_core: pd.DataFrame, normalized_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """Return observed panel markers with beta values and a per-marker found mask.
+
+    Frames ingested with ``compact_keys`` are joined on their integer ``cpg_key`` column; panel
+    identifiers are encoded with the fallback dictionary rebuilt from the frame.
+    """
+    if CPG_KEY_COLUMN not in normalized_df.columns:
+        observed = panel_core.merge(normalized_df.loc[:, ["cpg_id", "beta"]], on="cpg_id", how="inner")
+        return observed, panel_core["cpg_id"].isin(observed["cpg_id"])
+
+    panel_keys = CpgKeyCodec.from_frame(normalized_df).encode(panel_core["cpg_id"], extend=False)
+    keyed_panel = panel_core.assign(**{CPG_KEY_COLUMN: panel_keys})
+    observed = keyed_panel.merge(
+        normalized_df.loc[:, [CPG_KEY_COLUMN, "beta"]],
+        on=CPG_KEY_COLUMN,
+        how="inner",
+    ).drop(columns=CPG_KEY_COLUMN)
+    found = keyed_panel[CPG_KEY_COLUMN].isin(normalized_df[CPG_KEY_COLUMN])
+    return observed, found
+
+
 def evaluate_panel(normalized_df: pd.DataFrame, panel_df: pd.DataFrame) -> dict:
     """Evaluate normalized methylation data against a curated marker panel."""
     _validate_columns(normalized_df, ("cpg_id", "beta"), dataset_name="normalized dataframe")
@@ -54,13 +77,8 @@ def evaluate_panel(normalized_df: pd.DataFrame, panel_df: pd.DataFrame) -> dict:
         .reset_index(drop=True)
     )
 
-    observed = panel_core.merge(
-        normalized_df.loc[:, ["cpg_id", "beta"]],
-        on="cpg_id",
-        how="inner",
-    )
-
-    missing = panel_core[~panel_core["cpg_id"].isin(observed["cpg_id"])].copy()
+    observed, found = _match_panel_markers(panel_core, normalized_df)
+    missing = panel_core[~found].copy()
 
     marker_count = int(len(panel_core))
     markers_found = int(len(observed))
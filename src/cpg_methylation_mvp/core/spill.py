@@ -0,0 +1,92 @@
+"""Hash-partitioned spill files for grouping rows of tables larger than memory."""
+
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SPILL_PARTITIONS = 16
+
+
+class HashPartitionSpill:
+    """Append frames to hash-partitioned files on disk and read them back one partition at a time.
+
+    Rows are routed by a stable hash of ``key_column``, so all rows sharing a key land in the same
+    partition and any per-key computation can run on one partition at a time. Each partition file
+    holds the pickled pieces appended to it; reading a partition concatenates them in append order
+    and keeps their index. Files live in a temporary directory that ``close`` removes.
+    """
+
+    def __init__(
+        self,
+        partition_count: int = DEFAULT_SPILL_PARTITIONS,
+        key_column: str = "cpg_id",
+        directory: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if partition_count <= 0:
+            raise ValueError("partition_count must be a positive integer.")
+        self.key_column = key_column
+        self._directory = tempfile.TemporaryDirectory(prefix="cpg_spill_", dir=directory)
+        self._paths = [Path(self._directory.name) / f"partition-{index:04d}.pkl" for index in range(partition_count)]
+        self._row_counts = [0] * partition_count
+
+    @property
+    def partition_count(self) -> int:
+        """Return the number of partitions rows are spread across."""
+        return len(self._paths)
+
+    @property
+    def row_count(self) -> int:
+        """Return the number of rows spilled so far."""
+        return sum(self._row_counts)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Route each row of ``df`` to its key's partition file."""
+        if not len(df):
+            return
+        hashes = pd.util.hash_pandas_object(df[self.key_column], index=False).to_numpy(dtype=np.uint64)
+        partition_ids = (hashes % np.uint64(self.partition_count)).astype(np.intp)
+        row_order = np.argsort(partition_ids, kind="stable")
+        bounds = np.searchsorted(partition_ids[row_order], np.arange(self.partition_count + 1))
+        for partition, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if start == stop:
+                continue
+            with self._paths[partition].open("ab") as handle:
+                pickle.dump(df.take(row_order[start:stop]), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            self._row_counts[partition] += int(stop - start)
+
+    def partitions(self) -> Iterator[pd.DataFrame]:
+        """Yield each non-empty partition as one frame, rows in append order."""
+        for path, row_count in zip(self._paths, self._row_counts):
+            if not row_count:
+                continue
+            pieces: list[pd.DataFrame] = []
+            with path.open("rb") as handle:
+                while True:
+                    try:
+                        pieces.append(pickle.load(handle))
+                    except EOFError:
+                        break
+            yield pieces[0] if len(pieces) == 1 else pd.concat(pieces)
+
+    def close(self) -> None:
+        """Delete the spill files."""
+        self._directory.cleanup()
+
+    def __enter__(self) -> HashPartitionSpill:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,101 @@
+"""Opt-in per-stage wall time, CPU time, row count, and peak memory instrumentation."""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+STAGE_METRICS: tuple[str, ...] = ("wall_seconds", "cpu_seconds", "rows_in", "rows_out", "peak_allocated_bytes")
+
+_MEMORY_TRACING_LOCK = threading.Lock()
+
+
+@dataclass
+class StageRows:
+    """Row counts a caller fills in while a stage runs."""
+
+    rows_in: int = 0
+    rows_out: int = 0
+
+
+@dataclass
+class StageTimings:
+    """Per-stage metrics accumulated over one ingest run.
+
+    A stage entered several times (once per streamed chunk, say) sums its times and row counts and
+    keeps its largest peak. ``peak_allocated_bytes`` is the traced Python and NumPy allocation peak
+    above the stage's starting level; memory allocated by native libraries such as Arrow is not
+    traced. CPU time is process-wide, so it includes worker threads.
+
+    ``tracemalloc`` is process-wide, so only one run traces memory at a time. A run that starts
+    while another run is tracing, or while the caller has tracing on, leaves tracing alone and
+    omits ``peak_allocated_bytes`` (``trace_memory`` is false). The tracing run's peaks still count
+    allocations made by other threads during its stages.
+    """
+
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+    trace_memory: bool = True
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[StageRows]:
+        """Measure the enclosed block as one run of stage ``name``."""
+        rows = StageRows(rows_in=rows_in)
+        if self.trace_memory:
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield rows
+        finally:
+            wall_seconds = time.perf_counter() - start_wall
+            cpu_seconds = time.process_time() - start_cpu
+            metrics = self.stages.setdefault(name, dict.fromkeys(self.metric_names, 0))
+            metrics["wall_seconds"] += wall_seconds
+            metrics["cpu_seconds"] += cpu_seconds
+            metrics["rows_in"] += rows.rows_in
+            metrics["rows_out"] += rows.rows_out
+            if self.trace_memory:
+                peak_bytes = max(tracemalloc.get_traced_memory()[1] - start_bytes, 0)
+                metrics["peak_allocated_bytes"] = max(metrics["peak_allocated_bytes"], peak_bytes)
+
+    @property
+    def metric_names(self) -> tuple[str, ...]:
+        """Return the metrics recorded per stage; the memory peak only when this run traces memory."""
+        return STAGE_METRICS if self.trace_memory else STAGE_METRICS[:-1]
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """Return the metrics per stage, in the order stages first ran."""
+        return {name: dict(metrics) for name, metrics in self.stages.items()}
+
+
+@contextmanager
+def _traced_stage_timings() -> Iterator[StageTimings]:
+    """Yield fresh stage timings, tracing memory only if no other run or caller is tracing."""
+    owns_tracing = _MEMORY_TRACING_LOCK.acquire(blocking=False)
+    if owns_tracing and tracemalloc.is_tracing():
+        _MEMORY_TRACING_LOCK.release()
+        owns_tracing = False
+    if owns_tracing:
+        tracemalloc.start()
+    try:
+        yield StageTimings(trace_memory=owns_tracing)
+    finally:
+        if owns_tracing:
+            tracemalloc.stop()
+            _MEMORY_TRACING_LOCK.release()
+
+
+def stage_timings(enabled: bool) -> AbstractContextManager[StageTimings | None]:
+    """Return a context yielding ``StageTimings`` when ``enabled`` and ``None`` otherwise."""
+    return _traced_stage_timings() if enabled else nullcontext(None)
+
+
+def timed_stage(timings: StageTimings | None, name: str, rows_in: int = 0) -> AbstractContextManager[StageRows]:
+    """Measure a stage when ``timings`` is set; otherwise only hand out a throwaway row counter."""
+    if timings is None:
+        return nullcontext(StageRows(rows_in=rows_in))
+    return timings.stage(name, rows_in)
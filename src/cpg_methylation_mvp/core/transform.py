@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
 import pandas as pd
 
 CANONICAL_COLUMNS: tuple[str, ...] = (
@@ -22,16 +27,38 @@ ALIASES: dict[str, tuple[str, ...]] = {
     "pval": ("pval", "p_value", "p.value"),
 }
 
+FloatDtype = Literal["float64", "float32"]
+PositionDtype = Literal["int64", "uint32"]
+ProvenanceDtype = Literal["string", "categorical"]
+PROVENANCE_COLUMNS: tuple[str, ...] = ("source_file", "uploaded_at")
+
+
+@dataclass(frozen=True)
+class DtypePolicy:
+    """Storage dtypes for retained methylation frames.
+
+    The default converts nothing: every column keeps the dtype it was parsed with. ``float32``
+    rounds numeric ``beta``/``pval`` values to single precision, so it is lossy beyond about seven
+    significant digits. ``uint32`` positions apply only when every position is a whole number that
+    fits. Columns with non-numeric values are left unchanged.
+    """
+
+    float_dtype: FloatDtype = "float64"
+    pos_dtype: PositionDtype = "int64"
+    provenance_dtype: ProvenanceDtype = "string"
+
+
+DEFAULT_DTYPE_POLICY = DtypePolicy()
+COMPACT_DTYPE_POLICY = DtypePolicy(float_dtype="float32", pos_dtype="uint32", provenance_dtype="categorical")
+
 
-def _find_preferred_source_column(df: pd.DataFrame, aliases: tuple[str, ...]) -> str | None:
+def _find_preferred_source_column(columns: Sequence[str], aliases: tuple[str, ...]) -> str | None:
     """Return the preferred input column for an alias group.
 
     Preference order:
     1) First exact alias match in declared alias order.
     2) First case-insensitive alias match in declared alias order.
     """
-    columns = list(df.columns)
-
     for alias in aliases:
         if alias in columns:
             return alias
@@ -48,23 +75,79 @@ def _find_preferred_source_column(df: pd.DataFrame, aliases: tuple[str, ...]) ->
     return None
 
 
-def canonicalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Map known aliases to canonical schema columns."""
-    rename_map: dict[str, str] = {}
-
+def canonical_source_columns(columns: Sequence[str]) -> dict[str, str]:
+    """Return the preferred source column for each canonical column resolvable from header names."""
+    source_columns: dict[str, str] = {}
     for canonical, aliases in ALIASES.items():
-        source_column = _find_preferred_source_column(df, aliases)
+        source_column = _find_preferred_source_column(columns, aliases)
         if source_column is not None:
-            rename_map[source_column] = canonical
+            source_columns[canonical] = source_column
+    return source_columns
 
+
+def canonicalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Map known aliases to canonical schema columns."""
+    source_columns = canonical_source_columns(list(df.columns))
+    rename_map = {source_column: canonical for canonical, source_column in source_columns.items()}
     return df.rename(columns=rename_map)
 
 
 def select_canonical_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Keep canonical columns that are present, in canonical order."""
     keep_columns = [column for column in CANONICAL_COLUMNS if column in df.columns]
-    return df[keep_columns].copy()
-
+    return df[keep_columns]
+
+
+def _lossless_numeric(series: pd.Series) -> pd.Series | None:
+    """Return ``series`` as numbers, or None when any non-missing value is not numeric."""
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    numeric = pd.to_numeric(series, errors="coerce")
+    return numeric if int(numeric.notna().sum()) == int(series.notna().sum()) else None
+
+
+def _compact_float(series: pd.Series, float_dtype: FloatDtype) -> pd.Series:
+    """Store a float column as ``float_dtype`` when its values are numeric."""
+    numeric = _lossless_numeric(series)
+    return series if numeric is None or numeric.dtype == float_dtype else numeric.astype(float_dtype)
+
+
+def _compact_position(series: pd.Series, pos_dtype: PositionDtype) -> pd.Series:
+    """Store genomic positions as unsigned 32-bit integers when every value fits exactly."""
+    numeric = _lossless_numeric(series)
+    if numeric is None:
+        return series
+    values = numeric.dropna().to_numpy(dtype=np.float64)
+    if len(values) and not (
+        np.array_equal(values, np.floor(values)) and values.min() >= 0 and values.max() <= np.iinfo(np.uint32).max
+    ):
+        return series
+    return numeric.astype("UInt32" if numeric.isna().any() else "uint32")
+
+
+def apply_dtype_policy(df: pd.DataFrame, policy: DtypePolicy = DEFAULT_DTYPE_POLICY) -> pd.DataFrame:
+    """Return ``df`` with canonical and provenance columns stored as ``policy`` describes."""
+    converters: dict[str, Callable[[pd.Series], pd.Series]] = {}
+    if policy.float_dtype != "float64":
+        converters.update(dict.fromkeys(("beta", "pval"), lambda series: _compact_float(series, policy.float_dtype)))
+    if policy.pos_dtype != "int64":
+        converters["pos"] = lambda series: _compact_position(series, policy.pos_dtype)
+    if policy.provenance_dtype == "categorical":
+        converters.update(dict.fromkeys(PROVENANCE_COLUMNS, lambda series: series.astype("category")))
+
+    changed: dict[str, pd.Series] = {}
+    for column, convert in converters.items():
+        if column in df.columns:
+            original = df[column]
+            converted = convert(original)
+            if converted is not original:
+                changed[column] = converted
+    return df.assign(**changed) if changed else df
+
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """Return the deep memory footprint of ``df`` in bytes, including the index."""
+    return int(df.memory_usage(index=True, deep=True).sum())
 
 
 def normalize_upload(df: pd.DataFrame) -> pd.DataFrame:
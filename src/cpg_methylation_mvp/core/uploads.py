@@ -0,0 +1,221 @@
+"""Upload handling shared by the ingest entry points: reading, provenance, limits, and user-facing errors."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from .io import (
+    CompressionCodec,
+    DecompressionError,
+    DelimiterStructureError,
+    TableChunkResult,
+    TableReadResult,
+    decompressed_limit_message,
+    open_decompressed_stream,
+)
+from .validate import ValidationError
+
+READ_BLOCK_BYTES = 1024 * 1024
+
+
+class IngestError(ValidationError):
+    """Raised for parsing and ingestion errors."""
+
+
+def upload_limit_error(max_upload_bytes: int) -> IngestError:
+    """Return the user-facing error for uploads above the configured byte limit."""
+    limit_mb = max_upload_bytes / (1024 * 1024)
+    return IngestError(
+        f"The uploaded file exceeds the {limit_mb:.0f} MB limit. "
+        "Use a smaller file or raise the deployment upload limit intentionally."
+    )
+
+
+def upload_name(uploaded_file: object, source_name: str | None) -> str:
+    """Return the name recorded for an upload: ``source_name``, else the file object's name."""
+    candidate_name = source_name if source_name is not None else getattr(uploaded_file, "name", "uploaded_file")
+    return str(candidate_name or "uploaded_file")
+
+
+@dataclass(frozen=True)
+class UploadProvenance:
+    """Source, checksum, and parse metadata recorded in the processing report."""
+
+    source_file: str
+    uploaded_at: str
+    input_sha256: str
+    parse_strategy: str
+    delimiter_used: str | None
+    recovered_from_extension_mismatch: bool
+    parse_warnings: tuple[str, ...]
+    compression: str | None = None
+
+
+class LimitedReader:
+    """Binary reader that counts bytes as they are consumed and enforces a byte limit."""
+
+    def __init__(self, stream: BinaryIO, max_bytes: int, limit_error: Callable[[int], IngestError]) -> None:
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._limit_error = limit_error
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        if self.bytes_read > self._max_bytes:
+            raise self._limit_error(self._max_bytes)
+        return data
+
+    def read_all(self) -> bytes:
+        """Read the remaining stream in blocks so the limit applies before everything is buffered."""
+        return b"".join(iter(lambda: self.read(READ_BLOCK_BYTES), b""))
+
+
+class HashingReader(LimitedReader):
+    """Binary reader that hashes and size-checks upload bytes as they are consumed."""
+
+    def __init__(self, stream: BinaryIO, max_upload_bytes: int) -> None:
+        super().__init__(stream, max_bytes=max_upload_bytes, limit_error=upload_limit_error)
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        self._digest.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def decompressed_limit_error(max_decompressed_bytes: int) -> IngestError:
+    """Return the user-facing error for compressed uploads that expand beyond the configured limit."""
+    return IngestError(decompressed_limit_message(max_decompressed_bytes))
+
+
+def empty_upload_error() -> IngestError:
+    """Return the user-facing error for zero-byte uploads."""
+    return IngestError("The uploaded file is empty. Please choose a non-empty CSV/TSV file.")
+
+
+def open_parse_stream(
+    hashing_reader: HashingReader,
+    compression: CompressionCodec | None,
+    max_decompressed_bytes: int,
+) -> LimitedReader:
+    """Return the stream the parser reads: the hashed upload itself or its size-limited decompression."""
+    if compression is None:
+        return hashing_reader
+    return LimitedReader(
+        open_decompressed_stream(hashing_reader, compression),  # type: ignore[arg-type]
+        max_bytes=max_decompressed_bytes,
+        limit_error=decompressed_limit_error,
+    )
+
+
+def upload_provenance(
+    source_file: str,
+    input_sha256: str,
+    parse_result: TableReadResult | TableChunkResult,
+    compression: CompressionCodec | None,
+) -> UploadProvenance:
+    """Collect report provenance from a parse result at the moment ingestion completes parsing."""
+    return UploadProvenance(
+        source_file=source_file,
+        uploaded_at=datetime.now(timezone.utc).isoformat(),
+        input_sha256=input_sha256,
+        parse_strategy=parse_result.parse_strategy,
+        delimiter_used=parse_result.delimiter_used,
+        recovered_from_extension_mismatch=parse_result.recovered_from_extension_mismatch,
+        parse_warnings=parse_result.parse_warnings,
+        compression=compression,
+    )
+
+
+def input_sha256(raw_bytes: bytes) -> str:
+    """Return a stable checksum of the uploaded file bytes."""
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+def _line_number_summary(line_numbers: Sequence[int] | np.ndarray, max_listed: int = 5) -> str:
+    """Return a short `` on N line(s) (line a, b, ...)`` suffix for user-facing structure errors."""
+    if not len(line_numbers):
+        return ""
+    listed = ", ".join(str(int(line_number)) for line_number in line_numbers[:max_listed])
+    more = ", ..." if len(line_numbers) > max_listed else ""
+    return f" on {len(line_numbers)} line(s) (line {listed}{more})"
+
+
+def _copy_on_write() -> AbstractContextManager[object]:
+    """Return a context that enables pandas copy-on-write; it is always on from pandas 3."""
+    if int(pd.__version__.split(".", 1)[0]) >= 3:
+        return nullcontext()
+    return pd.option_context("mode.copy_on_write", True)
+
+
+@contextmanager
+def ingest_error_boundary() -> Iterator[None]:
+    """Translate parser and validation failures into user-facing ingest errors.
+
+    The pipeline relies on copy-on-write to share column data between stages instead of copying,
+    so the boundary also enables it on pandas versions where it is not the default.
+    """
+    try:
+        with _copy_on_write():
+            yield
+    except pd.errors.EmptyDataError as exc:
+        raise IngestError(
+            "The uploaded file appears empty. Please upload a CSV/TSV file with header and rows."
+        ) from exc
+    except DecompressionError as exc:
+        raise IngestError(str(exc)) from exc
+    except DelimiterStructureError as exc:
+        raise IngestError(
+            "Mixed delimiters produced inconsistent row structure"
+            f"{_line_number_summary(exc.line_numbers)}. "
+            "Normalize the file to a single delimiter before upload."
+        ) from exc
+    except pd.errors.ParserError as exc:
+        raise IngestError(
+            "Could not parse the uploaded file. Check for malformed quotes or inconsistent delimiter structure."
+        ) from exc
+    except ValidationError as exc:
+        if isinstance(exc, IngestError):
+            raise
+        raise IngestError(str(exc), violations=exc.violations) from exc
+    except Exception as exc:  # pragma: no cover
+        raise IngestError(
+            "Could not parse the uploaded file. Please upload a valid CSV/TSV with a header row."
+        ) from exc
+
+
+def read_upload_bytes(
+    uploaded_file: BinaryIO,
+    compression: CompressionCodec | None,
+    max_upload_bytes: int,
+    max_decompressed_bytes: int,
+) -> tuple[bytes, str]:
+    """Return parseable (decompressed) upload bytes and the checksum of the bytes as uploaded."""
+    if compression is None:
+        raw_bytes = uploaded_file.read()
+        if not raw_bytes:
+            raise empty_upload_error()
+        if len(raw_bytes) > max_upload_bytes:
+            raise upload_limit_error(max_upload_bytes)
+        return raw_bytes, input_sha256(raw_bytes)
+
+    hashing_reader = HashingReader(uploaded_file, max_upload_bytes=max_upload_bytes)
+    raw_bytes = open_parse_stream(hashing_reader, compression, max_decompressed_bytes).read_all()
+    while hashing_reader.read(READ_BLOCK_BYTES):
+        pass
+    if hashing_reader.bytes_read == 0 or not raw_bytes:
+        raise empty_upload_error()
+    return raw_bytes, hashing_reader.hexdigest()
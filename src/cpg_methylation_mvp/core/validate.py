@@ -2,21 +2,220 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Literal
 
+import numpy as np
 import pandas as pd
 
+DEFAULT_MAX_VIOLATIONS = 10_000
+VIOLATION_RULE_IDS: tuple[str, ...] = ("non_numeric_beta", "beta_out_of_range")
+
+RuleSeverity = Literal["drop", "warn", "reject"]
+
+
+@dataclass(frozen=True)
+class ValidationViolations:
+    """Columnar row-level rule violations, capped at ``max_violations`` listed rows.
+
+    ``row_index`` is the 0-based data row position in the upload (header excluded). ``counts_by_rule``
+    always holds uncapped totals, so ``truncated`` tells whether rows were left out of the listing.
+    """
+
+    row_index: np.ndarray
+    rule_id: pd.Categorical
+    value: pd.api.extensions.ExtensionArray
+    counts_by_rule: dict[str, int]
+    max_violations: int = DEFAULT_MAX_VIOLATIONS
+
+    @property
+    def total_count(self) -> int:
+        """Return the uncapped number of violations across all rules."""
+        return sum(self.counts_by_rule.values())
+
+    @property
+    def truncated(self) -> bool:
+        """Return whether the listing omits violations beyond the cap."""
+        return self.total_count > len(self.row_index)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the listed violations as a ``row_index`` / ``rule_id`` / ``value`` dataframe."""
+        return pd.DataFrame({"row_index": self.row_index, "rule_id": self.rule_id, "value": self.value})
+
+    @classmethod
+    def empty(cls, max_violations: int = DEFAULT_MAX_VIOLATIONS) -> ValidationViolations:
+        """Return a violation table with no rows."""
+        return cls(
+            row_index=np.empty(0, dtype=np.int64),
+            rule_id=pd.Categorical([], categories=list(VIOLATION_RULE_IDS)),
+            value=pd.array([], dtype="string"),
+            counts_by_rule={rule_id: 0 for rule_id in VIOLATION_RULE_IDS},
+            max_violations=max_violations,
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[ValidationViolations], max_violations: int) -> ValidationViolations:
+        """Combine per-chunk violation tables in row order, summing counts and re-applying the cap."""
+        if not parts:
+            return cls.empty(max_violations)
+        counts_by_rule = {rule_id: sum(part.counts_by_rule.get(rule_id, 0) for part in parts) for rule_id in VIOLATION_RULE_IDS}
+        listed = pd.concat([part.to_frame() for part in parts], ignore_index=True).iloc[:max_violations]
+        return cls(
+            row_index=listed["row_index"].to_numpy(dtype=np.int64),
+            rule_id=pd.Categorical(listed["rule_id"], categories=list(VIOLATION_RULE_IDS)),
+            value=listed["value"].astype("string").array,
+            counts_by_rule=counts_by_rule,
+            max_violations=max_violations,
+        )
+
 
 class ValidationError(ValueError):
-    """Raised when upload data cannot be validated."""
+    """Raised when upload data cannot be validated.
+
+    Collect-all validation attaches the violation table it gathered before failing.
+    """
+
+    def __init__(self, message: str, violations: ValidationViolations | None = None) -> None:
+        super().__init__(message)
+        self.violations = violations
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """Declarative row-level check on one optional canonical column.
+
+    A row fails when its non-missing value is non-numeric or outside ``[min_value, max_value]``
+    (numeric rules), or not in ``allowed_values`` after trimming (vocabulary rules). Missing values
+    and absent columns always pass. ``severity`` decides whether failing rows are dropped, kept and
+    counted as warnings, or reject the whole upload.
+    """
+
+    rule_id: str
+    column: str
+    severity: RuleSeverity = "drop"
+    min_value: float | None = None
+    max_value: float | None = None
+    allowed_values: tuple[str, ...] | None = None
+
+    def __post_init__(self) -> None:
+        numeric = self.min_value is not None or self.max_value is not None
+        if numeric == (self.allowed_values is not None):
+            raise ValueError(f"Rule {self.rule_id!r} needs either numeric bounds or allowed_values, not both.")
+
+
+_CHROM_VOCABULARY = tuple(
+    f"{prefix}{name}" for prefix in ("chr", "") for name in (*map(str, range(1, 23)), "X", "Y", "M", "MT")
+)
+RECOMMENDED_COLUMN_RULES: tuple[ColumnRule, ...] = (
+    ColumnRule("negative_pos", "pos", min_value=0),
+    ColumnRule("pval_out_of_range", "pval", min_value=0, max_value=1),
+    ColumnRule("unknown_chrom", "chrom", severity="warn", allowed_values=_CHROM_VOCABULARY),
+)
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    """Per-rule failure masks from one sweep of the configured column rules."""
+
+    drop_masks: dict[str, pd.Series] = field(default_factory=dict)
+    warn_masks: dict[str, pd.Series] = field(default_factory=dict)
+
+    def row_counts(self, retained_rows: pd.Series) -> tuple[dict[str, int], dict[str, int], pd.Series]:
+        """Return dropped and warned row counts per rule plus the rows still retained.
+
+        Each retained row is dropped under its first failing drop rule; warnings count only rows
+        that survive every drop rule.
+        """
+        dropped_rows_by_rule: dict[str, int] = {}
+        for rule_id, failed in self.drop_masks.items():
+            newly_dropped = failed & retained_rows
+            dropped_rows_by_rule[rule_id] = int(newly_dropped.sum())
+            retained_rows = retained_rows & ~newly_dropped
+        warned_rows_by_rule = {rule_id: int((failed & retained_rows).sum()) for rule_id, failed in self.warn_masks.items()}
+        return dropped_rows_by_rule, warned_rows_by_rule, retained_rows
+
+
+@dataclass(frozen=True)
+class _ColumnRulePlan:
+    """All rules for one column, evaluated against a single coercion of that column."""
+
+    column: str
+    rules: tuple[ColumnRule, ...]
+
+    def failure_masks(self, values: pd.Series) -> dict[str, pd.Series]:
+        """Return one failure mask per rule, coercing the column at most once per comparison kind."""
+        present = values.notna()
+        numeric_values: pd.Series | None = None
+        text_values: pd.Series | None = None
+        masks: dict[str, pd.Series] = {}
+        for rule in self.rules:
+            if rule.allowed_values is None:
+                if numeric_values is None:
+                    numeric_values = (
+                        values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(values, errors="coerce")
+                    )
+                in_bounds = numeric_values.notna()
+                if rule.min_value is not None:
+                    in_bounds &= numeric_values >= rule.min_value
+                if rule.max_value is not None:
+                    in_bounds &= numeric_values <= rule.max_value
+                failed = present & ~in_bounds
+            else:
+                if text_values is None:
+                    text_values = values.astype("string").str.strip()
+                failed = present & ~text_values.isin(rule.allowed_values)
+            masks[rule.rule_id] = failed.fillna(False).astype(bool)
+        return masks
 
 
 @dataclass(frozen=True)
 class ValidationConfig:
-    """Configuration for required canonical columns."""
+    """Configuration for required canonical columns and declarative column rules.
+
+    ``rules`` run in declaration order; a row dropped by several rules is counted under the first.
+    """
 
     required_columns: tuple[str, ...] = ("cpg_id", "beta")
+    rules: tuple[ColumnRule, ...] = ()
+
+    def __post_init__(self) -> None:
+        rule_ids = [rule.rule_id for rule in self.rules]
+        if len(set(rule_ids)) != len(rule_ids):
+            raise ValueError("Validation rule ids must be unique.")
+
+    @cached_property
+    def _rule_plans(self) -> tuple[_ColumnRulePlan, ...]:
+        """Group rules by column once so each column is coerced a single time per sweep."""
+        columns = dict.fromkeys(rule.column for rule in self.rules)
+        return tuple(
+            _ColumnRulePlan(column, tuple(rule for rule in self.rules if rule.column == column)) for column in columns
+        )
+
+    def evaluate_rules(self, df: pd.DataFrame) -> RuleOutcome:
+        """Run every rule over ``df`` and raise for failing reject-severity rules."""
+        masks: dict[str, pd.Series] = {}
+        for plan in self._rule_plans:
+            if plan.column in df.columns:
+                masks.update(plan.failure_masks(df[plan.column]))
+
+        drop_masks: dict[str, pd.Series] = {}
+        warn_masks: dict[str, pd.Series] = {}
+        for rule in self.rules:
+            failed = masks.get(rule.rule_id, pd.Series(False, index=df.index, dtype=bool))
+            if rule.severity == "reject":
+                failed_count = int(failed.sum())
+                if failed_count:
+                    raise ValidationError(
+                        f"Found {failed_count} row(s) failing validation rule '{rule.rule_id}' on column "
+                        f"'{rule.column}'. Fix these values and re-upload."
+                    )
+            elif rule.severity == "warn":
+                warn_masks[rule.rule_id] = failed
+            else:
+                drop_masks[rule.rule_id] = failed
+        return RuleOutcome(drop_masks=drop_masks, warn_masks=warn_masks)
 
 
 def ensure_non_empty_dataframe(df: pd.DataFrame) -> None:
@@ -38,14 +237,126 @@ def ensure_required_columns(df: pd.DataFrame, required_columns: Iterable[str]) -
         )
 
 
-def ensure_beta_numeric(df: pd.DataFrame, beta_column: str = "beta") -> None:
-    """Raise when beta values cannot be parsed as numeric values."""
-    cleaned_beta = df[beta_column]
-    if pd.api.types.is_object_dtype(cleaned_beta) or pd.api.types.is_string_dtype(cleaned_beta):
-        cleaned_beta = cleaned_beta.astype("string").str.strip().replace("", pd.NA)
+@dataclass(frozen=True)
+class ValidationKernelResult:
+    """Typed required columns plus every required-value and beta-rule mask from one pass."""
 
-    numeric_beta = pd.to_numeric(cleaned_beta, errors="coerce")
-    invalid_mask = numeric_beta.isna() & cleaned_beta.notna()
+    cpg_id: pd.Series
+    beta: pd.Series
+    missing_cpg_id: pd.Series
+    missing_beta: pd.Series
+    non_numeric_beta: pd.Series
+    out_of_range_beta: pd.Series
+
+    @property
+    def valid_rows(self) -> pd.Series:
+        """Return rows with both required analytical values present."""
+        return ~(self.missing_cpg_id | self.missing_beta)
+
+    @property
+    def rule_violation_rows(self) -> pd.Series:
+        """Return rows that break a hard-fail beta rule."""
+        return self.non_numeric_beta | self.out_of_range_beta
+
+    @classmethod
+    def from_validated(
+        cls,
+        df: pd.DataFrame,
+        cpg_id_column: str = "cpg_id",
+        beta_column: str = "beta",
+    ) -> ValidationKernelResult:
+        """Rebuild masks for a frame whose required columns are already typed and rule-checked."""
+        missing_cpg_id, missing_beta, _ = required_value_masks(df, cpg_id_column, beta_column)
+        no_violations = pd.Series(False, index=df.index)
+        return cls(
+            cpg_id=df[cpg_id_column],
+            beta=df[beta_column],
+            missing_cpg_id=missing_cpg_id,
+            missing_beta=missing_beta,
+            non_numeric_beta=no_violations,
+            out_of_range_beta=no_violations,
+        )
+
+
+@dataclass(frozen=True)
+class ValidatedUpload:
+    """Validated dataframe plus the kernel masks computed while validating it.
+
+    ``violations`` is set only by collect-all validation.
+    """
+
+    dataframe: pd.DataFrame
+    kernel: ValidationKernelResult
+    violations: ValidationViolations | None = None
+    rules: RuleOutcome = field(default_factory=RuleOutcome)
+
+
+def coerce_numeric(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Return whitespace-cleaned values and their numeric coercion, for beta and p-value columns alike."""
+    if pd.api.types.is_float_dtype(values) and not isinstance(values.dtype, pd.ArrowDtype):
+        return values, values
+    cleaned = values
+    if pd.api.types.is_object_dtype(cleaned) or pd.api.types.is_string_dtype(cleaned):
+        cleaned = cleaned.astype("string").str.strip().replace("", pd.NA)
+    return cleaned, pd.to_numeric(cleaned, errors="coerce")
+
+
+def run_validation_kernel(
+    df: pd.DataFrame,
+    cpg_id_column: str = "cpg_id",
+    beta_column: str = "beta",
+) -> ValidationKernelResult:
+    """Coerce required columns once and compute missing, non-numeric, and out-of-range masks together."""
+    cpg_id = df[cpg_id_column].astype("string").str.strip()
+    cleaned_beta, numeric_beta = coerce_numeric(df[beta_column])
+    return ValidationKernelResult(
+        cpg_id=cpg_id,
+        beta=numeric_beta,
+        missing_cpg_id=(cpg_id.isna() | cpg_id.eq("")).fillna(True).astype(bool),
+        missing_beta=numeric_beta.isna(),
+        non_numeric_beta=numeric_beta.isna() & cleaned_beta.notna(),
+        out_of_range_beta=((numeric_beta < 0) | (numeric_beta > 1)).fillna(False).astype(bool),
+    )
+
+
+def collect_rule_violations(
+    df: pd.DataFrame,
+    kernel: ValidationKernelResult,
+    max_violations: int = DEFAULT_MAX_VIOLATIONS,
+    row_offset: int = 0,
+    beta_column: str = "beta",
+) -> ValidationViolations:
+    """Return every hard-fail beta rule violation as a capped columnar table, ordered by row."""
+    rule_masks = (kernel.non_numeric_beta, kernel.out_of_range_beta)
+    rule_positions = [np.flatnonzero(mask.to_numpy(dtype=bool)) for mask in rule_masks]
+    positions = np.concatenate(rule_positions)
+    rule_codes = np.concatenate(
+        [np.full(len(rule_position), code, dtype=np.int8) for code, rule_position in enumerate(rule_positions)]
+    )
+    order = np.lexsort((rule_codes, positions))[:max_violations]
+    listed_positions = positions[order]
+    return ValidationViolations(
+        row_index=listed_positions.astype(np.int64) + row_offset,
+        rule_id=pd.Categorical(np.asarray(VIOLATION_RULE_IDS)[rule_codes[order]], categories=list(VIOLATION_RULE_IDS)),
+        value=df[beta_column].iloc[listed_positions].astype("string").array,
+        counts_by_rule={
+            rule_id: int(len(rule_position)) for rule_id, rule_position in zip(VIOLATION_RULE_IDS, rule_positions)
+        },
+        max_violations=max_violations,
+    )
+
+
+def ensure_beta_numeric(
+    df: pd.DataFrame,
+    beta_column: str = "beta",
+    kernel: ValidationKernelResult | None = None,
+) -> None:
+    """Raise when beta values cannot be parsed as numeric values."""
+    if kernel is None:
+        cleaned_beta, numeric_beta = coerce_numeric(df[beta_column])
+        invalid_mask = numeric_beta.isna() & cleaned_beta.notna()
+    else:
+        invalid_mask = kernel.non_numeric_beta
     invalid_count = int(invalid_mask.sum())
 
     if invalid_count > 0:
@@ -55,9 +366,16 @@ def ensure_beta_numeric(df: pd.DataFrame, beta_column: str = "beta") -> None:
         )
 
 
-def ensure_beta_in_range(df: pd.DataFrame, beta_column: str = "beta") -> None:
+def ensure_beta_in_range(
+    df: pd.DataFrame,
+    beta_column: str = "beta",
+    kernel: ValidationKernelResult | None = None,
+) -> None:
     """Raise when beta values are outside [0, 1]."""
-    out_of_range_mask = (df[beta_column] < 0) | (df[beta_column] > 1)
+    if kernel is None:
+        out_of_range_mask = (df[beta_column] < 0) | (df[beta_column] > 1)
+    else:
+        out_of_range_mask = kernel.out_of_range_beta
     out_of_range_count = int(out_of_range_mask.sum())
 
     if out_of_range_count > 0:
@@ -79,33 +397,88 @@ def required_value_masks(
     return missing_cpg_id, missing_beta, valid_rows
 
 
-def ensure_at_least_one_valid_required_row(df: pd.DataFrame) -> None:
+def detection_pval_mask(df: pd.DataFrame, threshold: float, pval_column: str = "pval") -> pd.Series:
+    """Return rows whose detection p-value is above ``threshold``; missing and non-numeric values pass."""
+    if pval_column not in df.columns:
+        return pd.Series(False, index=df.index)
+    _, numeric_pval = coerce_numeric(df[pval_column])
+    return (numeric_pval > threshold).fillna(False).astype(bool)
+
+
+def ensure_at_least_one_valid_required_row(
+    df: pd.DataFrame,
+    kernel: ValidationKernelResult | None = None,
+) -> None:
     """Raise when no rows remain after excluding missing required values."""
-    _, _, valid_rows = required_value_masks(df)
+    valid_rows = required_value_masks(df)[2] if kernel is None else kernel.valid_rows
     if not bool(valid_rows.any()):
         raise ValidationError(
             "No valid rows remain after excluding rows missing required cpg_id/beta values."
         )
 
 
-
-def validate_upload(
+def validate_upload_with_kernel(
     df: pd.DataFrame,
     config: ValidationConfig | None = None,
-) -> pd.DataFrame:
-    """Validate normalized upload dataframe and return validated copy."""
+    *,
+    require_valid_rows: bool = True,
+    collect_violations: bool = False,
+    max_violations: int = DEFAULT_MAX_VIOLATIONS,
+    row_offset: int = 0,
+) -> ValidatedUpload:
+    """Validate normalized upload dataframe and return it with the masks computed along the way.
+
+    The validation kernel coerces ``cpg_id`` and ``beta`` once; the rule checks, the returned
+    dataframe, and downstream row accounting all reuse its typed columns and masks. With
+    ``collect_violations``, row-level beta rules do not raise: every violation is listed (up to
+    ``max_violations``, indexed from ``row_offset``) on the returned ``violations`` table. Missing
+    columns and empty input still raise. The config's column rules run after the beta checks.
+    """
     cfg = config or ValidationConfig()
     ensure_non_empty_dataframe(df)
     ensure_required_columns(df, cfg.required_columns)
 
-    validated = df.copy()
-    validated["cpg_id"] = validated["cpg_id"].astype("string").str.strip()
-
-    ensure_beta_numeric(validated, beta_column="beta")
-    beta_series = validated["beta"]
-    if pd.api.types.is_object_dtype(beta_series) or pd.api.types.is_string_dtype(beta_series):
-        beta_series = beta_series.astype("string").str.strip().replace("", pd.NA)
-    validated["beta"] = pd.to_numeric(beta_series, errors="coerce")
-    ensure_at_least_one_valid_required_row(validated)
-    ensure_beta_in_range(validated, beta_column="beta")
-    return validated
+    kernel = run_validation_kernel(df)
+    violations = None
+    if collect_violations:
+        violations = collect_rule_violations(df, kernel, max_violations=max_violations, row_offset=row_offset)
+        if require_valid_rows and not bool((kernel.valid_rows & ~kernel.rule_violation_rows).any()):
+            raise ValidationError(
+                "No valid rows remain after excluding rows missing required cpg_id/beta values "
+                f"or breaking beta rules ({violations.total_count} rule violation(s)).",
+                violations=violations,
+            )
+    else:
+        ensure_beta_numeric(df, kernel=kernel)
+        if require_valid_rows:
+            ensure_at_least_one_valid_required_row(df, kernel=kernel)
+        ensure_beta_in_range(df, kernel=kernel)
+
+    rule_outcome = cfg.evaluate_rules(df)
+    if require_valid_rows and rule_outcome.drop_masks:
+        _, _, retained_rows = rule_outcome.row_counts(kernel.valid_rows & ~kernel.rule_violation_rows)
+        if not bool(retained_rows.any()):
+            raise ValidationError(
+                "No valid rows remain after excluding rows missing required values or failing validation rules.",
+                violations=violations,
+            )
+    return ValidatedUpload(
+        dataframe=df.assign(cpg_id=kernel.cpg_id, beta=kernel.beta),
+        kernel=kernel,
+        violations=violations,
+        rules=rule_outcome,
+    )
+
+
+def validate_upload(
+    df: pd.DataFrame,
+    config: ValidationConfig | None = None,
+    *,
+    require_valid_rows: bool = True,
+) -> pd.DataFrame:
+    """Validate normalized upload dataframe and return validated copy.
+
+    Chunked ingestion passes ``require_valid_rows=False`` because a single chunk may legitimately
+    contain only incomplete rows; the at-least-one-valid-row check then runs once for the whole file.
+    """
+    return validate_upload_with_kernel(df, config, require_valid_rows=require_valid_rows).dataframe
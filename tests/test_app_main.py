@@ -1,19 +1,22 @@
 import json
 
+import numpy as np
 import pandas as pd
 from app.main import (
     _aggregation_audit_csv_bytes,
     _build_context_package,
     _context_evidence_table,
-    _duplicate_review_csv_bytes,
+    _duplicate_review_chunked_csv_bytes,
     _interpretation_marker_ids,
     _normalized_csv_bytes,
     _processing_report_csv_bytes,
     _processing_report_json,
     _structured_interpretation_json_bytes,
+    _validation_violations_csv_bytes,
+    _validation_violations_message,
 )
 
-from cpg_methylation_mvp.core import ProcessingReport
+from cpg_methylation_mvp.core import ProcessingReport, ValidationViolations, duplicate_review
 
 
 def test_processing_report_download_serializers() -> None:
@@ -48,14 +51,8 @@ def test_processing_report_download_serializers() -> None:
     report_json = _processing_report_json(report)
     report_csv = _processing_report_csv_bytes(report).decode("utf-8")
     normalized_csv = _normalized_csv_bytes(pd.DataFrame({"cpg_id": ["cg1"], "beta": [0.2]})).decode("utf-8")
-    duplicate_review_csv = _duplicate_review_csv_bytes(
-        pd.DataFrame(
-            {
-                "cpg_id": ["cg1", "cg1"],
-                "beta": [0.2, 0.8],
-                "duplicate_group_row_count": [2, 2],
-            }
-        )
+    duplicate_review_csv = _duplicate_review_chunked_csv_bytes(
+        duplicate_review(pd.DataFrame({"cpg_id": ["cg1", "cg1", "cg2"], "beta": [0.2, 0.8, 0.1]}))
     ).decode("utf-8")
     aggregation_audit_csv = _aggregation_audit_csv_bytes(
         pd.DataFrame(
@@ -86,6 +83,23 @@ def test_processing_report_download_serializers() -> None:
     assert '"workflow_id": "mvp_workflow_01"' in interpretation_json
 
 
+def test_validation_violation_download_serializer() -> None:
+    violations = ValidationViolations(
+        row_index=np.array([0, 3], dtype=np.int64),
+        rule_id=pd.Categorical(["beta_out_of_range", "non_numeric_beta"]),
+        value=pd.array(["1.5", "high"], dtype="string"),
+        counts_by_rule={"non_numeric_beta": 1, "beta_out_of_range": 2},
+        max_violations=2,
+    )
+
+    csv_text = _validation_violations_csv_bytes(violations).decode("utf-8")
+    message = _validation_violations_message(violations)
+
+    assert csv_text.splitlines() == ["row_index,rule_id,value", "0,beta_out_of_range,1.5", "3,non_numeric_beta,high"]
+    assert "3 row-level validation violation(s)" in message
+    assert "capped at the first 2 rows" in message
+
+
 def test_context_evidence_helpers_return_cited_rows() -> None:
     interpretation = {
         "observed_data": {"coverage_status": "partial"},
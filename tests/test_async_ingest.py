@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from cpg_methylation_mvp.core import (
+    AsyncIngestor,
+    DuplicatePolicy,
+    ExecutorKind,
+    IngestError,
+    ProcessedUpload,
+    process_methylation_upload,
+)
+
+CSV_PAYLOAD = (
+    "cpg_id,beta,chrom\n"
+    "cg000001,0.2,chr1\n"
+    "cg000001,0.4,chr1\n"
+    "cg000002,,chr2\n"
+    "cg000003,0.9,chr3\n"
+).encode("utf-8")
+
+
+class _BytesReader:
+    """Minimal ``async read(size)`` upload body that hands out a few bytes per call."""
+
+    def __init__(self, payload: bytes, block_bytes: int = 7) -> None:
+        self._stream = BytesIO(payload)
+        self._block_bytes = block_bytes
+
+    async def read(self, size: int = -1) -> bytes:
+        await asyncio.sleep(0)
+        return self._stream.read(min(size, self._block_bytes) if size >= 0 else self._block_bytes)
+
+
+async def _chunks(payload: bytes, started: asyncio.Event | None = None, release: asyncio.Event | None = None):
+    if started is not None:
+        started.set()
+    yield payload[:20]
+    if release is not None:
+        await release.wait()
+    yield payload[20:]
+
+
+def _assert_matches_sync(processed: ProcessedUpload, duplicate_policy: DuplicatePolicy) -> None:
+    expected = process_methylation_upload(BytesIO(CSV_PAYLOAD), source_name="async.csv", duplicate_policy=duplicate_policy)
+    pd.testing.assert_frame_equal(
+        processed.normalized_df.drop(columns="uploaded_at"), expected.normalized_df.drop(columns="uploaded_at")
+    )
+    assert processed.report.input_sha256 == expected.report.input_sha256
+    assert processed.report.dropped_rows_by_reason == expected.report.dropped_rows_by_reason
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_async_ingest_matches_sync_processing_for_readers_and_chunk_iterables(executor: ExecutorKind) -> None:
+    async def run() -> None:
+        async with AsyncIngestor(executor=executor) as ingestor:
+            from_reader, from_chunks, unchunked = await asyncio.gather(
+                ingestor.process_upload(_BytesReader(CSV_PAYLOAD), source_name="async.csv"),
+                ingestor.process_upload(
+                    _chunks(CSV_PAYLOAD), source_name="async.csv", duplicate_policy="aggregate_mean_when_metadata_match"
+                ),
+                ingestor.process_upload(_BytesReader(CSV_PAYLOAD), source_name="async.csv", chunk_rows=None),
+            )
+        _assert_matches_sync(from_reader, "preserve_rows_and_warn")
+        _assert_matches_sync(from_chunks, "aggregate_mean_when_metadata_match")
+        _assert_matches_sync(unchunked, "preserve_rows_and_warn")
+
+        async with AsyncIngestor(executor=executor) as ingestor:
+            with pytest.raises(IngestError, match="exceeds the"):
+                await ingestor.process_upload(_BytesReader(CSV_PAYLOAD), source_name="async.csv", max_upload_bytes=10)
+
+    asyncio.run(run())
+
+
+def test_semaphore_caps_concurrent_ingests_and_cancellation_frees_the_slot() -> None:
+    async def run() -> None:
+        first_started, second_started, release = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        async with AsyncIngestor(max_concurrent=1) as ingestor:
+            first = asyncio.create_task(
+                ingestor.process_upload(_chunks(CSV_PAYLOAD, first_started, release), source_name="async.csv")
+            )
+            second = asyncio.create_task(
+                ingestor.process_upload(_chunks(CSV_PAYLOAD, second_started), source_name="async.csv")
+            )
+            await asyncio.wait_for(first_started.wait(), timeout=5)
+            await asyncio.sleep(0.05)
+            assert not second_started.is_set()
+
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            processed = await asyncio.wait_for(second, timeout=5)
+            _assert_matches_sync(processed, "preserve_rows_and_warn")
+
+    asyncio.run(run())
+
+
+def test_reader_errors_propagate_unchanged() -> None:
+    async def failing_body() -> AsyncIterator[bytes]:
+        yield CSV_PAYLOAD[:20]
+        raise ConnectionResetError("client went away")
+
+    async def run() -> None:
+        async with AsyncIngestor() as ingestor:
+            with pytest.raises(ConnectionResetError, match="client went away"):
+                await ingestor.process_upload(failing_body(), source_name="async.csv")
+
+    asyncio.run(run())
+    with pytest.raises(ValueError, match="max_concurrent"):
+        AsyncIngestor(max_concurrent=0)
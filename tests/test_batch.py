@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from cpg_methylation_mvp.core import process_methylation_upload, process_methylation_uploads
+from cpg_methylation_mvp.core.transform import COMPACT_DTYPE_POLICY
+
+
+def _write(path: Path, payload: str) -> Path:
+    path.write_text(payload, encoding="utf-8")
+    return path
+
+
+def test_batch_results_keep_input_order_and_capture_failures(tmp_path) -> None:
+    paths = [
+        _write(tmp_path / "sample_b.csv", "cpg_id,beta\ncg000001,0.2\ncg000002,\n"),
+        _write(tmp_path / "broken.csv", "cpg_id,beta\ncg000001,abc\n"),
+        _write(tmp_path / "sample_a.tsv", "cpg_id\tbeta\ncg000001\t0.4\ncg000001\t0.6\n"),
+        tmp_path / "missing.csv",
+    ]
+
+    batch = process_methylation_uploads(paths, max_workers=2)
+
+    assert [result.source_file for result in batch.results] == ["sample_b.csv", "broken.csv", "sample_a.tsv", "missing.csv"]
+    assert [result.succeeded for result in batch.results] == [True, False, True, False]
+    assert "non-numeric beta" in (batch.results[1].error or "")
+    assert "missing.csv" in (batch.failures[1].error or "")
+
+    summary = batch.summary
+    assert (summary.file_count, summary.succeeded_file_count, summary.failed_file_count) == (4, 2, 2)
+    assert summary.input_row_count == 4
+    assert summary.retained_row_count == 3
+    assert summary.dropped_rows_by_reason["missing_beta"] == 1
+    assert summary.duplicate_cpg_id_groups == 1
+
+    table = batch.report_table()
+    assert table["status"].tolist() == ["ok", "failed", "ok", "failed"]
+
+
+def test_batch_matches_single_file_processing(tmp_path) -> None:
+    payload = "cpg_id,beta,chrom\ncg000001,0.2,chr1\ncg000002,0.8,chr2\n"
+    path = _write(tmp_path / "sample.csv", payload)
+
+    batch = process_methylation_uploads([path, path], duplicate_policy="reject_duplicates", max_workers=1)
+    with path.open("rb") as handle:
+        single = process_methylation_upload(handle, source_name="sample.csv", duplicate_policy="reject_duplicates")
+
+    for result in batch.results:
+        assert result.processed is not None
+        assert result.processed.report.input_sha256 == single.report.input_sha256
+        assert result.processed.normalized_df["beta"].tolist() == single.normalized_df["beta"].tolist()
+    assert batch.summary.duplicate_policy == "reject_duplicates"
+
+
+def test_batch_rejects_invalid_worker_count(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        process_methylation_uploads([tmp_path / "sample.csv"], max_workers=0)
+
+
+def test_batch_forwards_ingest_options_and_sums_duplicate_totals(tmp_path) -> None:
+    paths = [
+        _write(tmp_path / "mixed.csv", "cpg_id,beta,chrom\ncg000001,0.2,chr1\ncg000001,0.4,chr1\ncg000002,abc,chr2\n"),
+        _write(tmp_path / "conflict.csv", "cpg_id,beta,chrom\ncg000003,0.1,chr1\ncg000003,0.3,chr2\ncg000004,0.5,chr3\n"),
+    ]
+
+    aggregated = process_methylation_uploads(
+        paths,
+        duplicate_policy="aggregate_mean_when_metadata_match",
+        max_workers=2,
+        collect_violations=True,
+        dtype_policy=COMPACT_DTYPE_POLICY,
+        chunk_rows=1,
+    )
+    preserved = process_methylation_uploads(paths, max_workers=1, collect_violations=True)
+
+    assert [result.succeeded for result in aggregated.results] == [True, False]
+    assert "metadata values conflict" in (aggregated.results[1].error or "")
+    mixed = aggregated.results[0].processed
+    assert mixed is not None and mixed.violations is not None
+    assert mixed.normalized_df["beta"].dtype == "float32"
+    summary = aggregated.summary
+    assert summary.dropped_rows_by_reason["non_numeric_beta"] == 1
+    assert (summary.aggregated_duplicate_cpg_id_groups, summary.aggregated_duplicate_input_rows) == (1, 2)
+    assert summary.to_dict()["aggregation_output_row_count"] == 1
+    assert preserved.summary.duplicate_metadata_conflict_groups == 1
+    assert preserved.summary.aggregated_duplicate_cpg_id_groups == 0
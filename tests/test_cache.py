@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cpg_methylation_mvp.core import (
+    IngestCache,
+    apply_duplicate_policy,
+    prepare_methylation_upload,
+    process_methylation_file,
+    process_methylation_upload,
+)
+
+CSV_PAYLOAD = (
+    "cpg_id,beta,chrom\n"
+    "cg000001,0.2,chr1\n"
+    "cg000001,0.4,chr1\n"
+    "cg000002,abc,chr2\n"
+    "cg000003,0.9,chr3\n"
+).encode("utf-8")
+
+
+def test_cached_ingest_survives_new_cache_instances_and_keys_on_options(tmp_path: Path) -> None:
+    first = process_methylation_upload(
+        BytesIO(CSV_PAYLOAD),
+        source_name="cached.csv",
+        collect_violations=True,
+        cache=IngestCache(tmp_path),
+    )
+    repeated = process_methylation_upload(
+        BytesIO(CSV_PAYLOAD),
+        source_name="cached.csv",
+        collect_violations=True,
+        cache=IngestCache(tmp_path),
+    )
+    aggregated = process_methylation_upload(
+        BytesIO(CSV_PAYLOAD),
+        source_name="cached.csv",
+        duplicate_policy="aggregate_mean_when_metadata_match",
+        collect_violations=True,
+        cache=IngestCache(tmp_path),
+    )
+
+    fresh_fields = {"run_id", "uploaded_at"}
+    assert {key: value for key, value in repeated.report.to_dict().items() if key not in fresh_fields} == {
+        key: value for key, value in first.report.to_dict().items() if key not in fresh_fields
+    }
+    assert repeated.report.run_id != first.report.run_id
+    assert repeated.report.uploaded_at > first.report.uploaded_at
+    assert set(repeated.normalized_df["uploaded_at"]) == {repeated.report.uploaded_at}
+    pd.testing.assert_frame_equal(
+        repeated.normalized_df.drop(columns="uploaded_at"), first.normalized_df.drop(columns="uploaded_at")
+    )
+    assert repeated.normalized_df["uploaded_at"].dtype == first.normalized_df["uploaded_at"].dtype
+    assert repeated.violations is not None and first.violations is not None
+    pd.testing.assert_frame_equal(repeated.violations.to_frame(), first.violations.to_frame())
+    assert repeated.violations.counts_by_rule == first.violations.counts_by_rule
+    assert aggregated.report.run_id != first.report.run_id
+    assert aggregated.aggregation_audit_df is not None
+    assert len(list(tmp_path.iterdir())) == 2
+
+    csv_path = tmp_path / "cached.csv"
+    csv_path.write_bytes(CSV_PAYLOAD)
+    from_file = process_methylation_file(csv_path, collect_violations=True, cache=IngestCache(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 3
+    assert from_file.report.input_sha256 == first.report.input_sha256
+    assert len({first.report.run_id, repeated.report.run_id, from_file.report.run_id}) == 3
+
+
+def test_cache_hits_are_new_runs_without_stored_timings(tmp_path: Path) -> None:
+    runs = [
+        process_methylation_upload(
+            BytesIO(CSV_PAYLOAD),
+            source_name="cached.csv",
+            duplicate_policy="aggregate_mean_when_metadata_match",
+            collect_violations=True,
+            collect_timings=True,
+            cache=IngestCache(tmp_path),
+        )
+        for _ in range(3)
+    ]
+
+    assert len({run.report.run_id for run in runs}) == 3
+    assert runs[0].report.timings
+    assert runs[1].report.timings == {} and runs[2].report.timings == {}
+    for run in runs:
+        assert run.aggregation_audit_df is not None
+        assert set(run.aggregation_audit_df["uploaded_at"]) == {run.report.uploaded_at}
+
+    prepared = [
+        prepare_methylation_upload(
+            BytesIO(CSV_PAYLOAD),
+            source_name="cached.csv",
+            collect_violations=True,
+            collect_timings=True,
+            cache=IngestCache(tmp_path),
+        )
+        for _ in range(2)
+    ]
+    assert prepared[1].provenance.uploaded_at > prepared[0].provenance.uploaded_at
+    assert prepared[1].timings == {}
+    assert set(apply_duplicate_policy(prepared[1]).report.timings or {}) == {"duplicate_policy", "finalize"}
+
+
+def test_prepared_stage_is_cached_once_for_every_duplicate_policy(tmp_path: Path) -> None:
+    first = prepare_methylation_upload(
+        BytesIO(CSV_PAYLOAD), source_name="cached.csv", collect_violations=True, cache=IngestCache(tmp_path)
+    )
+    repeated = prepare_methylation_upload(
+        BytesIO(CSV_PAYLOAD), source_name="cached.csv", collect_violations=True, cache=IngestCache(tmp_path)
+    )
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert replace(repeated.provenance, uploaded_at=first.provenance.uploaded_at) == first.provenance
+    assert repeated.dropped_rows_by_reason == first.dropped_rows_by_reason
+    pd.testing.assert_frame_equal(repeated.retained_df, first.retained_df)
+    assert repeated.violations is not None and first.violations is not None
+    pd.testing.assert_frame_equal(repeated.violations.to_frame(), first.violations.to_frame())
+    for policy in ("preserve_rows_and_warn", "aggregate_mean_when_metadata_match"):
+        from_cache, fresh = apply_duplicate_policy(repeated, policy), apply_duplicate_policy(first, policy)
+        pd.testing.assert_frame_equal(
+            from_cache.normalized_df.drop(columns="uploaded_at"), fresh.normalized_df.drop(columns="uploaded_at")
+        )
+        assert from_cache.report.retained_row_count == fresh.report.retained_row_count
+
+
+def test_cache_evicts_least_recently_used_entries_by_total_size(tmp_path: Path) -> None:
+    frame = pd.DataFrame({"value": range(1_000)})
+    probe = IngestCache(tmp_path / "probe")
+    probe.put("probe", {"frame": frame}, {"name": "p"})
+    entry_bytes = probe.total_bytes
+    cache = IngestCache(tmp_path / "cache", max_bytes=2 * entry_bytes)
+
+    cache.put("a", {"frame": frame}, {"name": "a"})
+    cache.put("b", {"frame": frame}, {"name": "b"})
+    os.utime(tmp_path / "cache" / "a", (1, 1))
+    os.utime(tmp_path / "cache" / "b", (2, 2))
+    hit = cache.get("a")
+    cache.put("c", {"frame": frame}, {"name": "c"})
+
+    assert hit is not None and hit.metadata == {"name": "a"}
+    pd.testing.assert_frame_equal(hit.frames["frame"], frame)
+    assert cache.get("b") is None
+    assert {path.name for path in (tmp_path / "cache").iterdir()} == {"a", "c"}
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_unreadable_cache_entries_are_misses(tmp_path: Path) -> None:
+    cache = IngestCache(tmp_path)
+    cache.put("broken", {"frame": pd.DataFrame({"value": [1]})}, {})
+    (tmp_path / "broken" / "metadata.json").write_text("{not json", encoding="utf-8")
+
+    assert cache.get("broken") is None
+    assert not (tmp_path / "broken").exists()
+    with pytest.raises(ValueError, match="max_bytes"):
+        IngestCache(tmp_path, max_bytes=0)
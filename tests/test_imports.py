@@ -7,6 +7,7 @@ from typing import get_args
 
 def test_core_module_imports() -> None:
     import cpg_methylation_mvp.core.analyze  # noqa: F401
+    import cpg_methylation_mvp.core.batch  # noqa: F401
     import cpg_methylation_mvp.core.ingest  # noqa: F401
     import cpg_methylation_mvp.core.io  # noqa: F401
     import cpg_methylation_mvp.core.panels  # noqa: F401
@@ -1,14 +1,42 @@
+import bz2
+import gzip
+import hashlib
+import importlib.util
+import lzma
+import mmap
+import os
+import tempfile
+import threading
+import tracemalloc
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
 
 from cpg_methylation_mvp.core.ingest import (
     DEFAULT_MAX_UPLOAD_BYTES,
     PROCESSING_REPORT_VERSION,
     IngestError,
+    apply_duplicate_policy,
+    duplicate_review,
     duplicate_review_table,
     load_methylation_file,
+    prepare_methylation_upload,
+    process_methylation_file,
     process_methylation_upload,
 )
+from cpg_methylation_mvp.core.io import (
+    CSV_ENGINE_ENV_VAR,
+    DecompressionError,
+    read_table_bytes,
+    resolve_csv_engine,
+    scan_delimiter_structure,
+)
+from cpg_methylation_mvp.core.transform import COMPACT_DTYPE_POLICY
+from cpg_methylation_mvp.core.validate import RECOMMENDED_COLUMN_RULES, ColumnRule, ValidationConfig
 
 
 class TestIngest(unittest.TestCase):
@@ -115,6 +143,49 @@ class TestIngest(unittest.TestCase):
         self.assertEqual(set(review_df["duplicate_group_beta_min"]), {0.2})
         self.assertEqual(set(review_df["duplicate_group_beta_max"]), {0.8})
 
+    def test_duplicate_metadata_conflicts_are_resolved_per_group_and_column(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,chrom,pos,gene\n"
+            "cg000001,0.2,chr1,100,GENE1\n"
+            "cg000002,0.3,chr2,200,\n"
+            "cg000001,0.4, chr1 ,101,GENE2\n"
+            "cg000002,0.5,chr2,200,GENE3\n"
+            "cg000003,0.6,chr3,300,\n"
+            "cg000003,0.7,,300,\n"
+            "cg000004,0.8,chr4,400,\n"
+        ).encode("utf-8")
+
+        processed = process_methylation_upload(BytesIO(csv_payload), source_name="conflicts.csv")
+        review_df = duplicate_review_table(processed.normalized_df)
+
+        self.assertEqual(processed.report.duplicate_metadata_conflict_groups, 1)
+        conflict_columns = review_df.groupby("cpg_id")["duplicate_group_conflict_columns"].first().to_dict()
+        self.assertEqual(conflict_columns, {"cg000001": "pos|gene", "cg000002": "", "cg000003": ""})
+
+    def test_duplicate_review_pages_match_the_full_review_table(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,chrom\n"
+            "cg000001,0.2,chr1\n"
+            "cg000002,0.3,chr2\n"
+            "cg000001,0.4,chr9\n"
+            "cg000003,0.5,chr3\n"
+            "cg000002,0.6,chr2\n"
+            "cg000002,0.7,chr2\n"
+        ).encode("utf-8")
+
+        processed = process_methylation_upload(BytesIO(csv_payload), source_name="paged.csv")
+        review = duplicate_review(processed.normalized_df)
+        review_df = duplicate_review_table(processed.normalized_df)
+
+        self.assertEqual(review.row_count, 5)
+        self.assertEqual(review.page_count(2), 3)
+        self.assertEqual(review.columns, list(review_df.columns))
+        pd.testing.assert_frame_equal(review.page(1, page_rows=2), review_df.iloc[2:4].reset_index(drop=True))
+        pd.testing.assert_frame_equal(pd.concat(list(review.iter_chunks(2)), ignore_index=True), review_df)
+        self.assertEqual(review.page(1, page_rows=2)["duplicate_group_row_count"].tolist(), [2, 3])
+        self.assertTrue(review.page(3, page_rows=2).empty)
+        self.assertEqual(duplicate_review(processed.normalized_df.iloc[3:4]).row_count, 0)
+
     def test_duplicate_cpg_ids_can_be_rejected_explicitly(self) -> None:
         csv_payload = (
             "cpg_id,beta\n"
@@ -166,6 +237,87 @@ class TestIngest(unittest.TestCase):
         self.assertAlmostEqual(float(audit_row["beta_mean"]), 0.5)
         self.assertEqual(audit_row["source_file"], "aggregate_duplicates.csv")
 
+    def test_aggregation_reducers_share_grouping_and_audit(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,pval\n"
+            "cg000002,0.9,0.5\n"
+            "cg000001,0.1,0.0\n"
+            "cg000001,0.2,0.5\n"
+            "cg000001,0.9,1.0\n"
+            "cg000003,0.4,\n"
+            "cg000002,0.3,\n"
+        ).encode("utf-8")
+        expected = {
+            "aggregate_mean_when_metadata_match": [0.4, 0.6],
+            "aggregate_median_when_metadata_match": [0.2, 0.6],
+            "aggregate_pval_weighted_mean_when_metadata_match": [(0.1 + 0.2 * 0.5) / 1.5, (0.9 * 0.5 + 0.3) / 1.5],
+        }
+
+        without_pval = "\n".join(line.rsplit(",", 1)[0] for line in csv_payload.decode("utf-8").splitlines())
+
+        for policy, (cg1_beta, cg2_beta) in expected.items():
+            weighted = policy == "aggregate_pval_weighted_mean_when_metadata_match"
+            processed = process_methylation_upload(
+                BytesIO(csv_payload if weighted else without_pval.encode("utf-8")),
+                source_name="reducers.csv",
+                duplicate_policy=policy,  # type: ignore[arg-type]
+            )
+
+            self.assertEqual(processed.normalized_df["cpg_id"].tolist(), ["cg000002", "cg000001", "cg000003"])
+            self.assertEqual(processed.normalized_df["beta"].round(6).tolist(), [round(cg2_beta, 6), round(cg1_beta, 6), 0.4])
+            self.assertEqual(processed.report.aggregated_duplicate_cpg_id_groups, 2)
+            assert processed.aggregation_audit_df is not None
+            audit_df = processed.aggregation_audit_df
+            self.assertEqual(audit_df["cpg_id"].tolist(), ["cg000002", "cg000001"])
+            self.assertEqual(audit_df["source_row_count"].tolist(), [2, 3])
+            self.assertEqual(audit_df["beta_mean"].round(6).tolist(), [0.6, 0.4])
+            self.assertEqual(audit_df["beta_aggregated"].round(6).tolist(), [round(cg2_beta, 6), round(cg1_beta, 6)])
+            self.assertEqual(set(audit_df["aggregation_rule"]), {policy})
+            if weighted:
+                self.assertEqual(audit_df["pval"].tolist(), [0.5, 0.0])
+
+        with self.assertRaisesRegex(IngestError, "optional metadata values conflict"):
+            process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="reducers.csv",
+                duplicate_policy="aggregate_median_when_metadata_match",
+            )
+
+    def test_pval_weighted_aggregation_carries_text_pvals_with_their_dtype(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,pval\n"
+            "cg000001,0.2,<0.01\n"
+            "cg000001,0.4,0.5\n"
+            "cg000002,0.6,<0.01\n"
+            "cg000002,0.8,n/a\n"
+            "cg000003,0.3,0.1\n"
+        ).encode("utf-8")
+        option_sets = {
+            "default": {},
+            "compact_keys": {"compact_keys": True},
+            "chunked": {"chunk_rows": 1},
+            "spilled": {"spill_partitions": 2},
+            "pyarrow": {"csv_engine": "pyarrow"},
+        }
+
+        for label, options in option_sets.items():
+            if label == "pyarrow" and importlib.util.find_spec("pyarrow") is None:
+                continue
+            with self.subTest(options=label):
+                processed = process_methylation_upload(
+                    BytesIO(csv_payload),
+                    source_name="text_pval.csv",
+                    duplicate_policy="aggregate_pval_weighted_mean_when_metadata_match",
+                    **options,  # type: ignore[arg-type]
+                )
+
+                output = processed.normalized_df.set_index("cpg_id")
+                self.assertAlmostEqual(output.loc["cg000001", "beta"], (0.2 + 0.4 * 0.5) / 1.5)
+                self.assertEqual(output["pval"].tolist(), ["0.5", "<0.01", "0.1"])
+                self.assertTrue(pd.api.types.is_string_dtype(output["pval"]))
+                assert processed.aggregation_audit_df is not None
+                self.assertEqual(processed.aggregation_audit_df["pval"].tolist(), ["0.5", "<0.01"])
+
     def test_aggregate_policy_fails_on_metadata_conflicts(self) -> None:
         csv_payload = (
             "cpg_id,beta,chrom\n"
@@ -246,6 +398,87 @@ class TestIngest(unittest.TestCase):
         self.assertTrue(processed.report.recovered_from_extension_mismatch)
         self.assertIn("recovered_from_mislabeled_extension", processed.report.parse_warnings)
 
+    def test_read_table_bytes_parses_payload_once_with_c_engine(self) -> None:
+        payloads = {
+            "sample.csv": "cpg_id,beta\ncg000001,0.2\n",
+            "mislabeled.csv": "cpg_id\tbeta\ncg000001\t0.2\n",
+            "sample.txt": "cpg_id\tbeta\ncg000001\t0.2\n",
+        }
+
+        for filename, payload in payloads.items():
+            with mock.patch("cpg_methylation_mvp.core.io.pd.read_csv", wraps=pd.read_csv) as read_csv:
+                result = read_table_bytes(payload.encode("utf-8"), filename=filename, engine="c")
+
+            self.assertEqual(read_csv.call_count, 1, filename)
+            self.assertNotEqual(read_csv.call_args.kwargs.get("engine"), "python", filename)
+            self.assertEqual(list(result.dataframe.columns), ["cpg_id", "beta"], filename)
+
+    def test_read_table_bytes_projects_canonical_columns_with_explicit_dtypes(self) -> None:
+        sample_columns = ",".join(f"S{index}" for index in range(50))
+        sample_values = ",".join("0.5" for _ in range(50))
+        payload = (
+            f"annotation,Probe_ID,{sample_columns},Beta,Position\n"
+            f"x,cg000001,{sample_values},0.25,100\n"
+            f"y,cg000002,{sample_values},0.75,\n"
+        ).encode("utf-8")
+
+        result = read_table_bytes(payload, filename="wide.csv", project_canonical_columns=True)
+
+        self.assertEqual(list(result.dataframe.columns), ["Probe_ID", "Beta", "Position"])
+        self.assertEqual(str(result.dataframe["Probe_ID"].dtype), "string")
+        self.assertEqual(str(result.dataframe["Beta"].dtype), "float64")
+        self.assertEqual(str(result.dataframe["Position"].dtype), "float64")
+
+    def test_projection_falls_back_when_values_do_not_fit_dtypes(self) -> None:
+        payload = "cpg_id,beta,pos,extra\ncg000001,abc,1.5,x\n".encode("utf-8")
+
+        result = read_table_bytes(payload, filename="untyped.csv", project_canonical_columns=True)
+
+        self.assertEqual(list(result.dataframe.columns), ["cpg_id", "beta", "pos", "extra"])
+        self.assertEqual(result.dataframe.iloc[0]["beta"], "abc")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow_engine_matches_c_engine_output(self) -> None:
+        csv_payload = (
+            "\ufeffProbe_ID,Beta,chr,pos,annotation\n"
+            "cg000001,0.2,chr1,100,a\n"
+            "cg000002,,chr2,,b\n"
+            "cg000001,0.7,chr1,100,c\n"
+        ).encode("utf-8")
+
+        c_result = process_methylation_upload(BytesIO(csv_payload), source_name="engine.csv", csv_engine="c")
+        arrow_result = process_methylation_upload(BytesIO(csv_payload), source_name="engine.csv", csv_engine="pyarrow")
+
+        pd.testing.assert_frame_equal(
+            arrow_result.normalized_df.drop(columns="uploaded_at"),
+            c_result.normalized_df.drop(columns="uploaded_at"),
+        )
+        self.assertEqual(arrow_result.report.parse_warnings, ("removed_utf8_bom",))
+        self.assertEqual(arrow_result.report.dropped_rows_by_reason, c_result.report.dropped_rows_by_reason)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow_engine_keeps_validation_and_parse_errors(self) -> None:
+        with mock.patch.dict(os.environ, {CSV_ENGINE_ENV_VAR: "pyarrow"}):
+            with self.assertRaises(IngestError) as beta_context:
+                load_methylation_file(BytesIO(b"cpg_id,beta\ncg000001,abc\n"), source_name="bad_beta.csv")
+            with self.assertRaises(IngestError) as quote_context:
+                process_methylation_upload(BytesIO(b'cpg_id,beta\n"cg000001,0.2\n'), source_name="bad_quotes.csv")
+
+        self.assertIn("non-numeric beta", str(beta_context.exception))
+        self.assertIn("malformed quotes", str(quote_context.exception).lower())
+
+    def test_csv_engine_selection_and_missing_backend_fallback(self) -> None:
+        with mock.patch.dict(os.environ, {CSV_ENGINE_ENV_VAR: "PyArrow"}):
+            self.assertEqual(resolve_csv_engine(), "pyarrow")
+        with self.assertRaises(ValueError):
+            resolve_csv_engine("polars")
+
+        with mock.patch("cpg_methylation_mvp.core.io.importlib.util.find_spec", return_value=None):
+            result = read_table_bytes(b"cpg_id,beta\ncg000001,0.2\n", filename="sample.csv", engine="pyarrow")
+
+        self.assertEqual(result.csv_engine, "c")
+        self.assertIn("pyarrow_engine_unavailable_used_c_engine", result.parse_warnings)
+
     def test_utf8_bom_is_removed_and_reported(self) -> None:
         bom_payload = b"\xef\xbb\xbfcpg_id,beta\ncg000001,0.2\n"
 
@@ -266,6 +499,27 @@ class TestIngest(unittest.TestCase):
 
         self.assertIn("single delimiter", str(context.exception).lower())
 
+    def test_mixed_delimiters_after_sampled_lines_are_rejected_with_line_numbers(self) -> None:
+        rows = "".join(f"cg{index:06d},0.{index % 10}\n" for index in range(20))
+        mixed_payload = ("cpg_id,beta\n" + rows + "cg999998\t0.3\n" + rows + "cg999999\t0.4\n").encode("utf-8")
+
+        with self.assertRaises(IngestError) as context:
+            process_methylation_upload(BytesIO(mixed_payload), source_name="late_mixed.csv")
+
+        self.assertIn("on 2 line(s) (line 22, 43)", str(context.exception))
+        self.assertIn("single delimiter", str(context.exception).lower())
+
+    def test_delimiter_structure_scan_counts_unquoted_delimiters_per_record(self) -> None:
+        payload = b'\xef\xbb\xbfcpg_id,beta,note\r\ncg1,0.1,"tab\there, and\nnewline"\r\n\r\ncg2\t0.2\tx\r\ncg3,0.3,ok'
+
+        scan = scan_delimiter_structure(payload, ",", start=3)
+
+        assert scan is not None
+        self.assertEqual(scan.expected_field_count, 3)
+        self.assertEqual(scan.record_count, 4)
+        self.assertEqual(scan.inconsistent_line_numbers.tolist(), [5])
+        self.assertIsNone(scan_delimiter_structure(b'cpg_id,beta\ncg"1,0.1\n', ","))
+
     def test_mixed_delimiter_warning_remains_nonfatal_for_quoted_text(self) -> None:
         mixed_payload = (
             'cpg_id,beta,note\n'
@@ -294,6 +548,519 @@ class TestIngest(unittest.TestCase):
 
         self.assertIn("25 MB limit", str(context.exception))
 
+    def test_compressed_uploads_are_decompressed_and_hashed_as_uploaded(self) -> None:
+        tsv_payload = "cpg_id\tbeta\ncg000001\t0.2\ncg000002\t0.8\n".encode("utf-8")
+        plain = process_methylation_upload(BytesIO(tsv_payload), source_name="sample.tsv")
+        compressors = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+        for suffix, compress in compressors.items():
+            compressed_payload = compress(tsv_payload)
+            for chunk_rows in (None, 1):
+                processed = process_methylation_upload(
+                    BytesIO(compressed_payload),
+                    source_name=f"sample.tsv{suffix}",
+                    chunk_rows=chunk_rows,
+                )
+
+                pd.testing.assert_series_equal(processed.normalized_df["beta"], plain.normalized_df["beta"])
+                self.assertEqual(processed.report.parse_strategy, "extension_delimiter")
+                self.assertEqual(processed.report.input_sha256, hashlib.sha256(compressed_payload).hexdigest())
+                self.assertEqual(processed.report.to_dict()["compression"], processed.report.compression)
+        self.assertEqual(processed.report.compression, "xz")
+        self.assertIsNone(plain.report.compression)
+
+    def test_decompressed_size_limit_is_enforced_separately(self) -> None:
+        payload = ("cpg_id,beta\n" + "cg000001,0.2\n" * 1000).encode("utf-8")
+        compressed_payload = gzip.compress(payload)
+
+        for chunk_rows in (None, 100):
+            with self.assertRaises(IngestError) as context:
+                process_methylation_upload(
+                    BytesIO(compressed_payload),
+                    source_name="bomb.csv.gz",
+                    max_upload_bytes=len(compressed_payload),
+                    max_decompressed_bytes=1024,
+                    chunk_rows=chunk_rows,
+                )
+            self.assertIn("decompressed upload exceeds", str(context.exception))
+
+        with self.assertRaisesRegex(DecompressionError, "decompressed upload exceeds"):
+            read_table_bytes(compressed_payload, filename="bomb.csv.gz", max_decompressed_bytes=1024)
+        result = read_table_bytes(compressed_payload, filename="bomb.csv.gz", max_decompressed_bytes=len(payload))
+        self.assertEqual(len(result.dataframe), 1000)
+
+    def test_corrupt_compressed_upload_raises_clear_error(self) -> None:
+        truncated_payload = gzip.compress(("cpg_id,beta\n" + "cg000001,0.2\n" * 100).encode("utf-8"))[:-12]
+
+        for chunk_rows in (None, 10):
+            with self.assertRaises(IngestError) as context:
+                process_methylation_upload(BytesIO(truncated_payload), source_name="broken.csv.gz", chunk_rows=chunk_rows)
+            self.assertIn("could not decompress", str(context.exception).lower())
+
+    def test_process_methylation_file_parses_memory_mapped_file(self) -> None:
+        payload = b"\xef\xbb\xbfProbe_ID,Beta,chr\ncg000001,0.2,chr1\ncg000002,,chr2\ncg000003,0.9,chr3\n"
+        uploaded = process_methylation_upload(BytesIO(payload), source_name="sample.csv")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plain_path = Path(tmp_dir) / "sample.csv"
+            plain_path.write_bytes(payload)
+            compressed_path = Path(tmp_dir) / "sample.csv.gz"
+            compressed_path.write_bytes(gzip.compress(payload))
+
+            with mock.patch("cpg_methylation_mvp.core.ingest.read_table_bytes", wraps=read_table_bytes) as read_table:
+                processed = process_methylation_file(plain_path)
+            compressed = process_methylation_file(str(compressed_path))
+
+        self.assertIsInstance(read_table.call_args.kwargs["raw_bytes"], mmap.mmap)
+        pd.testing.assert_frame_equal(
+            processed.normalized_df.drop(columns="uploaded_at"),
+            uploaded.normalized_df.drop(columns="uploaded_at"),
+        )
+        self.assertEqual(processed.report.input_sha256, hashlib.sha256(payload).hexdigest())
+        self.assertEqual(processed.report.parse_warnings, uploaded.report.parse_warnings)
+        self.assertEqual(processed.report.dropped_rows_by_reason, uploaded.report.dropped_rows_by_reason)
+        self.assertEqual(compressed.report.source_file, "sample.csv.gz")
+        self.assertEqual(compressed.report.retained_row_count, 2)
+
+    def test_process_methylation_file_reports_empty_and_malformed_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            empty_path = Path(tmp_dir) / "empty.csv"
+            empty_path.write_bytes(b"")
+            bad_quotes_path = Path(tmp_dir) / "bad_quotes.csv"
+            bad_quotes_path.write_bytes(b'cpg_id,beta\n"cg000001,0.2\n')
+
+            with self.assertRaises(IngestError) as empty_context:
+                process_methylation_file(empty_path)
+            with self.assertRaises(IngestError) as quote_context:
+                process_methylation_file(bad_quotes_path)
+
+        self.assertIn("empty", str(empty_context.exception).lower())
+        self.assertIn("malformed quotes", str(quote_context.exception).lower())
+
+    def test_parallel_byte_ranges_match_serial_ingestion(self) -> None:
+        rows = ["Probe_ID,Beta,chr,pos,note"]
+        for index in range(400):
+            note = ['', 'plain', '"quoted\nnewline"', '"comma, inside"', '"escaped ""quote"""'][index % 5]
+            beta = "" if index % 37 == 0 else f"{(index % 100) / 100:.2f}"
+            rows.append(f"cg{index % 150:06d},{beta},chr{index % 3 + 1},{index % 150},{note}")
+        payload = ("\n".join(rows) + "\n").encode("utf-8")
+
+        serial = process_methylation_upload(
+            BytesIO(payload), source_name="ranges.csv", duplicate_policy="aggregate_mean_when_metadata_match"
+        )
+        with mock.patch("cpg_methylation_mvp.core.io._MIN_PARALLEL_RANGE_BYTES", 512):
+            with mock.patch("cpg_methylation_mvp.core.io._parse_table", side_effect=AssertionError("serial parse")):
+                parallel = process_methylation_upload(
+                    BytesIO(payload),
+                    source_name="ranges.csv",
+                    duplicate_policy="aggregate_mean_when_metadata_match",
+                    parse_workers=4,
+                )
+
+        pd.testing.assert_frame_equal(
+            parallel.normalized_df.drop(columns="uploaded_at"),
+            serial.normalized_df.drop(columns="uploaded_at"),
+        )
+        assert serial.aggregation_audit_df is not None and parallel.aggregation_audit_df is not None
+        pd.testing.assert_frame_equal(
+            parallel.aggregation_audit_df.drop(columns="uploaded_at"),
+            serial.aggregation_audit_df.drop(columns="uploaded_at"),
+        )
+        self.assertEqual(parallel.report.dropped_rows_by_reason, serial.report.dropped_rows_by_reason)
+
+    def test_parallel_byte_ranges_fall_back_to_serial_errors_and_unsafe_quotes(self) -> None:
+        body = "".join(f"cg{index:06d},0.5\n" for index in range(200))
+        out_of_range_payload = ("cpg_id,beta\n" + body + "cg999999,1.5\n" + body).encode("utf-8")
+        literal_quote_payload = ('cpg_id,beta,note\ncg000000,0.1,say "hi"\n' + body.replace("\n", ",x\n")).encode("utf-8")
+
+        with mock.patch("cpg_methylation_mvp.core.io._MIN_PARALLEL_RANGE_BYTES", 512):
+            with self.assertRaises(IngestError) as context:
+                process_methylation_upload(BytesIO(out_of_range_payload), source_name="range.csv", parse_workers=4)
+            with mock.patch("cpg_methylation_mvp.core.io._parse_byte_range", side_effect=AssertionError("ranges")):
+                processed = process_methylation_upload(
+                    BytesIO(literal_quote_payload), source_name="literal.csv", parse_workers=4
+                )
+
+        self.assertIn("Found 1 beta value(s) outside [0, 1]", str(context.exception))
+        self.assertEqual(processed.report.retained_row_count, 201)
+
+    def test_parallel_byte_ranges_honor_configured_required_columns(self) -> None:
+        payload = ("cpg_id,beta\n" + "".join(f"cg{index:06d},0.5\n" for index in range(400))).encode("utf-8")
+        config = ValidationConfig(required_columns=("cpg_id", "beta", "chrom"))
+
+        with mock.patch("cpg_methylation_mvp.core.io._MIN_PARALLEL_RANGE_BYTES", 512):
+            for parse_workers in (1, 4):
+                with self.subTest(parse_workers=parse_workers):
+                    with self.assertRaisesRegex(IngestError, "Missing required column"):
+                        process_methylation_upload(
+                            BytesIO(payload),
+                            source_name="required.csv",
+                            validation_config=config,
+                            parse_workers=parse_workers,
+                        )
+
+    def test_chunked_streaming_matches_in_memory_processing(self) -> None:
+        csv_payload = (
+            "probe_id,Beta,chr,pos,extra\n"
+            "cg000001,0.2,chr1,100,a\n"
+            "   ,0.4,chr1,200,b\n"
+            "cg000002,,chr2,,c\n"
+            "cg000001,0.7,chr1,100,d\n"
+            "cg000003,0.9,chr3,300,e\n"
+        ).encode("utf-8")
+
+        in_memory = process_methylation_upload(BytesIO(csv_payload), source_name="stream.csv")
+        streamed = process_methylation_upload(BytesIO(csv_payload), source_name="stream.csv", chunk_rows=2)
+
+        pd.testing.assert_frame_equal(
+            streamed.normalized_df.drop(columns="uploaded_at"),
+            in_memory.normalized_df.drop(columns="uploaded_at"),
+        )
+        self.assertEqual(str(in_memory.normalized_df["pos"].dtype), "float64")
+        self.assertEqual(streamed.report.input_sha256, in_memory.report.input_sha256)
+        self.assertEqual(streamed.report.input_row_count, 5)
+        self.assertEqual(streamed.report.dropped_rows_by_reason, in_memory.report.dropped_rows_by_reason)
+        self.assertEqual(streamed.report.duplicate_cpg_id_groups, 1)
+        self.assertEqual(streamed.report.parse_strategy, "extension_delimiter")
+
+        mixed_payloads = {
+            "text_pos": "cpg_id,beta,chrom,pos,gene\ncg1,0.2,1,10,\ncg2,0.4,2,x,G2\ncg3,0.5,3,30,\n",
+            "whole_pos": "cpg_id,beta,chrom,pos,gene,pval\ncg1,0.2,chr1,10,,0.01\ncg2,0.4,chr2,20,G2,0.02\n",
+            "fractional_pos": "cpg_id,beta,pos,pval\ncg1,0.2,10,\ncg2,0.4,20.5,0.02\ncg2,0.6,20.5,x\n",
+        }
+        for name, payload in mixed_payloads.items():
+            expected = process_methylation_upload(BytesIO(payload.encode("utf-8")), source_name="mixed.csv")
+            for chunk_rows, spill_partitions in ((1, None), (2, None), (1, 2)):
+                with self.subTest(name=name, chunk_rows=chunk_rows, spill_partitions=spill_partitions):
+                    chunked = process_methylation_upload(
+                        BytesIO(payload.encode("utf-8")),
+                        source_name="mixed.csv",
+                        chunk_rows=chunk_rows,
+                        spill_partitions=spill_partitions,
+                    )
+                    pd.testing.assert_frame_equal(
+                        chunked.normalized_df.drop(columns="uploaded_at"),
+                        expected.normalized_df.drop(columns="uploaded_at"),
+                    )
+
+    def test_spilled_duplicate_resolution_matches_in_memory_processing(self) -> None:
+        rows = [
+            "cg000001,0.2,chr1,0.01",
+            "cg000002,0.3,chr2,0.02",
+            "probe_a,0.4,chr3,",
+            "cg000001,0.6,chr1,0.03",
+            "cg000003,,chr3,0.01",
+            "probe_a,0.5,chr3,0.04",
+            "cg000004,0.9,chr4,0.05",
+            "cg000001,0.7,,0.02",
+        ]
+        clean_payload = ("cpg_id,beta,chrom,pval\n" + "\n".join(rows) + "\n").encode("utf-8")
+        conflict_payload = clean_payload + b"cg000002,0.1,chr9,0.01\n"
+        policies = (
+            "preserve_rows_and_warn",
+            "reject_duplicates",
+            "aggregate_median_when_metadata_match",
+            "aggregate_pval_weighted_mean_when_metadata_match",
+        )
+
+        for payload in (clean_payload, conflict_payload):
+            for duplicate_policy in policies:
+                for compact_keys in (False, True):
+                    with self.subTest(payload=len(payload), policy=duplicate_policy, compact_keys=compact_keys):
+                        results = []
+                        for spill_partitions in (None, 3):
+                            try:
+                                results.append(
+                                    process_methylation_upload(
+                                        BytesIO(payload),
+                                        source_name="spill.csv",
+                                        duplicate_policy=duplicate_policy,  # type: ignore[arg-type]
+                                        chunk_rows=3,
+                                        compact_keys=compact_keys,
+                                        spill_partitions=spill_partitions,
+                                    )
+                                )
+                            except IngestError as exc:
+                                results.append(str(exc))
+                        in_memory, spilled = results
+                        if isinstance(in_memory, str):
+                            self.assertEqual(spilled, in_memory)
+                            continue
+                        assert not isinstance(spilled, str)
+                        pd.testing.assert_frame_equal(
+                            spilled.normalized_df.drop(columns="uploaded_at"),
+                            in_memory.normalized_df.drop(columns="uploaded_at"),
+                        )
+                        for field_name in (
+                            "retained_row_count",
+                            "duplicate_cpg_id_groups",
+                            "duplicate_cpg_id_extra_rows",
+                            "duplicate_metadata_conflict_groups",
+                            "aggregated_duplicate_cpg_id_groups",
+                            "aggregated_duplicate_input_rows",
+                        ):
+                            self.assertEqual(getattr(spilled.report, field_name), getattr(in_memory.report, field_name))
+                        if in_memory.aggregation_audit_df is not None:
+                            assert spilled.aggregation_audit_df is not None
+                            pd.testing.assert_frame_equal(
+                                spilled.aggregation_audit_df.drop(columns="uploaded_at"),
+                                in_memory.aggregation_audit_df.drop(columns="uploaded_at"),
+                            )
+
+    def test_chunked_streaming_tolerates_chunks_without_valid_rows(self) -> None:
+        csv_payload = (
+            "cpg_id,beta\n"
+            "   ,0.1\n"
+            "cg000001,\n"
+            "cg000002,0.3\n"
+        ).encode("utf-8")
+
+        processed = process_methylation_upload(BytesIO(csv_payload), source_name="sparse.csv", chunk_rows=2)
+
+        self.assertEqual(processed.report.retained_row_count, 1)
+        self.assertEqual(processed.report.dropped_row_count, 2)
+
+    def test_chunked_streaming_enforces_limit_and_validation(self) -> None:
+        with self.assertRaises(IngestError) as limit_context:
+            process_methylation_upload(
+                BytesIO(b"cpg_id,beta\ncg000001,0.2\n"),
+                source_name="tiny.csv",
+                max_upload_bytes=8,
+                chunk_rows=1,
+            )
+        with self.assertRaises(IngestError) as empty_context:
+            process_methylation_upload(BytesIO(b""), source_name="empty.csv", chunk_rows=10)
+        with self.assertRaises(IngestError) as range_context:
+            process_methylation_upload(
+                BytesIO(b"cpg_id,beta\ncg000001,0.2\ncg000002,1.5\n"),
+                source_name="range.csv",
+                chunk_rows=1,
+            )
+
+        self.assertIn("MB limit", str(limit_context.exception))
+        self.assertIn("uploaded file is empty", str(empty_context.exception).lower())
+        self.assertIn("outside [0, 1]", str(range_context.exception))
+
+    def test_collect_violations_lists_every_failing_row_with_cap(self) -> None:
+        csv_payload = (
+            "cpg_id,beta\n"
+            "cg000001,0.2\n"
+            "cg000002,1.5\n"
+            "cg000003,high\n"
+            ",0.4\n"
+            "cg000005,-0.1\n"
+            "cg000006,0.6\n"
+        ).encode("utf-8")
+
+        for chunk_rows in (None, 2):
+            processed = process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="violations.csv",
+                chunk_rows=chunk_rows,
+                collect_violations=True,
+                max_violations=2,
+            )
+            violations = processed.violations
+            assert violations is not None
+
+            self.assertEqual(processed.report.retained_row_count, 2)
+            self.assertEqual(
+                processed.report.dropped_rows_by_reason,
+                {
+                    "missing_cpg_id": 1,
+                    "missing_beta": 0,
+                    "missing_cpg_id_and_beta": 0,
+                    "non_numeric_beta": 1,
+                    "beta_out_of_range": 2,
+                },
+            )
+            self.assertEqual(violations.total_count, 3)
+            self.assertTrue(violations.truncated)
+            self.assertEqual(
+                violations.to_frame().to_dict("list"),
+                {"row_index": [1, 2], "rule_id": ["beta_out_of_range", "non_numeric_beta"], "value": ["1.5", "high"]},
+            )
+
+    def test_collect_violations_attaches_table_when_no_valid_rows_remain(self) -> None:
+        with self.assertRaises(IngestError) as context:
+            process_methylation_upload(
+                BytesIO(b"cpg_id,beta\ncg000001,2\ncg000002,bad\n"),
+                source_name="invalid.csv",
+                collect_violations=True,
+            )
+
+        violations = context.exception.violations
+        assert violations is not None
+        self.assertEqual(violations.counts_by_rule, {"non_numeric_beta": 1, "beta_out_of_range": 1})
+        self.assertEqual(violations.to_frame()["row_index"].tolist(), [0, 1])
+
+    def test_compact_keys_match_string_duplicate_handling(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,chrom,gene\n"
+            "cg00000001,0.2,chr1,GENE1\n"
+            "probe_x,0.4,chr2,\n"
+            "cg00000001,0.4,chr1,GENE1\n"
+            "probe_x,0.6,chr2,GENE2\n"
+            "rs10796216,0.9,chr3,GENE3\n"
+        ).encode("utf-8")
+
+        for policy in ("preserve_rows_and_warn", "aggregate_mean_when_metadata_match"):
+            baseline = process_methylation_upload(BytesIO(csv_payload), source_name="keys.csv", duplicate_policy=policy)
+            compact = process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="keys.csv",
+                duplicate_policy=policy,
+                compact_keys=True,
+            )
+
+            self.assertEqual(compact.report.duplicate_cpg_id_groups, baseline.report.duplicate_cpg_id_groups)
+            self.assertEqual(compact.report.retained_row_count, baseline.report.retained_row_count)
+            self.assertEqual(compact.normalized_df["cpg_id"].tolist(), baseline.normalized_df["cpg_id"].tolist())
+            self.assertEqual(compact.normalized_df["beta"].tolist(), baseline.normalized_df["beta"].tolist())
+            self.assertEqual(compact.normalized_df["cpg_key"].dtype, "uint64")
+            self.assertIsInstance(compact.normalized_df["chrom"].dtype, pd.CategoricalDtype)
+            self.assertEqual(
+                compact.normalized_df["cpg_key"].nunique(),
+                compact.normalized_df["cpg_id"].nunique(),
+            )
+            self.assertEqual(
+                duplicate_review_table(compact.normalized_df)["duplicate_group_row_count"].tolist(),
+                duplicate_review_table(baseline.normalized_df)["duplicate_group_row_count"].tolist(),
+            )
+
+    def test_compact_dtype_policy_reports_memory_footprint(self) -> None:
+        rows = "".join(f"cg{index:08d},0.{index % 10}5,chr1,{1000 + index},0.01\n" for index in range(200))
+        csv_payload = f"cpg_id,beta,chrom,pos,pval\n{rows}".encode("utf-8")
+
+        default = process_methylation_upload(BytesIO(csv_payload), source_name="dtypes.csv")
+        compact = process_methylation_upload(
+            BytesIO(csv_payload),
+            source_name="dtypes.csv",
+            dtype_policy=COMPACT_DTYPE_POLICY,
+        )
+
+        self.assertEqual(
+            default.report.memory_bytes_before_compaction,
+            default.report.memory_bytes_after_compaction,
+        )
+        self.assertEqual(compact.report.memory_bytes_before_compaction, default.report.memory_bytes_after_compaction)
+        assert compact.report.memory_bytes_after_compaction is not None
+        assert compact.report.memory_bytes_before_compaction is not None
+        self.assertLess(compact.report.memory_bytes_after_compaction, compact.report.memory_bytes_before_compaction)
+        self.assertEqual(compact.normalized_df["beta"].dtype, "float32")
+        self.assertEqual(compact.normalized_df["pos"].dtype, "uint32")
+        self.assertIsInstance(compact.normalized_df["uploaded_at"].dtype, pd.CategoricalDtype)
+        self.assertEqual(compact.normalized_df["pos"].tolist(), default.normalized_df["pos"].tolist())
+
+    def test_post_parse_peak_memory_stays_within_one_frame_copy(self) -> None:
+        row_count = 50_000
+        distinct_count = row_count - 50
+        rows = "".join(
+            f"cg{index % distinct_count:08d},{(index % 97) / 97:.4f},{index % distinct_count % 22 + 1},"
+            f"{1000 + index % distinct_count},0.01\n"
+            for index in range(row_count)
+        )
+        csv_payload = f"cpg_id,beta,chrom,pos,pval\n{rows}".encode("utf-8")
+        parsed_numeric_bytes: list[int] = []
+
+        def read_then_reset_peak(*args: object, **kwargs: object) -> object:
+            parse_result = read_table_bytes(*args, **kwargs)
+            parsed_numeric_bytes.append(
+                sum(parse_result.dataframe[column].to_numpy().nbytes for column in ("beta", "chrom", "pos", "pval"))
+            )
+            tracemalloc.reset_peak()
+            return parse_result
+
+        for policy in ("preserve_rows_and_warn", "aggregate_mean_when_metadata_match"):
+            parsed_numeric_bytes.clear()
+            tracemalloc.start()
+            try:
+                with mock.patch("cpg_methylation_mvp.core.ingest.read_table_bytes", side_effect=read_then_reset_peak):
+                    process_methylation_upload(
+                        BytesIO(csv_payload),
+                        source_name="peak.csv",
+                        duplicate_policy=policy,
+                        csv_engine="c",
+                    )
+                _, peak_bytes = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            # The parsed frame stays alive; downstream stages may add one materialized copy plus scratch space.
+            self.assertLess(peak_bytes, 3 * parsed_numeric_bytes[0], policy)
+
+    def test_validation_rules_flow_into_processing_report(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,chrom,pos,pval\n"
+            "cg000001,0.2,chr1,100,0.01\n"
+            "cg000002,0.3,chr1,-4,0.01\n"
+            "cg000003,0.4,chrQ,300,0.01\n"
+            ",0.5,chr1,-1,0.01\n"
+            "cg000005,0.6,chr2,500,1.5\n"
+        ).encode("utf-8")
+        config = ValidationConfig(rules=RECOMMENDED_COLUMN_RULES)
+
+        for chunk_rows in (None, 2):
+            processed = process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="rules.csv",
+                chunk_rows=chunk_rows,
+                validation_config=config,
+            )
+
+            self.assertEqual(processed.normalized_df["cpg_id"].tolist(), ["cg000001", "cg000003"])
+            self.assertEqual(processed.report.dropped_rows_by_reason["missing_cpg_id"], 1)
+            self.assertEqual(processed.report.dropped_rows_by_reason["negative_pos"], 1)
+            self.assertEqual(processed.report.dropped_rows_by_reason["pval_out_of_range"], 1)
+            self.assertEqual(processed.report.dropped_row_count, 3)
+            self.assertEqual(processed.report.warned_rows_by_rule, {"unknown_chrom": 1})
+            self.assertEqual(processed.report.to_flat_dict()["warned_rows_unknown_chrom"], 1)
+
+        with self.assertRaises(IngestError) as context:
+            process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="rules.csv",
+                validation_config=ValidationConfig(rules=(ColumnRule("bad_pos", "pos", severity="reject", min_value=0),)),
+            )
+        self.assertIn("bad_pos", str(context.exception))
+
+    def test_detection_pval_filter_drops_rows_before_duplicate_handling(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,pval\n"
+            "cg000001,0.2,0.001\n"
+            "cg000001,0.4,0.2\n"
+            "cg000002,0.5,\n"
+            "cg000003,,0.5\n"
+            "cg000004,0.6, 0.05 \n"
+        ).encode("utf-8")
+
+        for chunk_rows in (None, 2):
+            processed = process_methylation_upload(
+                BytesIO(csv_payload),
+                source_name="detection.csv",
+                chunk_rows=chunk_rows,
+                duplicate_policy="reject_duplicates",
+                detection_pval_threshold=0.01,
+            )
+
+            self.assertEqual(processed.normalized_df["cpg_id"].tolist(), ["cg000001", "cg000002"])
+            self.assertEqual(processed.report.dropped_rows_by_reason["missing_beta"], 1)
+            self.assertEqual(processed.report.dropped_rows_by_reason["detection_pval_above_threshold"], 2)
+            self.assertEqual(processed.report.pre_duplicate_policy_row_count, 2)
+            self.assertEqual(processed.report.duplicate_cpg_id_groups, 0)
+
+        unfiltered = process_methylation_upload(BytesIO(csv_payload), source_name="detection.csv")
+        self.assertNotIn("detection_pval_above_threshold", unfiltered.report.dropped_rows_by_reason)
+
+        with self.assertRaisesRegex(IngestError, "detection p-value above the threshold"):
+            process_methylation_upload(
+                BytesIO(b"cpg_id,beta,pval\ncg000001,0.2,0.2\n"),
+                source_name="detection.csv",
+                detection_pval_threshold=0.01,
+            )
+        with self.assertRaises(ValueError):
+            process_methylation_upload(BytesIO(csv_payload), source_name="detection.csv", detection_pval_threshold=2)
+
     def test_processing_report_exposes_row_accounting_and_provenance(self) -> None:
         csv_payload = (
             "cpg_id,beta\n"
@@ -324,6 +1091,128 @@ class TestIngest(unittest.TestCase):
         self.assertTrue((processed.normalized_df["source_file"] == "sample_upload.csv").all())
         self.assertTrue(processed.normalized_df["uploaded_at"].notna().all())
 
+    def test_stage_timings_are_reported_only_when_requested(self) -> None:
+        csv_payload = (
+            "cpg_id,beta\n"
+            "cg000001,0.2\n"
+            "cg000001,0.7\n"
+            "cg000002,\n"
+            "cg000003,0.4\n"
+        ).encode("utf-8")
+        stages = [
+            "read_table",
+            "normalize_upload",
+            "validate_upload",
+            "row_filter",
+            "duplicate_groups",
+            "duplicate_policy",
+            "finalize",
+        ]
+
+        default = process_methylation_upload(BytesIO(csv_payload), source_name="timed.csv")
+        self.assertIsNone(default.report.timings)
+        self.assertNotIn("timings", default.report.to_dict())
+        self.assertFalse(any(key.startswith("timing_") for key in default.report.to_flat_dict()))
+
+        for chunk_rows in (None, 2):
+            with self.subTest(chunk_rows=chunk_rows):
+                timed = process_methylation_upload(
+                    BytesIO(csv_payload),
+                    source_name="timed.csv",
+                    duplicate_policy="aggregate_mean_when_metadata_match",
+                    chunk_rows=chunk_rows,
+                    collect_timings=True,
+                )
+                timings = timed.report.timings
+                assert timings is not None
+                self.assertEqual(list(timings), stages)
+                self.assertEqual(timings["read_table"]["rows_out"], 4)
+                self.assertEqual(timings["row_filter"]["rows_out"], 3)
+                self.assertEqual(timings["duplicate_policy"]["rows_out"], 2)
+                self.assertTrue(all(metrics["wall_seconds"] >= 0 for metrics in timings.values()))
+                self.assertEqual(timed.report.to_flat_dict()["timing_finalize_rows_out"], 2)
+                self.assertFalse(tracemalloc.is_tracing())
+                self.assertEqual(timed.report.retained_row_count, 2)
+
+    def test_concurrent_timed_ingests_trace_memory_one_at_a_time(self) -> None:
+        csv_payload = "cpg_id,beta\ncg000001,0.2\ncg000001,0.7\ncg000003,0.4\n".encode("utf-8")
+        both_reading = threading.Barrier(2, timeout=10)
+
+        def read_together(*args: object, **kwargs: object) -> object:
+            both_reading.wait()
+            return read_table_bytes(*args, **kwargs)
+
+        def timed_ingest(_: int) -> dict[str, dict[str, float]]:
+            processed = process_methylation_upload(BytesIO(csv_payload), source_name="timed.csv", collect_timings=True)
+            assert processed.report.timings is not None
+            return processed.report.timings
+
+        with mock.patch("cpg_methylation_mvp.core.ingest.read_table_bytes", side_effect=read_together):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                runs = list(executor.map(timed_ingest, range(2)))
+
+        traced = [all("peak_allocated_bytes" in metrics for metrics in timings.values()) for timings in runs]
+        untraced = [all("peak_allocated_bytes" not in metrics for metrics in timings.values()) for timings in runs]
+        self.assertEqual(sorted(traced), [False, True])
+        self.assertEqual(sorted(untraced), [False, True])
+        self.assertFalse(tracemalloc.is_tracing())
+
+        tracemalloc.start()
+        try:
+            caller_traced = process_methylation_upload(BytesIO(csv_payload), source_name="timed.csv", collect_timings=True)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        assert caller_traced.report.timings is not None
+        self.assertFalse(any("peak_allocated_bytes" in metrics for metrics in caller_traced.report.timings.values()))
+
+    def test_prepared_upload_applies_each_duplicate_policy_like_full_processing(self) -> None:
+        csv_payload = (
+            "cpg_id,beta,chrom,pval\n"
+            "cg000001,0.2,chr1,0.01\n"
+            "cg000001,0.6,chr1,0.01\n"
+            "cg000002,,chr2,0.01\n"
+            "cg000003,0.4,chr3,0.03\n"
+        ).encode("utf-8")
+        policies = (
+            "preserve_rows_and_warn",
+            "aggregate_mean_when_metadata_match",
+            "aggregate_median_when_metadata_match",
+            "aggregate_pval_weighted_mean_when_metadata_match",
+        )
+
+        for chunk_rows, compact_keys in ((None, False), (2, False), (None, True)):
+            with self.subTest(chunk_rows=chunk_rows, compact_keys=compact_keys):
+                prepared = prepare_methylation_upload(
+                    BytesIO(csv_payload),
+                    source_name="prepared.csv",
+                    chunk_rows=chunk_rows,
+                    compact_keys=compact_keys,
+                )
+                self.assertEqual(len(prepared.retained_df), 3)
+                for policy in policies:
+                    applied = apply_duplicate_policy(prepared, policy)
+                    processed = process_methylation_upload(
+                        BytesIO(csv_payload),
+                        source_name="prepared.csv",
+                        duplicate_policy=policy,
+                        chunk_rows=chunk_rows,
+                        compact_keys=compact_keys,
+                    )
+                    pd.testing.assert_frame_equal(
+                        applied.normalized_df.drop(columns="uploaded_at"),
+                        processed.normalized_df.drop(columns="uploaded_at"),
+                    )
+                    excluded = {"run_id", "uploaded_at"}
+                    self.assertEqual(
+                        {key: value for key, value in applied.report.to_dict().items() if key not in excluded},
+                        {key: value for key, value in processed.report.to_dict().items() if key not in excluded},
+                    )
+                    self.assertEqual(applied.aggregation_audit_df is None, processed.aggregation_audit_df is None)
+
+                with self.assertRaisesRegex(IngestError, "duplicated cpg_id"):
+                    apply_duplicate_policy(prepared, "reject_duplicates")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from cpg_methylation_mvp.core.keys import (
+    CPG_KEY_COLUMN,
+    MISSING_CPG_KEY,
+    UNKNOWN_CPG_KEY,
+    CpgKeyCodec,
+    categorize_metadata_columns,
+    with_cpg_key_column,
+)
+
+
+def test_codec_round_trips_canonical_and_fallback_identifiers() -> None:
+    identifiers = ["cg00000029", "ch.X.97737721F", "ch.10.123R", "rs10796216", "custom_probe", None, "cg0000029"]
+    codec = CpgKeyCodec()
+
+    keys = codec.encode(identifiers)
+
+    assert keys.dtype == np.uint64
+    assert keys[5] == MISSING_CPG_KEY
+    assert len(set(keys.tolist())) == len(identifiers)
+    assert codec.fallback_labels == ("custom_probe", "cg0000029")
+    assert codec.decode(keys).tolist() == [*identifiers[:5], pd.NA, identifiers[6]]
+    assert CpgKeyCodec().encode(["cg00000029"])[0] == keys[0]
+
+
+def test_codec_lookup_does_not_extend_fallback_dictionary() -> None:
+    frame = with_cpg_key_column(pd.DataFrame({"cpg_id": ["cg00000001", "probe_a"], "beta": [0.1, 0.2]}))
+
+    codec = CpgKeyCodec.from_frame(frame)
+    lookup = codec.encode(["probe_a", "probe_b", "cg00000001"], extend=False)
+
+    assert list(frame.columns) == ["cpg_id", CPG_KEY_COLUMN, "beta"]
+    assert lookup.tolist() == [frame[CPG_KEY_COLUMN].iloc[1], UNKNOWN_CPG_KEY, frame[CPG_KEY_COLUMN].iloc[0]]
+    assert codec.fallback_labels == ("probe_a",)
+
+
+def test_categorize_metadata_columns_keeps_values() -> None:
+    frame = pd.DataFrame({"cpg_id": ["cg00000001", "cg00000002"], "chrom": ["chr1", "chr1"], "gene": ["A", None]})
+
+    categorized = categorize_metadata_columns(frame)
+
+    assert isinstance(categorized["chrom"].dtype, pd.CategoricalDtype)
+    assert isinstance(categorized["gene"].dtype, pd.CategoricalDtype)
+    assert categorized["chrom"].tolist() == ["chr1", "chr1"]
+    assert categorized["cpg_id"].dtype == frame["cpg_id"].dtype
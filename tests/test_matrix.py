@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import io
+import re
+
+import numpy as np
+import pytest
+
+from cpg_methylation_mvp.core import IngestError, process_methylation_matrix_upload, process_methylation_upload
+
+MATRIX_PAYLOAD = (
+    "cpg_id,chrom,S1,S2,S3\n"
+    "cg00000001,chr1,0.1,0.2,\n"
+    "cg00000002,chr1,0.5,,\n"
+    "cg00000001,,0.3,0.4,\n"
+    ",chr2,0.9,0.1,\n"
+    "cg00000003,chr3,,,\n"
+    "cg00000004,chr3,0.7,0.8,0.9\n"
+)
+
+
+def _single_sample_payload(sample_id: str) -> bytes:
+    lines = MATRIX_PAYLOAD.splitlines()
+    header = lines[0].split(",")
+    keep = [header.index("cpg_id"), header.index("chrom"), header.index(sample_id)]
+    rows = [",".join(line.split(",")[index] for index in keep) for line in lines]
+    rows[0] = "cpg_id,chrom,beta"
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+@pytest.mark.parametrize("duplicate_policy", ["preserve_rows_and_warn", "aggregate_mean_when_metadata_match"])
+def test_matrix_reports_match_single_sample_ingest(duplicate_policy: str) -> None:
+    matrix = process_methylation_matrix_upload(
+        io.BytesIO(MATRIX_PAYLOAD.encode("utf-8")),
+        source_name="matrix.csv",
+        duplicate_policy=duplicate_policy,  # type: ignore[arg-type]
+    )
+
+    assert matrix.beta.dtype == np.float32
+    assert matrix.beta.flags.f_contiguous
+    assert matrix.sample_ids == ("S1", "S2", "S3")
+    assert len({report.run_id for report in matrix.reports.values()}) == 1
+    compared_fields = (
+        "input_row_count",
+        "retained_row_count",
+        "dropped_row_count",
+        "dropped_rows_by_reason",
+        "duplicate_cpg_id_groups",
+        "duplicate_cpg_id_extra_rows",
+        "aggregation_applied",
+        "pre_duplicate_policy_row_count",
+        "aggregated_duplicate_cpg_id_groups",
+        "aggregated_duplicate_input_rows",
+        "aggregation_output_row_count",
+    )
+    for sample_id in ("S1", "S2"):
+        single = process_methylation_upload(
+            io.BytesIO(_single_sample_payload(sample_id)),
+            source_name=f"{sample_id}.csv",
+            duplicate_policy=duplicate_policy,  # type: ignore[arg-type]
+        )
+        sample_report = matrix.reports[sample_id]
+        for field_name in compared_fields:
+            assert getattr(sample_report, field_name) == getattr(single.report, field_name), field_name
+        sample_df = matrix.sample_frame(sample_id)
+        assert sample_df["cpg_id"].tolist() == single.normalized_df["cpg_id"].tolist()
+        np.testing.assert_allclose(sample_df["beta"], single.normalized_df["beta"], rtol=1e-6)
+
+
+def test_matrix_drops_unusable_probe_rows_and_keeps_per_sample_gaps() -> None:
+    matrix = process_methylation_matrix_upload(
+        io.BytesIO(MATRIX_PAYLOAD.encode("utf-8")),
+        source_name="matrix.csv",
+        duplicate_policy="aggregate_mean_when_metadata_match",
+    )
+
+    wide = matrix.to_frame()
+    assert wide.index.tolist() == ["cg00000001", "cg00000002", "cg00000004"]
+    assert wide.loc["cg00000001", "S1"] == pytest.approx(0.2)
+    assert np.isnan(wide.loc["cg00000002", "S2"])
+    assert matrix.probe_metadata is not None
+    assert matrix.probe_metadata["chrom"].tolist() == ["chr1", "chr1", "chr3"]
+    assert matrix.reports["S3"].retained_row_count == 1
+    assert matrix.reports["S3"].dropped_rows_by_reason == {
+        "missing_cpg_id": 0,
+        "missing_beta": 4,
+        "missing_cpg_id_and_beta": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    ("payload", "duplicate_policy", "message"),
+    [
+        ("cpg_id,S1,S2\ncg00000001,abc,0.2\n", "preserve_rows_and_warn", "non-numeric beta value(s) in sample(s) S1"),
+        ("cpg_id,S1,S2\ncg00000001,0.2,1.5\n", "preserve_rows_and_warn", "outside [0, 1] in sample(s) S2"),
+        ("cpg_id,S1\ncg00000001,0.2\ncg00000001,0.3\n", "reject_duplicates", "duplicated cpg_id"),
+        ("cpg_id,chrom\ncg00000001,chr1\n", "preserve_rows_and_warn", "No sample columns found"),
+    ],
+)
+def test_matrix_rejects_invalid_uploads(payload: str, duplicate_policy: str, message: str) -> None:
+    with pytest.raises(IngestError, match=re.escape(message)):
+        process_methylation_matrix_upload(
+            io.BytesIO(payload.encode("utf-8")),
+            source_name="matrix.csv",
+            duplicate_policy=duplicate_policy,  # type: ignore[arg-type]
+        )
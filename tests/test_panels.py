@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pandas as pd
 
+from cpg_methylation_mvp.core.keys import with_cpg_key_column
 from cpg_methylation_mvp.core.panels import (
     evaluate_panel,
     load_panel,
@@ -57,6 +58,21 @@ def test_evaluate_panel_returns_expected_structure() -> None:
     ]
 
 
+def test_evaluate_panel_matches_on_integer_keys_when_present() -> None:
+    normalized_df = pd.DataFrame(
+        {
+            "cpg_id": ["cg00000108", "cg99999999", "cg00000029"],
+            "beta": [0.14, 0.55, 0.82],
+        }
+    )
+    panel_df = load_panel(Path("data/panels/core_demo_panel.csv"))
+
+    string_result = evaluate_panel(normalized_df=normalized_df, panel_df=panel_df)
+    keyed_result = evaluate_panel(normalized_df=with_cpg_key_column(normalized_df), panel_df=panel_df)
+
+    assert keyed_result == string_result
+
+
 def test_panel_report_table_flattens_observed_and_missing_rows() -> None:
     result = {
         "panel_id": "core_demo",
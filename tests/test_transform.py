@@ -1,6 +1,12 @@
 import pandas as pd
 
-from cpg_methylation_mvp.core.transform import canonicalize_columns, select_canonical_columns
+from cpg_methylation_mvp.core.transform import (
+    COMPACT_DTYPE_POLICY,
+    apply_dtype_policy,
+    canonical_source_columns,
+    canonicalize_columns,
+    select_canonical_columns,
+)
 
 
 def test_canonicalize_columns_aliases() -> None:
@@ -21,3 +27,34 @@ def test_canonicalize_columns_preserves_alias_precedence_with_multiple_aliases()
 
     assert list(selected.columns) == ["beta"]
     assert selected.iloc[0]["beta"] == 0.2
+
+
+def test_canonical_source_columns_resolves_aliases_from_header_names() -> None:
+    header = ["annotation", "Probe_ID", "S1", "beta_value", "Beta", "CHR"]
+
+    assert canonical_source_columns(header) == {
+        "cpg_id": "Probe_ID",
+        "beta": "beta_value",
+        "chrom": "CHR",
+    }
+
+
+def test_apply_dtype_policy_narrows_only_lossless_columns() -> None:
+    df = pd.DataFrame(
+        {
+            "cpg_id": ["cg1", "cg2"],
+            "beta": [0.25, 0.5],
+            "pos": [100.0, None],
+            "pval": ["0.01", "n/a"],
+            "source_file": ["a.csv", "a.csv"],
+        }
+    )
+
+    compacted = apply_dtype_policy(df, COMPACT_DTYPE_POLICY)
+
+    assert compacted["beta"].dtype == "float32"
+    assert compacted["pos"].dtype == "UInt32"
+    assert compacted["pos"].tolist() == [100, pd.NA]
+    assert compacted["pval"].tolist() == ["0.01", "n/a"]
+    assert isinstance(compacted["source_file"].dtype, pd.CategoricalDtype)
+    assert apply_dtype_policy(df) is df
@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from cpg_methylation_mvp.core.validate import (
+    RECOMMENDED_COLUMN_RULES,
+    ColumnRule,
+    ValidationConfig,
+    ValidationError,
+    ensure_beta_in_range,
+    ensure_beta_numeric,
+    run_validation_kernel,
+    validate_upload_with_kernel,
+)
+
+
+def test_validation_kernel_computes_typed_columns_and_masks_together() -> None:
+    df = pd.DataFrame(
+        {
+            "cpg_id": [" cg000001 ", "", None, "cg000004", "cg000005"],
+            "beta": ["0.2", " ", "abc", "1.5", None],
+        }
+    )
+
+    kernel = run_validation_kernel(df)
+
+    assert kernel.cpg_id.tolist()[0] == "cg000001"
+    assert kernel.beta.tolist()[0] == 0.2
+    assert kernel.missing_cpg_id.tolist() == [False, True, True, False, False]
+    assert kernel.missing_beta.tolist() == [False, True, True, False, True]
+    assert kernel.non_numeric_beta.tolist() == [False, False, True, False, False]
+    assert kernel.out_of_range_beta.tolist() == [False, False, False, True, False]
+    assert kernel.valid_rows.tolist() == [True, False, False, True, False]
+    with pytest.raises(ValidationError, match="1 non-numeric"):
+        ensure_beta_numeric(df, kernel=kernel)
+    with pytest.raises(ValidationError, match="1 beta value"):
+        ensure_beta_in_range(df, kernel=kernel)
+
+
+def test_validate_upload_with_kernel_coerces_beta_once() -> None:
+    df = pd.DataFrame({"cpg_id": ["cg000001", "cg000002"], "beta": ["0.2", ""]})
+
+    with mock.patch("cpg_methylation_mvp.core.validate.pd.to_numeric", wraps=pd.to_numeric) as to_numeric:
+        validated = validate_upload_with_kernel(df)
+
+    assert to_numeric.call_count == 1
+    assert validated.dataframe["beta"].tolist()[0] == 0.2
+    assert validated.kernel.valid_rows.tolist() == [True, False]
+
+
+def test_column_rules_compile_to_masks_with_severities() -> None:
+    df = pd.DataFrame(
+        {
+            "cpg_id": ["cg1", "cg2", "cg3", "cg4"],
+            "beta": [0.1, 0.2, 0.3, 0.4],
+            "pos": ["10", "-5", "abc", None],
+            "pval": [0.5, 2.0, -1.0, 0.01],
+            "chrom": ["chr1", "chrZ", " X ", None],
+        }
+    )
+    config = ValidationConfig(rules=RECOMMENDED_COLUMN_RULES)
+
+    outcome = config.evaluate_rules(df)
+    dropped, warned, retained = outcome.row_counts(pd.Series(True, index=df.index))
+
+    assert outcome.drop_masks["negative_pos"].tolist() == [False, True, True, False]
+    assert outcome.drop_masks["pval_out_of_range"].tolist() == [False, True, True, False]
+    assert outcome.warn_masks["unknown_chrom"].tolist() == [False, True, False, False]
+    assert dropped == {"negative_pos": 2, "pval_out_of_range": 0}
+    assert warned == {"unknown_chrom": 0}
+    assert retained.tolist() == [True, False, False, True]
+
+
+def test_reject_rules_raise_and_invalid_rules_are_refused() -> None:
+    df = pd.DataFrame({"cpg_id": ["cg1"], "beta": [0.1], "pval": [3.0]})
+    config = ValidationConfig(rules=(ColumnRule("pval_range", "pval", severity="reject", max_value=1),))
+
+    with pytest.raises(ValidationError, match="pval_range"):
+        validate_upload_with_kernel(df, config)
+    with pytest.raises(ValueError):
+        ColumnRule("ambiguous", "pos", min_value=0, allowed_values=("1",))
+    with pytest.raises(ValueError):
+        ValidationConfig(rules=(ColumnRule("dup", "pos", min_value=0), ColumnRule("dup", "pval", min_value=0)))